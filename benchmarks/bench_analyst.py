@@ -0,0 +1,151 @@
+"""
+NewsAnalyst 분석 처리량 벤치마크 - 응답 지연을 설정할 수 있는 로컬 가짜 모델 사용 (API 키/네트워크 불필요)
+
+사용법:
+    python benchmarks/bench_analyst.py --articles 80 --latency 0.5 --concurrency 1 4 8
+
+동시 요청 수별로 전체 분석 시간과 결과 순서 유지 여부를 출력합니다.
+--rate-limit-every N 을 주면 N번째 요청마다 429(ResourceExhausted)를 흉내내어 감속/재시도 동작도 확인할 수 있습니다
+(재시도 대기 시간 표기 3가지를 돌아가며 사용하고, 시작 전에 모두 추출되는지 확인).
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyst import NewsAnalyst
+from src.utils.llm_client import LLMClient
+from src.utils.rate_limiter import RateLimiter, retry_after_seconds
+from src.utils.retry import RetryPolicy
+
+
+class ResourceExhausted(Exception):
+    """google.api_core.exceptions.ResourceExhausted 흉내 (이름으로 판별됨)"""
+
+
+# 429 메시지의 재시도 대기 시간 표기 3가지 (문장 / gRPC retry_delay 여러 줄 / Retry-After 헤더) - 돌아가며 사용
+RATE_LIMIT_MESSAGES = (
+    "429 Resource has been exhausted (e.g. check quota). Please retry in 1s.",
+    "429 Quota exceeded for metric 'generate_content_requests'.\n[violations {\n}\n, retry_delay {\n  seconds: 1\n}\n]",
+    "429 Too Many Requests (Retry-After: 1)",
+)
+
+
+def check_retry_hints():
+    """RATE_LIMIT_MESSAGES의 대기 시간(1초)이 모두 추출되는지 확인 (안 되면 default_pause로 대기하게 됨)"""
+    parsed = [retry_after_seconds(ResourceExhausted(message)) for message in RATE_LIMIT_MESSAGES]
+    if parsed != [1.0] * len(RATE_LIMIT_MESSAGES):
+        sys.exit(f"retry-after hints not parsed: {parsed}")
+    print(f"retry-after hints: {len(parsed)}/{len(RATE_LIMIT_MESSAGES)} shapes parsed")
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """프롬프트의 [News i] 개수만큼 분석 결과 JSON을 latency(±jitter)초 뒤에 반환"""
+    def __init__(self, latency=0.5, jitter=0.2, rate_limit_every=0, seed=7):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_every = rate_limit_every
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None):
+        with self._lock:
+            self.calls += 1
+            call_num = self.calls
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+        if self.rate_limit_every and call_num % self.rate_limit_every == 0:
+            time.sleep(0.05)
+            raise ResourceExhausted(RATE_LIMIT_MESSAGES[(call_num // self.rate_limit_every) % len(RATE_LIMIT_MESSAGES)])
+
+        time.sleep(delay)
+        indices = [int(i) for i in re.findall(r'\[News (\d+)\]', prompt)]
+        result = [
+            {
+                "index": idx,
+                "title_korean": f"가짜 제목 {idx}",
+                "core_summary": "가짜 핵심 요약입니다.",
+                "detailed_explanation": "① 가짜 상세 설명입니다.",
+            }
+            for idx in indices
+        ]
+        return FakeResponse(json.dumps(result, ensure_ascii=False))
+
+
+def make_articles(count):
+    return [
+        {
+            'category': 'Benchmark',
+            'source': f'Source {i % 7}',
+            'title': f'Synthetic article {i}',
+            'link': f'https://example.com/article/{i}',
+            'published_at': '2025-01-01T00:00:00+00:00',
+            'summary': f'Synthetic summary {i}. ' * 20,
+        }
+        for i in range(count)
+    ]
+
+
+def run(articles, concurrency, args):
+    analyst = NewsAnalyst()
+    analyst.max_concurrency = concurrency
+    analyst.rate_limiter = RateLimiter(args.rpm, args.tpm, default_pause=1.0)
+    # 응답 캐시 없이 가짜 모델만 사용 (실제 캐시 파일을 건드리지 않도록)
+    analyst.llm = LLMClient(FakeModel(args.latency, args.jitter, args.rate_limit_every), "fake-model",
+                            cache=None, rate_limiter=analyst.rate_limiter,
+                            retry_policy=RetryPolicy(max_retries=3, base_delay=0.5, max_delay=2.0))
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        start = time.perf_counter()
+        results = analyst.analyze_all(articles, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    return elapsed, results, analyst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=80)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.5, help="가짜 모델 평균 응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--rpm", type=float, default=600)
+    parser.add_argument("--tpm", type=float, default=10_000_000)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.rate_limit_every:
+        check_retry_hints()
+
+    articles = make_articles(args.articles)
+    expected_links = [a['link'] for a in articles]
+    print(f"{args.articles} articles, batch size {args.batch_size}, latency {args.latency}s ± {args.jitter}s, "
+          f"limits {args.rpm:.0f} RPM / {args.tpm:.0f} TPM")
+    print(f"(old sequential loop with time.sleep(1): ~{args.articles / args.batch_size * (args.latency + 1):.1f}s)\n")
+
+    for concurrency in args.concurrency:
+        elapsed, results, analyst = run(articles, concurrency, args)
+        in_order = [r['link'] for r in results] == expected_links
+        print(f"concurrency={concurrency:<3} {elapsed:7.2f}s  analyzed={len(results):<4} in_order={in_order} "
+              f"calls={analyst.llm.model.calls} rate_limited={analyst.rate_limiter.rate_limited_count}")
+
+
+if __name__ == "__main__":
+    main()
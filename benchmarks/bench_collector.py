@@ -0,0 +1,153 @@
+"""
+NewsCollector 수집 시간 벤치마크 - 지연이 주입된 로컬 HTTP 서버의 합성 피드 대상
+
+사용법:
+    python benchmarks/bench_collector.py --feeds 21 --items 30 --max-delay 2.0
+
+순차 다운로드(max_workers=1)와 동시 다운로드의 수집 시간을 비교합니다.
+동시 다운로드의 수집 시간은 "가장 느린 피드" 수준에 가까워야 합니다.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.collector import NewsCollector
+from src.utils.feed_fetcher import FeedFetcher
+from src.utils.feed_cache import FeedCache
+
+
+def build_rss(feed_id: int, item_count: int) -> bytes:
+    """최근 24시간 안에 고르게 분포된 item_count개의 기사를 가진 RSS 생성"""
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(item_count):
+        published = now - timedelta(minutes=30 * i)
+        items.append(f"""
+        <item>
+            <title>Synthetic feed {feed_id} article {i}</title>
+            <link>https://example.com/feed{feed_id}/article{i}</link>
+            <guid>feed{feed_id}-article{i}</guid>
+            <pubDate>{format_datetime(published)}</pubDate>
+            <description>Synthetic summary for article {i} of feed {feed_id}.</description>
+        </item>""")
+    rss = f"""<?xml version="1.0" encoding="UTF-8"?>
+    <rss version="2.0"><channel>
+        <title>Synthetic Feed {feed_id}</title>
+        <link>https://example.com/feed{feed_id}</link>
+        <description>Benchmark feed</description>{''.join(items)}
+    </channel></rss>"""
+    return rss.encode("utf-8")
+
+
+class SyntheticFeedHandler(BaseHTTPRequestHandler):
+    """/feed/<id>?delay=<seconds>&items=<n> 요청에 지연 후 합성 RSS 응답 (ETag 조건부 요청 지원)"""
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        feed_id = int(parsed.path.rsplit("/", 1)[-1])
+        delay = float(query.get("delay", ["0"])[0])
+        item_count = int(query.get("items", ["20"])[0])
+
+        time.sleep(delay)
+        etag = f'"feed{feed_id}-{item_count}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        body = build_rss(feed_id, item_count)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_feed_config(path: str, port: int, feed_count: int, item_count: int, max_delay: float, seed: int) -> tuple:
+    """지연 시간이 랜덤하게 주입된 feeds.json 작성, (가장 긴 지연, 지연 합계) 반환"""
+    rng = random.Random(seed)
+    delays = [round(rng.uniform(0.1, max_delay), 2) for _ in range(feed_count)]
+    sources = [
+        {"name": f"Synthetic {i}", "url": f"http://127.0.0.1:{port}/feed/{i}?delay={delays[i]}&items={item_count}"}
+        for i in range(feed_count)
+    ]
+    config = {"feeds": [{"category": "Benchmark", "sources": sources}]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    return max(delays), sum(delays)
+
+
+def run_collect(config_path: str, fetcher: FeedFetcher, feed_cache: FeedCache):
+    collector = NewsCollector(config_path=config_path, fetcher=fetcher, feed_cache=feed_cache)
+    # 로그 출력은 벤치마크 결과를 가리므로 숨김
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        start = time.perf_counter()
+        news = collector.collect(lookback_hours=48)
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    return elapsed, news
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feeds", type=int, default=21, help="합성 피드 수")
+    parser.add_argument("--items", type=int, default=30, help="피드당 기사 수")
+    parser.add_argument("--max-delay", type=float, default=2.0, help="피드당 최대 응답 지연 (초)")
+    parser.add_argument("--workers", type=int, default=16, help="동시 다운로드 수")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SyntheticFeedHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = os.path.join(tmp_dir, "feeds.json")
+        slowest, total = write_feed_config(config_path, port, args.feeds, args.items, args.max_delay, args.seed)
+
+        # 모든 합성 피드가 같은 호스트(127.0.0.1)이므로 호스트별 제한은 피드 수만큼 풀어서 측정
+        # 캐시 경로가 None이면 디스크에 저장하지 않음 (실제 .newsagent_cache를 건드리지 않도록)
+        warm_cache = FeedCache(os.path.join(tmp_dir, "feed_cache.json"))
+        scenarios = [
+            ("sequential", FeedFetcher(max_workers=1, per_host_limit=1), FeedCache(None)),
+            (f"concurrent ({args.workers} workers)", FeedFetcher(max_workers=args.workers, per_host_limit=args.feeds), FeedCache(None)),
+            (f"concurrent ({args.workers} workers, 2 per host)", FeedFetcher(max_workers=args.workers, per_host_limit=2), FeedCache(None)),
+            ("concurrent, cold feed cache", FeedFetcher(max_workers=args.workers, per_host_limit=args.feeds), warm_cache),
+            ("concurrent, warm feed cache (304)", FeedFetcher(max_workers=args.workers, per_host_limit=args.feeds), warm_cache),
+        ]
+
+        print(f"{args.feeds} feeds x {args.items} items, slowest feed {slowest:.2f}s, sum of delays {total:.2f}s\n")
+        baseline_news = None
+        for name, fetcher, feed_cache in scenarios:
+            elapsed, news = run_collect(config_path, fetcher, feed_cache)
+            if baseline_news is None:
+                baseline_news = news
+            same_order = [n['link'] for n in news] == [n['link'] for n in baseline_news]
+            print(f"{name:<40} {elapsed:7.2f}s  items={len(news):<5} same_order={same_order}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
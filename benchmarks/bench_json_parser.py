@@ -0,0 +1,129 @@
+"""
+JSON 파서 마이크로 벤치마크 - 기존 방식(json5 + json.dumps 검증) vs 단계별 파서(orjson/json -> repair -> json5)
+
+사용법:
+    python benchmarks/bench_json_parser.py                      # logs/json_parse_error_*.txt + 합성 응답
+    python benchmarks/bench_json_parser.py --logs "logs/*.txt" --repeat 20
+
+말뭉치:
+- logs/json_parse_error_*.txt 의 "Original Text" 부분 (실제로 실패했던 모델 응답, 앞 2000자)
+- 분석 배치 응답 형태의 합성 응답 (정상 / 코드 블록 / trailing comma / 문자열 안 줄바꿈 / 잘린 응답)
+케이스별로 평균 파싱 시간, 성공 여부, 성공한 단계를 출력합니다.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import json5
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.json_parser import _extract_json_from_markdown, _remove_control_characters, loads_tiered
+
+ORIGINAL_HEADER = "=== Original Text (first 2000 chars) ===\n"
+CLEANED_HEADER = "\n\n=== Cleaned Text (first 2000 chars) ==="
+
+
+def load_log_corpus(pattern):
+    corpus = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        start = content.find(ORIGINAL_HEADER)
+        if start < 0:
+            continue
+        start += len(ORIGINAL_HEADER)
+        end = content.find(CLEANED_HEADER, start)
+        corpus.append((os.path.basename(path), content[start:end if end >= 0 else None]))
+    return corpus
+
+
+def synthetic_corpus(articles):
+    items = [
+        {
+            "index": i,
+            "title_korean": f"합성 기사 제목 {i}",
+            "core_summary": "핵심 요약 문장입니다. " * 3,
+            "detailed_explanation": "① 첫 번째 설명 ② 두 번째 설명 ③ 세 번째 설명 " * 8,
+        }
+        for i in range(articles)
+    ]
+    valid = json.dumps(items, ensure_ascii=False, indent=2)
+    trailing = valid.replace('\n  }', ',\n  }').replace('\n]', ',\n]')
+    newlines = valid.replace('② ', '\n② ')
+    return [
+        (f"valid_{articles}", valid),
+        (f"markdown_{articles}", f"```json\n{valid}\n```"),
+        (f"trailing_comma_{articles}", trailing),
+        (f"raw_newlines_{articles}", newlines),
+        (f"truncated_{articles}", valid[:int(len(valid) * 0.7)]),
+    ]
+
+
+def legacy_parse(text):
+    """변경 전 parse_json 동작 (매 호출 정규식 + json5 + json.dumps 검증)"""
+    import re
+    clean = text.strip()
+    if "```json" in clean:
+        blocks = re.findall(r'```json\s*(.*?)\s*```', clean, re.DOTALL)
+        if blocks:
+            clean = blocks[0].strip()
+    clean = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\uFEFF]', '', clean)
+    parsed = json5.loads(clean)
+    json.dumps(parsed, ensure_ascii=False)
+    return parsed, 'json5'
+
+
+def tiered_parse(text):
+    clean = _remove_control_characters(_extract_json_from_markdown(text.strip()))
+    return loads_tiered(clean)
+
+
+def measure(parse, text, repeat):
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        try:
+            result = parse(text)
+        except ValueError:
+            result = None
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logs", default="logs/json_parse_error_*.txt")
+    parser.add_argument("--articles", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    corpus = load_log_corpus(args.logs)
+    print(f"{len(corpus)} saved responses from {args.logs}")
+    for count in args.articles:
+        corpus.extend(synthetic_corpus(count))
+
+    print(f"\n{'case':<48} {'chars':>7} {'legacy ms':>10} {'tiered ms':>10} {'speedup':>8}  legacy / tiered")
+    legacy_total = tiered_total = 0.0
+    legacy_ok = tiered_ok = 0
+    for name, text in corpus:
+        legacy_time, legacy_result = measure(legacy_parse, text, args.repeat)
+        tiered_time, tiered_result = measure(tiered_parse, text, args.repeat)
+        legacy_total += legacy_time
+        tiered_total += tiered_time
+        legacy_ok += legacy_result is not None
+        tiered_ok += tiered_result is not None
+
+        legacy_status = "ok" if legacy_result else "FAIL"
+        tiered_status = tiered_result[1] if tiered_result else "FAIL"
+        print(f"{name[:48]:<48} {len(text):>7} {legacy_time * 1000:>10.3f} {tiered_time * 1000:>10.3f} "
+              f"{legacy_time / max(tiered_time, 1e-9):>7.1f}x  {legacy_status} / {tiered_status}")
+
+    print(f"\ntotal: legacy {legacy_total * 1000:.2f} ms ({legacy_ok}/{len(corpus)} parsed), "
+          f"tiered {tiered_total * 1000:.2f} ms ({tiered_ok}/{len(corpus)} parsed)")
+
+
+if __name__ == "__main__":
+    main()
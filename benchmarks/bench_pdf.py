@@ -0,0 +1,115 @@
+"""
+PDFBuilder 렌더링 벤치마크 - 합성 기사 수별 PDF 생성 시간과 최대 메모리(RSS) 측정 (API 키/네트워크 불필요)
+
+사용법:
+    python benchmarks/bench_pdf.py --articles 200 1000 3000
+    python benchmarks/bench_pdf.py --font-dir /usr/share/fonts/truetype/nanum   # 한국어 TTF로 측정
+
+기사 수마다 별도 프로세스에서 build_pdf()를 실행하고 (최대 RSS가 이전 측정의 영향을 받지 않도록)
+전체 뉴스 부분 준비 시간, PDF 생성 시간, 최대 RSS, 파일 크기를 출력합니다.
+기사 수가 늘어도 최대 RSS는 거의 일정해야 합니다 (PDF_STREAM_CHUNK 단위로 만들고 바로 그림).
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CATEGORIES = ['AI Research', 'Big Tech', 'Mobile', 'Enterprise', 'Semiconductor', 'Startups', 'Policy', 'Security']
+WORDS = ['온디바이스', 'AI', '모델', '삼성', '갤럭시', 'B2B', '보안', '에이전트', '추론', '칩', '클라우드', '파트너십',
+         '출시', '발표', '성능', '효율', '데이터', '플랫폼', 'LLM', '엔터프라이즈']
+
+
+def make_articles(count, seed=7):
+    """카테고리/길이가 실제 분석 결과와 비슷한 합성 기사 (topic_id는 일부만 부여)"""
+    rng = random.Random(seed)
+
+    def sentence(words):
+        return " ".join(rng.choice(WORDS) for _ in range(words)) + "."
+
+    articles = []
+    for i in range(count):
+        articles.append({
+            'category': CATEGORIES[i % len(CATEGORIES)],
+            'source': f'Source {i % 13}',
+            'title': f'Synthetic article {i}',
+            'title_korean': f'합성 기사 {i}: ' + sentence(8),
+            'link': f'https://example.com/article/{i}',
+            'core_summary': " ".join(sentence(12) for _ in range(3)),
+            'detailed_explanation': "\n".join(f"**{sentence(3)}** " + sentence(40) for _ in range(4)),
+            'topic_id': i % 40 if i % 3 == 0 else None,
+            'topic_label': f'Topic {i % 40}',
+            'topic_size': 2,
+        })
+    return articles
+
+
+def run_once(count, font_dir=None):
+    """현재 프로세스에서 한 번 실행하고 결과 dict 반환"""
+    from config import settings
+    from src.pdf_builder import PDFBuilder
+
+    if font_dir:
+        settings.FONT_SEARCH_DIRS = [font_dir]
+    settings.PDF_ALLOW_FONT_FALLBACK = True  # 한국어 폰트가 없는 환경에서도 측정 (Helvetica)
+    settings.RENDER_CACHE_ENABLED = False  # 실제 렌더 캐시를 건드리지 않도록
+
+    articles = make_articles(count)
+    top5 = articles[:5]
+    insights = {'key_issues': [{'title': '이슈', 'description': '설명'}], 'implications': '시사점', 'action_items': ['액션']}
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        builder = PDFBuilder()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.pdf")
+            start = time.perf_counter()
+            sections = builder.build_news_sections(top5, articles)
+            prepared = time.perf_counter()
+            builder.build_pdf(top5, articles, path, insights, news_sections=sections)
+            end = time.perf_counter()
+            size = os.path.getsize(path)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    # Linux ru_maxrss 단위는 KB (macOS는 byte)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        max_rss //= 1024
+    return {'articles': count, 'sections': prepared - start, 'build': end - prepared,
+            'max_rss_mb': max_rss / 1024, 'size_kb': size / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, nargs="+", default=[200, 1000, 3000], help="합성 기사 수 (여러 개 가능)")
+    parser.add_argument("--font-dir", help="NanumGothic.ttf 등 한국어 폰트가 있는 디렉토리 (기본: 설정/시스템 폰트)")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)  # 내부용: 한 번 실행 후 JSON 출력
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_once(args.worker, args.font_dir)))
+        return
+
+    print(f"{'articles':>8} {'sections':>9} {'build':>8} {'total':>8} {'max RSS':>9} {'size':>9}")
+    for count in args.articles:
+        command = [sys.executable, os.path.abspath(__file__), "--worker", str(count)]
+        if args.font_dir:
+            command += ["--font-dir", args.font_dir]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        total = result['sections'] + result['build']
+        print(f"{count:>8} {result['sections']:>8.2f}s {result['build']:>7.2f}s {total:>7.2f}s "
+              f"{result['max_rss_mb']:>7.1f}MB {result['size_kb']:>7.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
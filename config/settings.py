@@ -25,5 +25,116 @@ SLACK_CHANNEL_EMAIL = os.getenv("SLACK_CHANNEL_EMAIL")
 
 # Collection Settings
 NEWS_LOOKBACK_HOURS = 24
-BATCH_SIZE = 1  # 개별 처리 (기사 하나씩 분석)
+BATCH_SIZE = 8  # 배치당 최대 기사 수 (실제 배치 크기는 아래 토큰 예산으로 결정, 1 = 개별 처리)
+SUMMARY_MAX_TOKENS = 400  # 프롬프트에 넣는 피드 요약의 최대 토큰 수 (추정치 기준, HTML 제거 후)
 
+# Analysis Concurrency / Rate Limit Settings (고정 sleep 대신 토큰 버킷으로 한도만큼만 대기)
+ANALYSIS_MAX_CONCURRENCY = int(os.getenv("ANALYSIS_MAX_CONCURRENCY", "4"))  # 동시에 진행하는 분석 요청 수
+GEMINI_RPM_LIMIT = int(os.getenv("GEMINI_RPM_LIMIT", "60"))          # 분당 요청 수 한도
+GEMINI_TPM_LIMIT = int(os.getenv("GEMINI_TPM_LIMIT", "250000"))      # 분당 토큰 수 한도 (입력 + 출력 추정치)
+ANALYSIS_OUTPUT_TOKENS_PER_ARTICLE = 1000  # 기사당 예상 출력 토큰 수
+ANALYSIS_BATCH_INPUT_TOKENS = 6000         # 배치 하나의 입력 토큰 예산 (프롬프트 + 기사 요약 추정치)
+ANALYSIS_BATCH_OUTPUT_TOKENS = 8000        # 배치 하나의 출력 토큰 예산 (기사 수 x 기사당 예상 출력)
+ANALYSIS_STREAMING = True                  # 스트리밍 생성 + 기사 단위 점진적 파싱 (응답이 잘려도 완성된 기사는 유지)
+
+# LLM Retry Settings (모든 LLM 단계 공통 - 429/5xx/타임아웃 등 일시적 오류만 재시도, 지수 백오프 + jitter)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))  # 요청 하나당 최대 재시도 횟수
+LLM_RETRY_BASE_DELAY = 2.0    # 첫 재시도 최대 대기 시간 (초), 재시도마다 2배
+LLM_RETRY_MAX_DELAY = 60.0    # 재시도 대기 시간 상한 (초)
+LLM_STAGE_DEADLINES = {       # 단계별 마감 시간 (초) - 지나면 더 이상 재시도하지 않고 실패 처리
+    'analyst': 40 * 60,
+    'curator': 10 * 60,
+    'b2b_insights': 10 * 60,
+    'weekly_digest': 10 * 60,
+}
+
+# LLM Backend Settings (gemini: 실제 API / record: API 호출 + 녹화 / replay: 녹화 재생, API 키·네트워크 불필요)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+LLM_RECORDING_DIR = os.getenv("LLM_RECORDING_DIR", "recordings/latest")  # 수집 결과(news.json) + LLM 호출(llm_calls.jsonl)
+LLM_REPLAY_LATENCY = os.getenv("LLM_REPLAY_LATENCY", "recorded")  # recorded / sampled / none
+LLM_REPLAY_SPEED = float(os.getenv("LLM_REPLAY_SPEED", "1.0"))     # 재생 속도 배율 (2.0 = 지연 시간 절반)
+
+# Pipeline Settings
+PIPELINE_STREAMING = True   # 수집과 분석을 겹쳐서 실행 (먼저 끝난 피드의 기사부터 분석 시작)
+PIPELINE_QUEUE_SIZE = 32    # 수집 -> 분석 사이 대기 큐 크기 (가득 차면 수집 측이 대기)
+PIPELINE_STAGE_WORKERS = 4  # 단계 DAG에서 동시에 실행하는 단계 수 (폰트 준비 || 수집/분석, B2B 인사이트 || PDF 본문 구성 등)
+
+# State/Cache Settings (실행 간 유지되는 상태 - GitHub Actions cache로 복원/저장되는 디렉토리)
+CACHE_DIR = os.getenv("NEWSAGENT_CACHE_DIR", ".newsagent_cache")
+FEED_CACHE_PATH = os.path.join(CACHE_DIR, "feed_cache.json")  # ETag / Last-Modified + 마지막 파싱 결과
+ARTICLE_DB_PATH = os.path.join(CACHE_DIR, "articles.db")       # 기사 분석 결과 저장소 (SQLite)
+ARTICLE_STORE_RETENTION_DAYS = 30  # 분석 결과 보관 기간 (발행일 기준, 일)
+CHECKPOINT_ENABLED = True
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, "checkpoints")  # 실행 날짜별 단계 출력 (python main.py --resume)
+CHECKPOINT_RETENTION_DAYS = 7      # 체크포인트 보관 기간 (일)
+
+# Feed Watermark Settings (피드별 마지막 수집 시각 + 본 GUID 기준 증분 수집, 처음 보는 피드만 lookback 시간 사용)
+FEED_WATERMARKS_ENABLED = True
+FEED_WATERMARK_PATH = os.path.join(CACHE_DIR, "feed_watermarks.json")
+FEED_WATERMARK_GRACE_HOURS = 24          # 기준점 이전이라도 이 시간 안에 발행된 엔트리는 GUID로 새 기사 여부 확인 (늦게 올라온 기사)
+FEED_WATERMARK_MAX_AGE_HOURS = 72        # 오래 실행되지 않았어도 이보다 오래된 엔트리는 수집하지 않음
+FEED_WATERMARK_GUID_RETENTION_DAYS = 14  # 피드에서 사라진 GUID 보관 기간 (일)
+FEED_WATERMARK_MAX_GUIDS = 1000          # 피드당 최대 GUID 수
+
+# PDF Font Settings (런타임 다운로드 없음 - 아래 디렉토리와 시스템 폰트 디렉토리에서 찾음, CI는 fonts-nanum/fonts-symbola 설치)
+FONT_SEARCH_DIRS = ["assets/fonts"]
+# 한국어 폰트가 없을 때 Helvetica로 계속 진행할지 (기본 false: PDF 단계에서 실패 - 한국어가 깨진 PDF를 보내지 않도록)
+PDF_ALLOW_FONT_FALLBACK = os.getenv("PDF_ALLOW_FONT_FALLBACK", "false").lower() == "true"
+PDF_STREAM_CHUNK = 200  # 전체 뉴스 부분 flowable을 한 번에 만드는 개수 (남은 수가 절반 이하가 되면 다음 묶음 생성)
+
+# Render Cache Settings (기사별 PDF 마크업 / HTML 카드 - 기사 내용 + 템플릿 버전 해시 기준, 실행 간 유지)
+RENDER_CACHE_ENABLED = True
+RENDER_CACHE_PATH = os.path.join(CACHE_DIR, "render_cache.db")
+RENDER_CACHE_RETENTION_DAYS = 7  # 이 기간 동안 쓰이지 않은 항목 삭제 (일)
+
+# HTML Email Settings (Gmail은 본문 HTML이 약 102KB를 넘으면 잘라서 표시 - 넘으면 우선순위 낮은 섹션부터 생략)
+HTML_SIZE_BUDGET_KB = 100  # 0이면 제한 없음
+
+# LLM Response Cache Settings (모델 + config + 프롬프트 해시 기준, JSON 파싱에 성공한 응답만 저장)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.path.join(CACHE_DIR, "llm_cache.db")
+LLM_CACHE_MAX_MB = 200      # 캐시 최대 크기 (초과 시 오래 사용하지 않은 응답부터 삭제)
+LLM_CACHE_TTL_HOURS = 72    # 캐시 유효 시간
+
+# Feed Fetch Settings (피드 동시 다운로드)
+FETCH_MAX_WORKERS = 16       # 전체 동시 다운로드 수
+FETCH_PER_HOST_LIMIT = 2     # 호스트당 동시 다운로드 수
+FETCH_CONNECT_TIMEOUT = 5    # 연결 타임아웃 (초)
+FETCH_READ_TIMEOUT = 20      # 읽기 타임아웃 (초)
+FETCH_TOTAL_TIMEOUT = 30     # 피드 하나당 전체 다운로드 제한 시간 (초)
+
+# Dedupe Settings (여러 매체의 중복 보도 묶기 - MinHash + LSH)
+DEDUP_ENABLED = True
+DEDUP_THRESHOLD = 0.5   # 추정 Jaccard 유사도가 이 값 이상이면 같은 기사로 취급
+DEDUP_NUM_PERM = 64     # MinHash 서명 길이
+DEDUP_BANDS = 16        # LSH band 수 (band당 row = NUM_PERM / BANDS)
+
+# Curation Pre-Ranking Settings (LLM 선정 전 로컬 BM25 관련도로 후보 축소 + LLM 실패 시 대체 Top 5)
+CURATOR_PRERANK_ENABLED = True
+CURATOR_PRERANK_TOP_K = 120  # LLM에 보내는 후보 기사 수 (기사 수가 이보다 적으면 전체 전송)
+# 토너먼트 선정 (후보가 CURATOR_CHUNK_SIZE보다 많으면 청크별 예선을 병렬로 진행한 뒤 승자끼리 결선)
+CURATOR_TOURNAMENT_ENABLED = True
+CURATOR_CHUNK_SIZE = 30       # 프롬프트 하나에 넣는 최대 후보 수
+CURATOR_CHUNK_WINNERS = 5     # 청크당 다음 라운드 진출 기사 수
+CURATOR_MAX_CONCURRENCY = 4   # 동시에 진행하는 예선 요청 수
+# B2B 관심 프로필 {키워드/구절: 가중치} - 분석 결과(한국어)와 원문 제목(영어)을 모두 고려
+B2B_INTEREST_PROFILE = {
+    "B2B": 3.0, "엔터프라이즈": 3.0, "enterprise": 3.0, "기업용": 3.0, "기업": 1.5,
+    "개발자": 2.0, "developer": 2.0, "SDK": 2.0, "API": 2.0, "개발 도구": 2.0,
+    "온디바이스": 2.5, "on-device": 2.5, "모바일": 2.0, "스마트폰": 2.0, "mobile": 2.0,
+    "삼성": 2.5, "Samsung": 2.5, "갤럭시": 2.0, "Galaxy": 2.0, "Knox": 2.5,
+    "보안": 2.0, "security": 2.0, "개인정보": 1.5, "privacy": 1.5, "규제": 1.5, "regulation": 1.5,
+    "에이전트": 2.0, "agent": 2.0, "클라우드": 1.5, "cloud": 1.5, "솔루션": 1.5, "생산성": 1.5,
+    "파트너십": 1.5, "partnership": 1.5, "도입": 1.0, "플랫폼": 1.0, "오픈소스": 1.0, "open source": 1.0,
+    "Google": 1.0, "Gemini": 1.0, "Apple": 1.0, "Qualcomm": 1.0, "Microsoft": 1.0,
+}
+
+# Topic Clustering Settings (분석 결과 TF-IDF 코사인 유사도로 주제 묶기 - 보고서 주제별 구성 + Top 5 주제 분산)
+TOPIC_CLUSTERING_ENABLED = True
+TOPIC_SIMILARITY_THRESHOLD = 0.35  # 코사인 유사도가 이 값 이상인 기사끼리 같은 주제로 연결
+TOPIC_KEY_TERMS = 8                # 후보 쌍 선정(blocking)에 쓰는 기사별 상위 가중치 단어 수
+TOPIC_MAX_KEY_BUCKET = 200         # 이보다 많은 기사에 등장하는 단어만 blocking 키에서 제외 (기사 수가 이보다 적으면 사실상 전체 쌍 비교)
+
+# Weekly Digest Settings (일일 실행마다 저장한 Top 5/인사이트 요약으로 주간 리포트 생성 - python main.py --weekly)
+WEEKLY_DIGEST_DAYS = 7
+WEEKLY_DIGEST_ON_SUNDAY = False  # True면 일요일에 일일 리포트 대신 주간 다이제스트 발송
@@ -1,76 +1,104 @@
+import argparse
 import sys
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from src.collector import NewsCollector
+from src.deduplicator import NewsDeduplicator
 from src.analyst import NewsAnalyst
+from src.topic_clusterer import TopicClusterer
 from src.curator import NewsCurator
 from src.html_builder import ReportBuilder
 from src.pdf_builder import PDFBuilder
 from src.sender import EmailSender
+from src.weekly_digest import WeeklyDigestAnalyzer
+from src.utils.article_store import ArticleStore
+from src.utils.checkpoint_store import CheckpointStore
+from src.utils.model_backend import backend_stats, current_backend, load_recorded_news, start_recording
+from src.utils.stage_graph import PipelineStop, StageGraph
 from config import settings
 
-def main():
-    # 테스트 모드 확인
-    is_test_mode = getattr(settings, 'TEST_MODE', False)
-    if is_test_mode:
-        print("=== NewsAgent Started (TEST MODE) ===")
-        print("[TEST MODE] Test mode is enabled. Reports will be sent to test channel.")
-    else:
-        print("=== NewsAgent Started ===")
-    
-    # 0. KST 기준 요일 확인 및 주말 체크
-    kst = ZoneInfo("Asia/Seoul")
-    now_kst = datetime.now(kst)
-    weekday_kst = now_kst.weekday()  # 0=월요일, 1=화요일, ..., 6=일요일
-    
-    # 일요일이면 early return (수집 및 리포트 생성 안 함)
-    if weekday_kst == 6:  # 일요일
-        print(f"\n[INFO] Today is Sunday (KST: {now_kst.strftime('%Y-%m-%d %A')}). Skipping news collection and report generation.")
-        return
-    
-    # 요일별 lookback 시간 결정
-    if weekday_kst == 0:  # 월요일
-        lookback_hours = 48  # 토요일 07시 ~ 월요일 07시
-        print(f"\n[INFO] Today is Monday (KST: {now_kst.strftime('%Y-%m-%d %A')}). Using 48-hour lookback (Saturday 07:00 ~ Monday 07:00).")
-    else:  # 화~토
-        lookback_hours = 24  # 어제 07시 ~ 오늘 07시
-        weekday_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        print(f"\n[INFO] Today is {weekday_names[weekday_kst]} (KST: {now_kst.strftime('%Y-%m-%d %A')}). Using 24-hour lookback (Yesterday 07:00 ~ Today 07:00).")
-    
-    # 0. 환경변수 체크
-    if not settings.GEMINI_API_KEY:
-        print("Error: GEMINI_API_KEY is missing.")
-        sys.exit(1)
-    if not settings.EMAIL_SENDER or not settings.EMAIL_PASSWORD:
-        print("Error: Email credentials are missing.")
-        sys.exit(1)
-    
-    # Gemini 모델 버전 출력
-    print(f"\n[INFO] Using Gemini Model: {settings.GEMINI_MODEL_NAME}")
-    
+def _open_article_store():
+    """이미 분석한 기사 재사용을 위한 저장소 (오류 시 None -> 전체 분석으로 진행)"""
+    if current_backend() != 'gemini':
+        # 녹화/재생 중에는 모든 기사를 실제로 분석해야 같은 LLM 호출이 재현됨
+        print("[INFO] Article store disabled while recording/replaying LLM calls")
+        return None
+    try:
+        article_store = ArticleStore(settings.ARTICLE_DB_PATH)
+        article_store.prune(settings.ARTICLE_STORE_RETENTION_DAYS)
+        return article_store
+    except Exception as e:
+        print(f"[WARNING] Article store unavailable: {e}")
+        return None
+
+
+def _create_deduplicator():
+    if not getattr(settings, 'DEDUP_ENABLED', True):
+        return None
+    return NewsDeduplicator(
+        threshold=settings.DEDUP_THRESHOLD,
+        num_perm=settings.DEDUP_NUM_PERM,
+        bands=settings.DEDUP_BANDS,
+    )
+
+
+def _create_topic_clusterer():
+    if not getattr(settings, 'TOPIC_CLUSTERING_ENABLED', True):
+        return None
+    return TopicClusterer(
+        threshold=settings.TOPIC_SIMILARITY_THRESHOLD,
+        key_terms=settings.TOPIC_KEY_TERMS,
+        max_key_bucket=settings.TOPIC_MAX_KEY_BUCKET,
+    )
+
+
+def collect_and_analyze_phased(lookback_hours):
+    """수집 -> 중복 제거 -> 분석을 단계별로 순차 실행, (수집 뉴스, 분석 결과, 피드 기준점 갱신분) 반환"""
     # 1. News Collection
     print("\n[Step 1] Collecting News...")
     news_list = []
+    watermark_updates = {}
+    backend = current_backend()
     try:
-        collector = NewsCollector()
-        news_list = collector.collect(lookback_hours=lookback_hours) 
+        if backend == 'replay':
+            # 녹화된 수집 결과 사용 (네트워크 불필요)
+            news_list = load_recorded_news()
+            print(f"[REPLAY] Loaded recorded news from {settings.LLM_RECORDING_DIR}")
+        else:
+            collector = NewsCollector()
+            news_list = collector.collect(lookback_hours=lookback_hours) 
+            watermark_updates = collector.watermark_updates
         print(f"\nTotal News Collected: {len(news_list)}")
+
+        if backend == 'record' and news_list:
+            print(f"[RECORD] Recording collected news and LLM calls to {start_recording(news_list)}")
         
         if not news_list:
-            print("No news found today. Exiting.")
-            return
+            return [], [], watermark_updates
 
     except Exception as e:
         print(f"Error during collection: {e}")
         sys.exit(1)
 
+    # 1.5. Near-Duplicate Detection (여러 매체의 같은 기사는 대표 하나만 분석)
+    deduplicator = _create_deduplicator()
+    if deduplicator is not None:
+        print("\n[Step 1.5] Detecting Near-Duplicate Stories...")
+        try:
+            news_list = deduplicator.deduplicate(news_list)
+        except Exception as e:
+            print(f"Error during dedupe: {e}")
+            # 계속 진행 (중복 제거 없이 전체 분석)
+
     # 2. News Analysis
     print("\n[Step 2] Analyzing News (Gemini)...")
     analyzed_news = []
+    article_store = _open_article_store()
     try:
-        analyst = NewsAnalyst()
-        # settings.BATCH_SIZE 사용 (현재는 개별 처리, 배치 크기 1)
+        analyst = NewsAnalyst(article_store=article_store)
+        # settings.BATCH_SIZE = 배치당 최대 기사 수 (실제 크기는 토큰 예산으로 결정)
         batch_size = getattr(settings, 'BATCH_SIZE', 1)
         analyzed_news = analyst.analyze_all(news_list, batch_size=batch_size)
         print(f"\nSuccessfully analyzed {len(analyzed_news)} items.")
@@ -78,13 +106,127 @@ def main():
     except Exception as e:
         print(f"Error during analysis: {e}")
         sys.exit(1)
+    finally:
+        if article_store is not None:
+            article_store.close()
+
+    return news_list, analyzed_news, watermark_updates
+
+
+def collect_and_analyze_streaming(lookback_hours):
+    """
+    수집과 분석을 겹쳐서 실행 (스트리밍 모드)
+    먼저 다운로드가 끝난 피드의 기사부터 중복 제거 후 바로 분석 큐로 전달
+    """
+    print("\n[Step 1+2] Collecting & Analyzing News (Streaming, Gemini)...")
+    article_store = _open_article_store()
+    try:
+        collector = NewsCollector()
+        news_iter = collector.iter_collect(lookback_hours=lookback_hours)
+
+        deduplicator = _create_deduplicator()
+        if deduplicator is not None:
+            news_iter = deduplicator.filter_stream(news_iter)
+
+        analyst = NewsAnalyst(article_store=article_store)
+        batch_size = getattr(settings, 'BATCH_SIZE', 1)
+        queue_size = getattr(settings, 'PIPELINE_QUEUE_SIZE', 32)
+        news_list, analyzed_news = analyst.analyze_stream(news_iter, batch_size=batch_size, queue_size=queue_size)
+
+        # 완료 순서로 들어온 결과를 feeds.json 순서로 정렬 (실행마다 같은 리포트 순서)
+        news_list = collector.sort_by_source(news_list)
+        analyzed_news = collector.sort_by_source(analyzed_news)
+        print(f"\nTotal News Collected: {len(news_list)}")
+        print(f"Successfully analyzed {len(analyzed_news)} items.")
+        return news_list, analyzed_news, collector.watermark_updates
+
+    except Exception as e:
+        print(f"Error during collection/analysis: {e}")
+        sys.exit(1)
+    finally:
+        if article_store is not None:
+            article_store.close()
+
+
+def _open_checkpoint_store(backend, today_str):
+    """실행 날짜별 단계 체크포인트 (녹화/재생 결과가 실제 실행의 체크포인트와 섞이지 않도록 gemini에서만 사용)"""
+    if backend != 'gemini' or not getattr(settings, 'CHECKPOINT_ENABLED', True):
+        return None
+    store = CheckpointStore(settings.CHECKPOINT_DIR, today_str)
+    try:
+        store.prune(settings.CHECKPOINT_RETENTION_DAYS)
+    except Exception as e:
+        print(f"[WARNING] Failed to prune checkpoints: {e}")
+    return store
+
+
+def build_pipeline(backend, today_str, pdf_filename, checkpoints=None):
+    """
+    파이프라인 단계 DAG (단계 이름, 입력 -> 출력)
+    - pdf_setup (폰트 준비/등록)은 수집/분석과 동시에 진행
+    - Top 5가 정해지면 B2B 인사이트(LLM 호출)와 PDF 전체 뉴스 부분 구성(주제/카테고리 묶기)이 동시에 진행
+    - 재생 모드는 발송 단계 없음
+    - checkpoint=True 단계는 끝날 때마다 출력을 저장 (--resume 시 첫 번째 미완료 단계부터 재실행)
+    """
+    collect = collect_and_analyze_streaming if getattr(settings, 'PIPELINE_STREAMING', False) and backend == 'gemini' \
+        else collect_and_analyze_phased
+
+    def collect_stage(lookback_hours):
+        # 녹화/재생은 배치 구성이 도착 시점에 따라 달라지지 않도록 단계별 실행 사용
+        news_list, analyzed_news, watermark_updates = collect(lookback_hours)
+        if not news_list:
+            raise PipelineStop("No news found today. Exiting.")
+        return news_list, analyzed_news, watermark_updates
+
+    graph = StageGraph(max_workers=getattr(settings, 'PIPELINE_STAGE_WORKERS', 4), checkpoints=checkpoints)
+    # 피드 기준점 갱신분은 발송이 끝난 뒤 저장 (중간에 실패하면 다음 실행에서 같은 기사를 다시 수집)
+    graph.add('collect_analyze', collect_stage, inputs=['lookback_hours'],
+              outputs=['news_list', 'analyzed_news', 'feed_watermarks'], checkpoint=True)
+    graph.add('pdf_setup', PDFBuilder, outputs=['pdf_builder'])
+    graph.add('cluster', cluster_stage, inputs=['analyzed_news'], outputs=['clustered_news'], checkpoint=True)
+    graph.add('curate', curate_stage, inputs=['clustered_news'], outputs=['top5_articles'], checkpoint=True)
+    graph.add('insights', insights_stage, inputs=['top5_articles'], outputs=['b2b_insights'], checkpoint=True)
+    graph.add('pdf_sections', pdf_sections_stage, inputs=['pdf_builder', 'top5_articles', 'clustered_news'],
+              outputs=['pdf_sections'])
+    graph.add('html', html_stage, inputs=['top5_articles', 'clustered_news', 'b2b_insights'], outputs=['html_content'],
+              checkpoint=True)
+    # PDF는 경로만 저장 (파일이 지워졌으면 다시 생성)
+    graph.add('pdf', lambda **kwargs: pdf_stage(pdf_filename=pdf_filename, **kwargs),
+              inputs=['pdf_builder', 'pdf_sections', 'top5_articles', 'clustered_news', 'b2b_insights'],
+              outputs=['pdf_path'], checkpoint=lambda outputs: os.path.exists(outputs['pdf_path']))
+    if backend == 'gemini':
+        # 주간 다이제스트용 일일 리포트 요약 저장 (녹화/재생 결과는 저장하지 않음)
+        graph.add('archive', lambda **kwargs: archive_stage(today_str=today_str, **kwargs),
+                  inputs=['clustered_news', 'top5_articles', 'b2b_insights'], checkpoint=True)
+    if backend != 'replay':
+        # 발송 완료도 기록 (resume 시 이미 보낸 리포트를 다시 보내지 않음)
+        graph.add('send', lambda **kwargs: send_stage(today_str=today_str, **kwargs),
+                  inputs=['html_content', 'pdf_path', 'feed_watermarks'], checkpoint=True)
+    return graph
+
+
+def cluster_stage(analyzed_news):
+    """2.5. Topic Clustering (보고서 주제별 구성 + 큐레이션 주제 분산용 topic_id/topic_label 부여)"""
+    topic_clusterer = _create_topic_clusterer()
+    if topic_clusterer is not None:
+        print("\n[Step 2.5] Clustering Topics...")
+        try:
+            topics = topic_clusterer.cluster(analyzed_news)
+            for topic in topics[:5]:
+                print(f"  - {topic['label']} ({len(topic['articles'])})")
+        except Exception as e:
+            print(f"Error during topic clustering: {e}")
+            # 계속 진행 (카테고리별 구성)
+    return analyzed_news
+
 
-    # 3. News Curation (Top Articles) - B2B 관점
+def curate_stage(clustered_news):
+    """3. News Curation (Top Articles) - B2B 관점"""
     print("\n[Step 3] Curating Top Articles (Samsung MX B2B Dev Group Perspective)...")
     top5_articles = []
     try:
         curator = NewsCurator()
-        top5_articles = curator.select_top_articles(analyzed_news)
+        top5_articles = curator.select_top_articles(clustered_news)
         
         print(f"\nSelected {len(top5_articles)} Top Articles:")
         for idx, article in enumerate(top5_articles):
@@ -94,8 +236,11 @@ def main():
     except Exception as e:
         print(f"Error during curation: {e}")
         # 계속 진행 (빈 토픽 리스트)
+    return top5_articles
 
-    # 3.5. B2B Insights Analysis (Top5 기반)
+
+def insights_stage(top5_articles):
+    """3.5. B2B Insights Analysis (Top5 기반)"""
     print("\n[Step 3.5] Analyzing B2B Insights from Top 5 Articles...")
     b2b_insights = {}
     try:
@@ -107,40 +252,135 @@ def main():
     except Exception as e:
         print(f"Error during B2B insights analysis: {e}")
         # 계속 진행 (빈 인사이트)
+    return b2b_insights
 
-    # 4. Report Building (HTML & PDF)
-    print("\n[Step 4] Building Report (HTML & PDF)...")
-    html_content = ""
-    # 한국 시간대 명시적 사용
-    kst = ZoneInfo("Asia/Seoul")
-    today_str = datetime.now(kst).strftime("%Y-%m-%d")
-    pdf_filename = f"NewsAgent_Report_{today_str}.pdf"
+
+def pdf_sections_stage(pdf_builder, top5_articles, clustered_news):
+    """4-0. PDF 전체 뉴스 부분 구성 (B2B 인사이트와 무관 - 인사이트 생성과 동시에 진행, flowable은 PDF 생성 시 조금씩 만듦)"""
+    print("\n[Step 4] Building Report (PDF news sections)...")
+    try:
+        return pdf_builder.build_news_sections(top5_articles, clustered_news)
+    except Exception as e:
+        print(f"Error during report building: {e}")
+        sys.exit(1)
+
+
+def html_stage(top5_articles, clustered_news, b2b_insights):
+    """4-1. HTML (B2B Insights + Top 5)"""
+    print("\n[Step 4] Building Report (HTML)...")
     try:
-        # 4-1. HTML (B2B Insights + Top 5)
         builder = ReportBuilder()
-        html_content = builder.build_html(top5_articles, analyzed_news, b2b_insights)
+        html_content = builder.build_html(top5_articles, clustered_news, b2b_insights)
         print("HTML Generated Successfully.")
-        
-        # 4-2. PDF (Full Report with TOC)
-        pdf_builder = PDFBuilder()
-        pdf_builder.build_pdf(top5_articles, analyzed_news, pdf_filename, b2b_insights)
+        return html_content
+    except Exception as e:
+        print(f"Error during report building: {e}")
+        sys.exit(1)
+
+
+def pdf_stage(pdf_builder, pdf_sections, top5_articles, clustered_news, b2b_insights, pdf_filename):
+    """4-2. PDF (Full Report with TOC)"""
+    print("\n[Step 4] Building Report (PDF)...")
+    try:
+        pdf_builder.build_pdf(top5_articles, clustered_news, pdf_filename, b2b_insights, news_sections=pdf_sections)
         print(f"PDF Generated Successfully: {pdf_filename}")
-        
+        return pdf_filename
     except Exception as e:
         print(f"Error during report building: {e}")
         sys.exit(1)
 
-    # 5. Send Email & Slack
+
+def archive_stage(clustered_news, top5_articles, b2b_insights, today_str):
+    """4-3. 일일 리포트 요약 저장 (Top 5 + 인사이트 + 주요 토픽) - 주간 다이제스트 입력"""
+    topics = {}
+    for news in clustered_news:
+        if news.get('topic_id') is not None and news.get('topic_size', 1) >= 2:
+            topics[news['topic_id']] = {'label': news.get('topic_label', ''), 'count': news['topic_size']}
+    try:
+        article_store = ArticleStore(settings.ARTICLE_DB_PATH)
+        try:
+            article_store.save_daily_report(today_str, len(clustered_news), top5_articles, b2b_insights,
+                                            [topics[topic_id] for topic_id in sorted(topics)][:5])
+        finally:
+            article_store.close()
+        print(f"[INFO] Daily report summary saved for weekly digest ({today_str})")
+    except Exception as e:
+        # 저장 실패는 일일 리포트에 영향 없음 (주간 다이제스트에서 이 날짜만 빠짐)
+        print(f"[WARNING] Failed to save daily report summary: {e}")
+
+
+def send_stage(html_content, pdf_path, feed_watermarks, today_str):
+    """5. Send Email & Slack (발송 후 피드 수집 기준점 저장)"""
     print("\n[Step 5] Sending Report...")
+    if getattr(settings, 'TEST_MODE', False):
+        subject = f"🧪 [TEST MODE] NewsAgent 리포트 ({today_str})"
+    else:
+        subject = f"📢 [NewsAgent] 오늘의 AI 트렌드 리포트 ({today_str})"
+    send_report(subject, html_content, pdf_path)
+
+    # 테스트 실행은 기준점을 옮기지 않음 (같은 캐시를 쓰는 정규 실행이 기사를 놓치지 않도록)
+    if feed_watermarks and not getattr(settings, 'TEST_MODE', False):
+        try:
+            NewsCollector().commit_watermarks(feed_watermarks)
+        except Exception as e:
+            # 저장 실패 시 다음 실행은 이전 기준점부터 수집 (GUID로 이미 본 기사는 grace 구간 안에서만 다시 나옴)
+            print(f"[WARNING] Failed to save feed watermarks: {e}")
+
+
+def run_weekly_digest(backend, end_date):
+    """
+    주간 다이제스트 - 저장된 일일 리포트 요약(최근 WEEKLY_DIGEST_DAYS일)으로 LLM 1회 요약 후 발송
+    기사 수집/분석은 다시 하지 않음
+    """
+    print("\n[Weekly] Building Weekly Digest from stored daily reports...")
+    kst = ZoneInfo("Asia/Seoul")
+    days = getattr(settings, 'WEEKLY_DIGEST_DAYS', 7)
+    start_date = end_date - timedelta(days=days - 1)
+    # 일일 수집 구간 (전날 07시 ~ 당일 07시, KST)을 합친 구간의 카테고리별 기사 수
+    since = datetime(start_date.year, start_date.month, start_date.day, 7, tzinfo=kst) - timedelta(days=1)
+    until = datetime(end_date.year, end_date.month, end_date.day, 7, tzinfo=kst)
+
+    try:
+        article_store = ArticleStore(settings.ARTICLE_DB_PATH)
+        try:
+            daily_reports = article_store.load_daily_reports(start_date.isoformat(), end_date.isoformat())
+            category_counts = article_store.category_counts(
+                since.astimezone(ZoneInfo("UTC")).isoformat(), until.astimezone(ZoneInfo("UTC")).isoformat()
+            )
+        finally:
+            article_store.close()
+    except Exception as e:
+        print(f"Error loading daily reports: {e}")
+        sys.exit(1)
+
+    if not daily_reports:
+        print(f"[WARNING] No daily reports stored between {start_date} and {end_date}. Skipping weekly digest.")
+        return
+    print(f"[INFO] Loaded {len(daily_reports)} daily reports "
+          f"({sum(report['article_count'] for report in daily_reports)} analyzed articles)")
+
+    digest = WeeklyDigestAnalyzer().summarize(daily_reports)
+    html_content = ReportBuilder().build_weekly_html(digest, daily_reports, category_counts)
+    print("Weekly HTML Generated Successfully.")
+
+    if backend == 'replay':
+        print("\n[REPLAY] Skipping sending in replay mode.")
+        return
+
+    period = f"{daily_reports[0]['run_date']} ~ {daily_reports[-1]['run_date']}"
+    if getattr(settings, 'TEST_MODE', False):
+        subject = f"🧪 [TEST MODE] NewsAgent 주간 리포트 ({period})"
+    else:
+        subject = f"📊 [NewsAgent] 주간 AI 트렌드 리포트 ({period})"
+    send_report(subject, html_content)
+
+
+def send_report(subject, html_content, attachment_path=None):
+    """설정된 채널(이메일/슬랙, 테스트 모드는 테스트 채널)로 발송"""
     try:
-        # today_str은 Step 4에서 이미 생성됨
         is_test_mode = getattr(settings, 'TEST_MODE', False)
-        
         if is_test_mode:
-            subject = f"🧪 [TEST MODE] NewsAgent 리포트 ({today_str})"
             print("[TEST MODE] Using test mode subject prefix")
-        else:
-            subject = f"📢 [NewsAgent] 오늘의 AI 트렌드 리포트 ({today_str})"
         
         sender = EmailSender()
         
@@ -149,7 +389,7 @@ def main():
             test_slack_email = getattr(settings, 'TEST_SLACK_CHANNEL_EMAIL', None)
             if test_slack_email:
                 print(f"[TEST MODE] Sending to test Slack channel: {test_slack_email}")
-                sender.send_email(test_slack_email, subject, html_content, attachment_path=pdf_filename)
+                sender.send_email(test_slack_email, subject, html_content, attachment_path=attachment_path)
                 print(f"[TEST MODE] Test report sent successfully to {test_slack_email}")
             else:
                 print("[TEST MODE] Warning: TEST_SLACK_CHANNEL_EMAIL is not set. Skipping test send.")
@@ -160,7 +400,7 @@ def main():
                 if not settings.EMAIL_RECIPIENT:
                     print("Warning: EMAIL_RECIPIENT is not set. Skipping email.")
                 else:
-                    sender.send_email(settings.EMAIL_RECIPIENT, subject, html_content, attachment_path=pdf_filename)
+                    sender.send_email(settings.EMAIL_RECIPIENT, subject, html_content, attachment_path=attachment_path)
                     print(f"Email sent successfully to {settings.EMAIL_RECIPIENT}")
             
             # 슬랙 채널 발송 (SEND_TO_SLACK이 true인 경우)
@@ -168,7 +408,7 @@ def main():
                 if not settings.SLACK_CHANNEL_EMAIL:
                     print("Warning: SLACK_CHANNEL_EMAIL is not set. Skipping Slack.")
                 else:
-                    sender.send_email(settings.SLACK_CHANNEL_EMAIL, subject, html_content, attachment_path=pdf_filename)
+                    sender.send_email(settings.SLACK_CHANNEL_EMAIL, subject, html_content, attachment_path=attachment_path)
                     print(f"Slack message sent successfully to {settings.SLACK_CHANNEL_EMAIL}")
             
             # 둘 다 false인 경우 경고
@@ -179,7 +419,96 @@ def main():
         print(f"Error during sending: {e}")
         sys.exit(1)
 
+
+def main(resume=False, weekly=False):
+    # 테스트 모드 확인
+    is_test_mode = getattr(settings, 'TEST_MODE', False)
+    if is_test_mode:
+        print("=== NewsAgent Started (TEST MODE) ===")
+        print("[TEST MODE] Test mode is enabled. Reports will be sent to test channel.")
+    else:
+        print("=== NewsAgent Started ===")
+    
+    # 0. KST 기준 요일 확인 및 주말 체크
+    kst = ZoneInfo("Asia/Seoul")
+    now_kst = datetime.now(kst)
+    weekday_kst = now_kst.weekday()  # 0=월요일, 1=화요일, ..., 6=일요일
+    
+    # LLM 백엔드 (gemini / record / replay)
+    backend = current_backend()
+    pipeline_start = time.perf_counter()
+
+    # 일요일이면 early return (수집 및 리포트 생성 안 함, 재생 모드는 요일과 무관하게 실행)
+    # WEEKLY_DIGEST_ON_SUNDAY면 일요일에는 일일 리포트 대신 주간 다이제스트 발송
+    if weekday_kst == 6 and backend != 'replay' and not weekly:  # 일요일
+        if not getattr(settings, 'WEEKLY_DIGEST_ON_SUNDAY', False):
+            print(f"\n[INFO] Today is Sunday (KST: {now_kst.strftime('%Y-%m-%d %A')}). Skipping news collection and report generation.")
+            return
+        print(f"\n[INFO] Today is Sunday (KST: {now_kst.strftime('%Y-%m-%d %A')}). Sending weekly digest instead of the daily report.")
+        weekly = True
+
+    if weekly:
+        if backend != 'replay' and not (settings.GEMINI_API_KEY and settings.EMAIL_SENDER and settings.EMAIL_PASSWORD):
+            print("Error: GEMINI_API_KEY or email credentials are missing.")
+            sys.exit(1)
+        run_weekly_digest(backend, now_kst.date())
+        print("\n=== NewsAgent Finished ===")
+        return
+    
+    # 요일별 lookback 시간 결정
+    if weekday_kst == 0:  # 월요일
+        lookback_hours = 48  # 토요일 07시 ~ 월요일 07시
+        print(f"\n[INFO] Today is Monday (KST: {now_kst.strftime('%Y-%m-%d %A')}). Using 48-hour lookback (Saturday 07:00 ~ Monday 07:00).")
+    else:  # 화~토
+        lookback_hours = 24  # 어제 07시 ~ 오늘 07시
+        weekday_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+        print(f"\n[INFO] Today is {weekday_names[weekday_kst]} (KST: {now_kst.strftime('%Y-%m-%d %A')}). Using 24-hour lookback (Yesterday 07:00 ~ Today 07:00).")
+    
+    # 0. 환경변수 체크 (재생 모드는 API 키/이메일 발송 불필요)
+    if backend != 'replay':
+        if not settings.GEMINI_API_KEY:
+            print("Error: GEMINI_API_KEY is missing.")
+            sys.exit(1)
+        if not settings.EMAIL_SENDER or not settings.EMAIL_PASSWORD:
+            print("Error: Email credentials are missing.")
+            sys.exit(1)
+    
+    # Gemini 모델 버전 출력
+    print(f"\n[INFO] Using Gemini Model: {settings.GEMINI_MODEL_NAME} (backend: {backend})")
+    
+    # 1 ~ 5. 단계 DAG 실행 (입력이 준비된 단계부터 병렬 실행 - 출력은 순차 실행과 동일)
+    # 한국 시간대 명시적 사용
+    today_str = datetime.now(kst).strftime("%Y-%m-%d")
+    pdf_filename = f"NewsAgent_Report_{today_str}.pdf"
+    checkpoints = _open_checkpoint_store(backend, today_str)
+    if resume and checkpoints is None:
+        print("[WARNING] --resume requires checkpoints (gemini backend, CHECKPOINT_ENABLED). Running from the start.")
+    graph = build_pipeline(backend, today_str, pdf_filename, checkpoints=checkpoints)
+    try:
+        graph.run({'lookback_hours': lookback_hours}, resume=resume)
+    finally:
+        print(f"\n{graph.report()}")
+
+    if graph.stopped:
+        return
+    if 'send' in graph.restored:
+        print("\n[INFO] Today's report was already sent. Nothing to resume.")
+
+    print(f"\n[INFO] Pipeline elapsed (collection ~ {'report' if backend == 'replay' else 'sending'}): "
+          f"{time.perf_counter() - pipeline_start:.1f}s")
+    if backend != 'gemini':
+        print(f"[INFO] LLM backend: {backend_stats()}")
+
+    if backend == 'replay':
+        print("\n[REPLAY] Skipping Step 5 (sending) in replay mode.")
+
     print("\n=== NewsAgent Finished ===")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="NewsAgent daily report pipeline")
+    parser.add_argument("--resume", action="store_true",
+                        help="오늘 실행의 체크포인트에서 이어서 실행 (첫 번째 미완료 단계부터)")
+    parser.add_argument("--weekly", action="store_true",
+                        help="저장된 일일 리포트로 주간 다이제스트 생성/발송 (기사 수집/분석 없음)")
+    args = parser.parse_args()
+    main(resume=args.resume, weekly=args.weekly)
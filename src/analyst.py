@@ -1,26 +1,91 @@
-import time
-from typing import List, Dict, Any
+import queue
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import os
-import google.generativeai as genai
 from config import settings
-from src.utils.json_parser import parse_json
+from src.utils.model_backend import create_model_backend
+from src.utils.llm_client import LLMClient, LLMResponseParseError, default_llm_cache
+from src.utils.rate_limiter import RateLimiter
+from src.utils.retry import default_retry_policy
+from src.utils.summary_sanitizer import estimate_tokens
+
+# 프롬프트 고정 부분(지시문 + 출력 형식)의 추정 토큰 수
+PROMPT_OVERHEAD_TOKENS = 400
 
 class NewsAnalyst:
     """
     뉴스를 하나씩 심층 분석(Deep Dive)을 수행하는 역할
     """
-    def __init__(self):
-        api_key = settings.GEMINI_API_KEY
-        if api_key:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel(settings.GEMINI_MODEL_NAME)
+    def __init__(self, article_store=None):
+        # 모델 백엔드 (settings.LLM_BACKEND: gemini / record / replay)
+        self.model = create_model_backend(settings.GEMINI_MODEL_NAME)
+        # 이미 분석한 기사 재사용 (None이면 항상 전체 분석)
+        self.article_store = article_store
+
+        # 동시 분석 요청 수 + RPM/TPM 토큰 버킷 (고정 sleep 대신 실제 한도만큼만 대기)
+        self.max_concurrency = max(1, getattr(settings, 'ANALYSIS_MAX_CONCURRENCY', 4))
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=getattr(settings, 'GEMINI_RPM_LIMIT', 60),
+            tokens_per_minute=getattr(settings, 'GEMINI_TPM_LIMIT', 250000),
+        )
+        # 응답 캐시 + 속도 제한 + 재시도(지수 백오프, 단계 마감 시간)를 거치는 공통 LLM 호출 계층
+        self.llm = LLMClient(self.model, settings.GEMINI_MODEL_NAME,
+                             cache=default_llm_cache(), rate_limiter=self.rate_limiter,
+                             retry_policy=default_retry_policy('analyst'))
     
-    def analyze_batch(self, news_batch: List[Dict]) -> List[Dict]:
+    def analyze_batch(self, news_batch: List[Dict], batch_num=0) -> List[Dict]:
+        """
+        배치 분석 - 파싱 실패 또는 누락된 기사만 절반씩 나눠 재요청 (bisection)
+        기사 하나짜리 요청까지 실패하면 해당 기사는 원본 그대로 반환
+        (429/5xx 등 일시적 오류는 LLMClient의 재시도 정책이 처리, 재시도 후에도 실패하면 원본 반환)
+        """
         if not news_batch:
             return []
 
+        try:
+            return self._analyze_with_bisection(news_batch, context=f"analyst_batch_{batch_num}")
+
+        except Exception as e:
+            print(f"Error in analyzing batch: {e}")
+            return news_batch
+
+    def _analyze_with_bisection(self, news_batch: List[Dict], context: str) -> List[Dict]:
+        try:
+            analyzed = self._request_batch(news_batch, context)
+        except LLMResponseParseError as e:
+            print(f"[ERROR] JSON Parsing Error in Analyst ({context}, {len(news_batch)} article(s)): {e}")
+            analyzed = [None] * len(news_batch)
+
+        missing_indices = [idx for idx, item in enumerate(analyzed) if item is None]
+        if not missing_indices:
+            return analyzed
+
+        if len(news_batch) == 1:
+            print(f"[WARNING] Step 2.8: Article could not be analyzed: {news_batch[0]['title']}")
+            return [news_batch[0]]  # 최종 실패 시 원본 반환
+
+        # 누락된 기사만 두 그룹으로 나눠 각각 재요청 (성공한 기사는 다시 보내지 않음)
+        print(f"[WARNING] Step 2.8: {len(missing_indices)}/{len(news_batch)} article(s) missing in {context}. Retrying in smaller batches...")
+        half = (len(missing_indices) + 1) // 2
+        for part_num, part in enumerate((missing_indices[:half], missing_indices[half:]), 1):
+            if not part:
+                continue
+            retried = self._analyze_with_bisection([news_batch[idx] for idx in part], context=f"{context}_{part_num}")
+            for idx, item in zip(part, retried):
+                analyzed[idx] = item
+        return analyzed
+
+    def _request_batch(self, news_batch: List[Dict], context: str) -> List[Optional[Dict]]:
+        """
+        배치 한 번 요청
+
+        Returns:
+            news_batch와 같은 길이의 리스트 (분석 결과가 없는 기사는 None)
+        """
         # 프롬프트 구성
         news_text = ""
         for idx, news in enumerate(news_batch):
@@ -54,81 +119,254 @@ class NewsAnalyst:
         {news_text}
         """
 
-        try:
-            # 다양한 관점의 분석을 위해 temperature=0.4 설정
-            generation_config = {"temperature": 0.4}
-            response = self.model.generate_content(prompt, generation_config=generation_config)
-            text = response.text
-            
-            # JSON 파싱 (공통 파서 사용)
-            batch_num = getattr(self, '_current_batch_num', 0)
-            context = f"analyst_batch_{batch_num}"
-            
-            try:
-                analyzed_list = parse_json(text, context=context)
-            except Exception as e:
-                print(f"[ERROR] JSON Parsing Error in Analyst: {e}")
-                return news_batch  # 파싱 실패 시 원본 반환
-
-            final_results = []
-            processed_indices = set()
-            
-            for item in analyzed_list:
-                idx = item.get('index')
-                if idx is not None and 0 <= idx < len(news_batch):
-                    combined = news_batch[idx].copy()
-                    combined.update(item)
-                    final_results.append(combined)
-                    processed_indices.add(idx)
-            
-            # 누락된 기사 확인
-            missing_indices = set(range(len(news_batch))) - processed_indices
-            if missing_indices:
-                print(f"[WARNING] Step 2.8: Some articles were not processed!")
-                print(f"[WARNING] Step 2.8: Missing indices: {missing_indices}")
-                for missing_idx in missing_indices:
-                    print(f"[WARNING] Step 2.8: Missing article [{missing_idx}]: {news_batch[missing_idx]['title']}")
-            
-            return final_results
+        # 다양한 관점의 분석을 위해 temperature=0.4 설정
+        generation_config = {"temperature": 0.4}
+        
+        # 캐시 조회 + 모델 호출 + JSON 파싱 (공통 LLM 계층 사용)
+        estimated_tokens = self._estimate_batch_tokens(news_batch)
+        if getattr(settings, 'ANALYSIS_STREAMING', False):
+            # 기사 객체가 완성되는 즉시 처리, 응답이 잘려도 완성된 기사는 유지 (누락분은 bisection으로 재요청)
+            analyzed_items = self.llm.stream_json_items(
+                prompt, generation_config, context=context, estimated_tokens=estimated_tokens,
+            )
+        else:
+            analyzed_items = self.llm.generate_json(
+                prompt, generation_config, context=context, estimated_tokens=estimated_tokens,
+                retry_parse_errors=False,  # 파싱 실패는 bisection으로 나눠서 재요청
+            )
+            if isinstance(analyzed_items, dict):
+                analyzed_items = [analyzed_items]
 
-        except Exception as e:
-            print(f"Error in analyzing batch: {e}")
-            return news_batch
+        results = [None] * len(news_batch)
+        for item in analyzed_items:
+            if not isinstance(item, dict):
+                continue
+            idx = item.get('index')
+            # 필수 필드가 빠진 결과는 누락으로 취급해 재요청
+            if isinstance(idx, int) and 0 <= idx < len(news_batch) and item.get('title_korean') and item.get('core_summary'):
+                combined = news_batch[idx].copy()
+                combined.update(item)
+                results[idx] = combined
+        return results
 
     def analyze_all(self, all_news: List[Dict], batch_size=1) -> List[Dict]:
         """
-        모든 뉴스를 배치 단위로 분석 (배치 크기 1 = 개별 처리)
+        모든 뉴스를 토큰 예산 기반 배치로 분석 (batch_size = 배치당 최대 기사 수)
+        기사 저장소에 같은 링크 + 같은 내용으로 분석된 결과가 있으면 LLM 호출 없이 재사용
         
         Args:
             all_news: 분석할 뉴스 리스트
-            batch_size: 배치 크기 (기본값 1 = 개별 처리)
+            batch_size: 배치당 최대 기사 수 (1 = 개별 처리)
             
         Returns:
-            분석 결과 리스트
+            분석 결과 리스트 (입력 순서 유지)
         """
-        print(f"Analyzing {len(all_news)} news items in batches of {batch_size}...")
-        
+        cached = {}
+        if self.article_store is not None:
+            try:
+                cached = self.article_store.lookup(all_news)
+            except Exception as e:
+                print(f"[WARNING] Article store lookup failed: {e}")
+            print(f"[INFO] Article store: {len(cached)} already analyzed, {len(all_news) - len(cached)} to analyze")
+
+        pending = [news for idx, news in enumerate(all_news) if idx not in cached]
+        self.llm.start_stage()  # 분석 단계 마감 시간 기준
+        analyzed_pending = self._analyze_in_batches(pending, batch_size)
+        self._save_to_store(analyzed_pending)
+        return self._merge_in_order(all_news, cached, analyzed_pending)
+
+    def analyze_stream(self, news_iter: Iterable[Dict], batch_size=1, queue_size=32) -> Tuple[List[Dict], List[Dict]]:
+        """
+        스트리밍 모드: 수집(news_iter)과 분석을 겹쳐서 실행
+        - producer 스레드가 news_iter를 소비해 크기 제한 큐(queue_size)에 넣고
+        - 현재 스레드가 큐에서 꺼내 batch_size 단위로 분석
+        큐가 가득 차면 producer가 대기하므로(backpressure) 메모리 사용량이 제한됨
+
+        Returns:
+            (수집된 뉴스 리스트, 분석 결과 리스트) - 둘 다 도착 순서
+        """
+        item_queue = queue.Queue(maxsize=max(1, queue_size))
+        self.llm.start_stage()  # 분석 단계 마감 시간 기준 (수집 시간 포함)
+        end_marker = object()
+        producer_errors = []
+
+        def produce():
+            try:
+                for news in news_iter:
+                    item_queue.put(news)
+            except Exception as e:
+                producer_errors.append(e)
+            finally:
+                item_queue.put(end_marker)
+
+        producer = threading.Thread(target=produce, name="news-producer", daemon=True)
+        producer.start()
+
+        collected = []
+        cached = {}
+        batch = []
+        finished = False
+
+        # 분석 대기 배치 수 제한: 가득 차면 큐 소비를 멈추고, 그러면 producer도 대기 (backpressure)
+        in_flight = threading.BoundedSemaphore(self.max_concurrency * 2)
+        futures = []
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="analyst")
+
+        def submit(ready_batch):
+            in_flight.acquire()
+            future = executor.submit(self._run_batch, ready_batch, len(futures) + 1)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+
+        try:
+            while not finished or batch:
+                item = None
+                if not finished:
+                    try:
+                        # 배치가 일부 찼는데 다음 기사가 늦게 오면 기다리지 않고 먼저 분석
+                        item = item_queue.get(timeout=0.5 if batch else None)
+                    except queue.Empty:
+                        item = None
+                if item is end_marker:
+                    finished = True
+                    item = None
+
+                if item is not None:
+                    idx = len(collected)
+                    collected.append(item)
+                    hit = {}
+                    if self.article_store is not None:
+                        try:
+                            hit = self.article_store.lookup([item])
+                        except Exception as e:
+                            print(f"[WARNING] Article store lookup failed: {e}")
+                    if hit:
+                        cached[idx] = hit[0]
+                    elif batch and not self._fits_in_batch(batch, item, batch_size):
+                        # 토큰 예산을 넘으면 지금까지 모은 배치를 먼저 제출
+                        submit(batch)
+                        batch = [item]
+                    else:
+                        batch.append(item)
+
+                if batch and (len(batch) >= batch_size or item is None):
+                    submit(batch)
+                    batch = []
+        finally:
+            executor.shutdown(wait=True)
+
+        producer.join()
+        if producer_errors:
+            raise producer_errors[0]
+
+        # 제출 순서(= 도착 순서)대로 결과 수집
+        analyzed_new = []
+        for future in futures:
+            analyzed_new.extend(future.result())
+
+        print(f"[INFO] Streaming analysis: {len(collected)} collected, {len(cached)} from article store, {len(futures)} batches")
+        self._print_rate_limit_stats()
+        self._save_to_store(analyzed_new)
+        return collected, self._merge_in_order(collected, cached, analyzed_new)
+
+    def _save_to_store(self, analyzed_list: List[Dict]):
+        if self.article_store is None or not analyzed_list:
+            return
+        try:
+            saved = self.article_store.save_many(analyzed_list)
+            print(f"[INFO] Article store: saved {saved} new analysis results")
+        except Exception as e:
+            print(f"[WARNING] Article store save failed: {e}")
+
+    def _merge_in_order(self, all_news: List[Dict], cached: Dict[int, Dict], analyzed: List[Dict]) -> List[Dict]:
+        """
+        저장소 결과와 새 분석 결과를 입력 순서대로 병합
+        (분석 중 누락된 기사는 기존과 동일하게 결과에서 제외)
+        """
+        analyzed_by_link = defaultdict(deque)
+        for item in analyzed:
+            analyzed_by_link[item.get('link')].append(item)
+
         results = []
-        batch_num = 0
-        
-        for i in range(0, len(all_news), batch_size):
-            batch_num += 1
-            batch = all_news[i:i+batch_size]
-            
-            # batch_num을 analyze_batch에서 사용할 수 있도록 설정
-            self._current_batch_num = batch_num
-            
-            print(f"Processing batch {batch_num} ({len(batch)} article(s))...")
-            
-            analyzed_batch = self.analyze_batch(batch)
-            
-            # 배치 결과 검증
-            if len(analyzed_batch) != len(batch):
-                print(f"[WARNING] Step 2.0: Batch #{batch_num} result count mismatch!")
-                print(f"[WARNING] Step 2.0: Expected: {len(batch)}, Got: {len(analyzed_batch)}")
-            
-            results.extend(analyzed_batch)
-            time.sleep(1)  # Rate limit 고려
-        
+        for idx, news in enumerate(all_news):
+            if idx in cached:
+                combined = news.copy()
+                combined.update(cached[idx])
+                results.append(combined)
+            elif analyzed_by_link[news.get('link')]:
+                combined = analyzed_by_link[news.get('link')].popleft()
+                # 스트리밍 중 분석 이후에 첨부된 중복 보도 정보 반영
+                if news.get('also_reported_by'):
+                    combined['also_reported_by'] = news['also_reported_by']
+                results.append(combined)
         return results
 
+    def _analyze_in_batches(self, all_news: List[Dict], batch_size=1) -> List[Dict]:
+        """LLM으로 배치 단위 분석 (최대 max_concurrency개 배치를 동시에 요청, 결과는 입력 순서 유지)"""
+        if not all_news:
+            return []
+
+        batches = self._pack_batches(all_news, batch_size)
+        print(f"Analyzing {len(all_news)} news items in {len(batches)} token-budgeted batches "
+              f"(max {batch_size} per batch, {self.max_concurrency} concurrent)...")
+
+        results = []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches)), thread_name_prefix="analyst") as executor:
+            futures = [executor.submit(self._run_batch, batch, batch_num) for batch_num, batch in enumerate(batches, 1)]
+
+            for batch_num, (batch, future) in enumerate(zip(batches, futures), 1):
+                analyzed_batch = future.result()
+                
+                # 배치 결과 검증
+                if len(analyzed_batch) != len(batch):
+                    print(f"[WARNING] Step 2.0: Batch #{batch_num} result count mismatch!")
+                    print(f"[WARNING] Step 2.0: Expected: {len(batch)}, Got: {len(analyzed_batch)}")
+                
+                results.extend(analyzed_batch)
+
+        self._print_rate_limit_stats()
+        return results
+
+    def _run_batch(self, news_batch: List[Dict], batch_num: int) -> List[Dict]:
+        """배치 하나를 분석 (속도 제한/재시도는 LLMClient에서 처리)"""
+        print(f"Processing batch {batch_num} ({len(news_batch)} article(s))...")
+        return self.analyze_batch(news_batch, batch_num=batch_num)
+
+    def _pack_batches(self, news_list: List[Dict], max_batch_size: int) -> List[List[Dict]]:
+        """입력/출력 추정 토큰 예산과 최대 기사 수 안에서 순서대로 배치 구성"""
+        batches = []
+        batch = []
+        for news in news_list:
+            if batch and not self._fits_in_batch(batch, news, max_batch_size):
+                batches.append(batch)
+                batch = []
+            batch.append(news)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _fits_in_batch(self, batch: List[Dict], news: Dict, max_batch_size: int) -> bool:
+        if len(batch) >= max_batch_size:
+            return False
+        input_budget = getattr(settings, 'ANALYSIS_BATCH_INPUT_TOKENS', 6000)
+        output_budget = getattr(settings, 'ANALYSIS_BATCH_OUTPUT_TOKENS', 8000)
+        output_per_article = getattr(settings, 'ANALYSIS_OUTPUT_TOKENS_PER_ARTICLE', 1000)
+
+        input_tokens = PROMPT_OVERHEAD_TOKENS + sum(self._estimate_article_tokens(item) for item in batch)
+        input_tokens += self._estimate_article_tokens(news)
+        output_tokens = output_per_article * (len(batch) + 1)
+        return input_tokens <= input_budget and output_tokens <= output_budget
+
+    def _estimate_article_tokens(self, news: Dict) -> int:
+        return estimate_tokens(f"{news['title']} {news.get('source', '')} {news.get('summary', '')}") + 20
+
+    def _estimate_batch_tokens(self, news_batch: List[Dict]) -> int:
+        """배치 요청의 입력 + 출력 추정 토큰 수 (TPM 버킷에서 차감)"""
+        output_per_article = getattr(settings, 'ANALYSIS_OUTPUT_TOKENS_PER_ARTICLE', 1000)
+        input_tokens = PROMPT_OVERHEAD_TOKENS + sum(self._estimate_article_tokens(news) for news in news_batch)
+        return input_tokens + output_per_article * len(news_batch)
+
+    def _print_rate_limit_stats(self):
+        limiter = self.rate_limiter
+        print(f"[INFO] Rate limiter: waited {limiter.total_wait:.1f}s, {limiter.rate_limited_count} rate-limited responses")
+        print(f"[INFO] Analyst LLM: {self.llm.stats()}")
@@ -1,17 +1,22 @@
 from typing import List, Dict
-import google.generativeai as genai
 from config import settings
-from src.utils.json_parser import parse_json
+from src.utils.model_backend import create_model_backend
+from src.utils.llm_client import LLMClient, default_llm_cache
+from src.utils.retry import default_retry_policy
+
+# 응답에 반드시 있어야 하는 항목
+REQUIRED_KEYS = ('key_issues', 'implications', 'action_items')
 
 class B2BInsightsAnalyzer:
     """
     선정된 Top5 기사를 기반으로 삼성전자 MX 사업부 B2B 개발그룹 관점의 시사점 분석
     """
     def __init__(self):
-        api_key = settings.GEMINI_API_KEY
-        if api_key:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel(settings.GEMINI_MODEL_NAME)
+        # 모델 백엔드 (settings.LLM_BACKEND: gemini / record / replay)
+        self.model = create_model_backend(settings.GEMINI_MODEL_NAME)
+        # 응답 캐시 + 재시도(지수 백오프, 단계 마감 시간)를 거치는 공통 LLM 호출 계층
+        self.llm = LLMClient(self.model, settings.GEMINI_MODEL_NAME,
+                             cache=default_llm_cache(), retry_policy=default_retry_policy('b2b_insights'))
 
     def analyze_insights(self, top5_articles: List[Dict]) -> Dict:
         """
@@ -71,11 +76,18 @@ class B2BInsightsAnalyzer:
         try:
             # 전략적 인사이트를 위해 temperature=0.4 설정
             generation_config = {"temperature": 0.4}
-            response = self.model.generate_content(prompt, generation_config=generation_config)
-            text = response.text
             
-            # JSON 파싱 (공통 파서 사용)
-            insights = parse_json(text, context="b2b_insights")
+            # 캐시 조회 + 모델 호출 + JSON 파싱 (공통 LLM 계층 사용, 일시적 오류는 재시도)
+            self.llm.start_stage()
+            insights = self.llm.generate_json(prompt, generation_config, context="b2b_insights")
+            if not isinstance(insights, dict):
+                raise ValueError(f"Unexpected insights type: {type(insights).__name__}")
+
+            # 빠진 항목이 있으면 해당 항목만 다시 요청해서 채움
+            missing = [key for key in REQUIRED_KEYS if not insights.get(key)]
+            if missing:
+                print(f"[WARNING] B2B insights missing {missing}. Requesting missing fields...")
+                insights.update(self._request_missing_fields(prompt, generation_config, missing))
             return insights
             
         except Exception as e:
@@ -85,6 +97,20 @@ class B2BInsightsAnalyzer:
                 'implications': '분석 중 오류가 발생했습니다.',
                 'action_items': []
             }
+        finally:
+            print(f"[INFO] B2B insights LLM: {self.llm.stats()}")
 
-
-
+    def _request_missing_fields(self, prompt: str, generation_config: Dict, missing: List[str]) -> Dict:
+        """빠진 항목만 다시 요청 (실패하면 빈 dict - 이미 받은 항목은 유지)"""
+        retry_prompt = f"""{prompt}
+        이전 응답에 {', '.join(missing)} 항목이 빠져 있었습니다.
+        위와 같은 JSON 형식으로, {', '.join(missing)} 항목만 포함해서 출력하세요.
+        """
+        try:
+            partial = self.llm.generate_json(retry_prompt, generation_config, context="b2b_insights_partial")
+        except Exception as e:
+            print(f"[WARNING] Failed to fill missing insights fields: {e}")
+            return {}
+        if not isinstance(partial, dict):
+            return {}
+        return {key: partial[key] for key in missing if partial.get(key)}
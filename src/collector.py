@@ -1,21 +1,44 @@
 import json
+import calendar
+import time
 import feedparser
-import sqlite3
 import os
 from datetime import datetime, timedelta, timezone
-from time import mktime
 from zoneinfo import ZoneInfo
+from config import settings
+from src.utils.feed_fetcher import FeedFetcher
+from src.utils.feed_cache import FeedCache
+from src.utils.feed_watermarks import FeedWatermarks
+from src.utils.summary_sanitizer import SummarySanitizer
 
 class NewsCollector:
-    def __init__(self, config_path='config/feeds.json'):
+    def __init__(self, config_path='config/feeds.json', fetcher=None, feed_cache=None, watermarks=None):
         self.config_path = config_path
-        # DB 관련 초기화 제거 (GitHub Actions 환경에서는 일회성 실행이므로)
-        # self.db_path = db_path
-        # self.conn = None
-        # self._init_db()
+        # ETag / Last-Modified 캐시 (실행 간 유지, 없으면 매번 전체 다운로드)
+        self.feed_cache = feed_cache or FeedCache(getattr(settings, 'FEED_CACHE_PATH', None))
+        # 피드별 수집 기준점 (마지막 발행 시각 + 본 GUID), 없으면 lookback 시간 기준 수집
+        self.watermarks = watermarks
+        if self.watermarks is None and getattr(settings, 'FEED_WATERMARKS_ENABLED', False):
+            self.watermarks = FeedWatermarks(
+                settings.FEED_WATERMARK_PATH,
+                guid_retention_days=getattr(settings, 'FEED_WATERMARK_GUID_RETENTION_DAYS', 14),
+                max_guids=getattr(settings, 'FEED_WATERMARK_MAX_GUIDS', 1000),
+            )
+        self.watermark_grace = getattr(settings, 'FEED_WATERMARK_GRACE_HOURS', 24) * 3600
+        self.watermark_max_age = getattr(settings, 'FEED_WATERMARK_MAX_AGE_HOURS', 72) * 3600
+        # 이번 수집으로 갱신된 기준점 {url: record} - 리포트 발송 후 commit_watermarks()로 저장
+        self.watermark_updates = {}
+        self.fetcher = fetcher or FeedFetcher(
+            max_workers=getattr(settings, 'FETCH_MAX_WORKERS', 16),
+            per_host_limit=getattr(settings, 'FETCH_PER_HOST_LIMIT', 2),
+            connect_timeout=getattr(settings, 'FETCH_CONNECT_TIMEOUT', 5),
+            read_timeout=getattr(settings, 'FETCH_READ_TIMEOUT', 20),
+            total_timeout=getattr(settings, 'FETCH_TOTAL_TIMEOUT', 30),
+        )
+        self._source_order = {}
+        # 요약 HTML 정리 + 토큰 예산 내로 자르기 (프롬프트 입력 토큰 절감)
+        self.sanitizer = SummarySanitizer(max_tokens=getattr(settings, 'SUMMARY_MAX_TOKENS', 400))
 
-    # def _init_db(self): ... (Removed)
-    
     def _load_feeds(self):
         """설정 파일에서 피드 목록 로드"""
         if not os.path.exists(self.config_path):
@@ -24,20 +47,60 @@ class NewsCollector:
         with open(self.config_path, 'r', encoding='utf-8') as f:
             return json.load(f)
 
-    # def _is_processed(self, link): ... (Removed)
-    # def _save_to_history(self, link, title, published_at): ... (Removed)
-
     def collect(self, lookback_hours=24):
         """
-        모든 피드를 순회하며 최근 N시간 이내의 뉴스를 수집
-        GitHub Actions 환경에 맞춰 DB 중복 체크 대신 시간 기반 필터링 사용
+        모든 피드를 동시에 다운로드한 뒤 새 뉴스를 수집
+        기준점이 있는 피드는 마지막 수집 이후의 새 엔트리(GUID 기준), 처음 보는 피드는 최근 N시간 이내 엔트리
+        결과 순서는 다운로드 완료 순서와 무관하게 feeds.json 순서를 따름
         
         Args:
-            lookback_hours: 수집할 시간 범위 (시간 단위)
+            lookback_hours: 기준점이 없는 피드의 수집 시간 범위 (시간 단위)
                            오늘 07:00 (KST)를 기준으로 lookback_hours 전 시간부터 수집
         """
-        feed_config = self._load_feeds()
+        sources, urls, request_headers, cutoff_time = self._prepare_collection(lookback_hours)
+        results = self.fetcher.fetch_all(urls, request_headers=request_headers)
+        stats = {'not_modified': 0, 'downloaded_bytes': 0}
         collected_news = []
+
+        current_category = None
+        for source, result in zip(sources, results):
+            if source['category'] != current_category:
+                current_category = source['category']
+                print(f"\nScanning Category: {current_category}")
+
+            print(f"  - Fetching: {source['name']}...", end=" ")
+            recent_items, status = self._process_result(source, result, cutoff_time, stats)
+            print(status)
+            collected_news.extend(recent_items)
+
+        self._finish_collection(urls, stats)
+        return collected_news
+
+    def iter_collect(self, lookback_hours=24):
+        """
+        스트리밍 모드: 피드 다운로드가 끝나는 대로 뉴스 아이템을 하나씩 yield
+        (느린 피드를 기다리지 않고 먼저 끝난 피드의 기사부터 분석을 시작할 수 있도록)
+        yield 순서는 다운로드 완료 순서이므로, 최종 순서가 필요하면 sort_by_source() 사용
+        """
+        sources, urls, request_headers, cutoff_time = self._prepare_collection(lookback_hours)
+        stats = {'not_modified': 0, 'downloaded_bytes': 0}
+
+        for index, result in self.fetcher.iter_fetch(urls, request_headers=request_headers):
+            source = sources[index]
+            recent_items, status = self._process_result(source, result, cutoff_time, stats)
+            print(f"  - Fetched: [{source['category']}] {source['name']}... {status}")
+            for item in recent_items:
+                yield item
+
+        self._finish_collection(urls, stats)
+
+    def sort_by_source(self, news_list):
+        """feeds.json의 피드 순서로 정렬 (같은 피드 안의 순서는 유지)"""
+        return sorted(news_list, key=lambda news: self._source_order.get((news.get('category'), news.get('source')), len(self._source_order)))
+
+    def _prepare_collection(self, lookback_hours):
+        """피드 목록, 조건부 요청 헤더, 수집 기준 시각 준비"""
+        feed_config = self._load_feeds()
         
         # KST 기준으로 오늘 07:00를 기준으로 정확한 시작 시간 계산
         kst = ZoneInfo("Asia/Seoul")
@@ -48,59 +111,157 @@ class NewsCollector:
         
         print(f"Checking news since: {cutoff_kst.strftime('%Y-%m-%d %H:%M:%S KST')} ({cutoff_time.strftime('%Y-%m-%d %H:%M:%S UTC')})")
 
+        self.sanitizer.reset_stats()
+        self.watermark_updates = {}
+        sources = self._flatten_sources(feed_config)
+        self._source_order = {(source['category'], source['name']): idx for idx, source in enumerate(sources)}
+        urls = [source['url'] for source in sources]
+        request_headers = [self.feed_cache.conditional_headers(url) for url in urls]
+        print(f"Fetching {len(sources)} feeds concurrently (max {self.fetcher.max_workers} workers, {self.fetcher.per_host_limit} per host)...")
+        return sources, urls, request_headers, cutoff_time
+
+    def _process_result(self, source, result, cutoff_time, stats):
+        """다운로드 결과 하나를 뉴스 아이템 리스트로 변환, (아이템 리스트, 로그 문자열) 반환"""
+        if not result.ok:
+            return [], f"Error: {result.error}"
+
+        try:
+            entries = self._entries_from_result(source['url'], result)
+            recent_items, scanned = self._filter_recent(entries, source, cutoff_time)
+        except Exception as e:
+            return [], f"Error: {e}"
+
+        counts = f"{len(recent_items)}/{len(entries)} recent items"
+        if scanned < len(entries):
+            counts += f", stopped after {scanned}"
+        if result.not_modified:
+            stats['not_modified'] += 1
+            return recent_items, f"Done. ({counts}, 304 not modified)"
+        stats['downloaded_bytes'] += len(result.content)
+        return recent_items, f"Done. ({counts}, {result.elapsed:.1f}s)"
+
+    def _finish_collection(self, urls, stats):
+        print(f"\n[INFO] Feed cache: {stats['not_modified']}/{len(urls)} feeds not modified, {stats['downloaded_bytes'] / 1024:.0f} KB downloaded")
+        print(f"[INFO] Summary sanitizer: {self.sanitizer.report()}")
+        try:
+            self.feed_cache.prune(urls)
+            self.feed_cache.save()
+        except Exception as e:
+            print(f"[WARNING] Failed to save feed cache: {e}")
+
+    def commit_watermarks(self, updates=None):
+        """
+        수집 기준점 저장 (리포트 발송이 끝난 뒤 호출 - 중간에 실패하면 다음 실행에서 같은 기사를 다시 수집)
+
+        Args:
+            updates: 저장할 기준점 {url: record} (None이면 이번 수집 결과, 체크포인트에서 복원한 값도 사용 가능)
+        """
+        if self.watermarks is None:
+            return
+        updates = self.watermark_updates if updates is None else updates
+        self.watermarks.apply(updates)
+        self.watermarks.prune([source['url'] for source in self._flatten_sources(self._load_feeds())])
+        self.watermarks.save()
+        print(f"[INFO] Feed watermarks saved for {len(updates)} feeds")
+
+    def _flatten_sources(self, feed_config):
+        """카테고리별 피드 설정을 설정 파일 순서 그대로 평탄화"""
+        sources = []
         for category_group in feed_config['feeds']:
-            category = category_group['category']
-            print(f"\nScanning Category: {category}")
-            
             for source in category_group['sources']:
-                source_name = source['name']
-                url = source['url']
-                print(f"  - Fetching: {source_name}...", end=" ")
-                
-                try:
-                    feed = feedparser.parse(url)
-                    new_count = 0
-                    total_entries = len(feed.entries)
-                    
-                    for entry in feed.entries:
-                        link = entry.get('link', '')
-                        if not link:
-                            continue
-                            
-                        # 날짜 파싱 및 시간 필터링
-                        is_recent = False
-                        published_at = datetime.now(timezone.utc).isoformat()
-                        
-                        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                            dt = datetime.fromtimestamp(mktime(entry.published_parsed), timezone.utc)
-                            published_at = dt.isoformat()
-                            if dt > cutoff_time:
-                                is_recent = True
-                        else:
-                            # 날짜 정보가 없으면 일단 가져오거나(True), 스킵(False)
-                            # 여기서는 안전하게 스킵하거나, 최근 5개만 가져오는 로직을 추가할 수 있음.
-                            # 이번에는 날짜 없으면 스킵으로 처리
-                            pass
-
-                        if is_recent:
-                            title = entry.get('title', 'No Title')
-                            news_item = {
-                                'category': category,
-                                'source': source_name,
-                                'title': title,
-                                'link': link,
-                                'published_at': published_at,
-                                'summary': entry.get('summary', '')
-                            }
-                            collected_news.append(news_item)
-                            new_count += 1
-                    
-                    print(f"Done. ({new_count}/{total_entries} recent items)")
-                    
-                except Exception as e:
-                    print(f"Error: {e}")
-                    
-        return collected_news
+                sources.append({
+                    'category': category_group['category'],
+                    'name': source['name'],
+                    'url': source['url'],
+                })
+        return sources
+
+    def _entries_from_result(self, url, result):
+        """304면 캐시된 엔트리 재사용, 아니면 파싱 후 캐시 갱신"""
+        if result.not_modified:
+            cached_entries = self.feed_cache.get_entries(url)
+            if cached_entries is not None:
+                self.feed_cache.mark_not_modified(url)
+                return cached_entries
+
+        feed = feedparser.parse(result.content, response_headers=result.headers)
+        entries = [self._normalize_entry(entry) for entry in feed.entries]
+        self.feed_cache.update(url, result.headers.get('etag'), result.headers.get('last-modified'), entries)
+        return entries
+
+    def _normalize_entry(self, entry):
+        """feedparser 엔트리를 수집에 필요한 필드만 가진 dict로 변환"""
+        published_ts = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            published_ts = calendar.timegm(entry.published_parsed)
+
+        return {
+            'guid': entry.get('id') or entry.get('link', ''),
+            'link': entry.get('link', ''),
+            'title': entry.get('title', 'No Title'),
+            'summary': entry.get('summary', ''),
+            'published_ts': published_ts,
+        }
+
+    def _filter_recent(self, entries, source, cutoff_time):
+        """
+        새 엔트리만 뉴스 아이템으로 변환, (아이템 리스트, 순회한 엔트리 수) 반환
+        - 기준점이 있는 피드: 발행 시각이 (latest_ts - grace) 이후이고 처음 보는 GUID인 엔트리
+          날짜가 없는 엔트리는 처음 보는 GUID면 새 엔트리 (발행 시각 = 수집 시각)
+        - 처음 보는 피드: cutoff_time 이후 발행된 엔트리 (날짜가 없는 엔트리는 GUID만 기록하고 건너뜀)
+        - 날짜가 모두 있고 최신순으로 정렬된 피드는 경계보다 오래된 엔트리에서 순회 중단
+        """
+        now = time.time()
+        record = self.watermarks.get(source['url']) if self.watermarks is not None else None
+        if record is not None and record.get('latest_ts') is not None:
+            boundary = max(record['latest_ts'] - self.watermark_grace, now - self.watermark_max_age)
+        else:
+            boundary = cutoff_time.timestamp()
+        seen = record.get('guids', {}) if record else {}
+
+        timestamps = [entry['published_ts'] for entry in entries]
+        sorted_desc = None not in timestamps and all(a >= b for a, b in zip(timestamps, timestamps[1:]))
+
+        items = []
+        seen_guids = []
+        latest_ts = None
+        scanned = 0
+        for entry in entries:
+            published_ts = entry['published_ts']
+            if sorted_desc and published_ts <= boundary:
+                break  # 이후 엔트리는 모두 이미 처리한 구간
+            scanned += 1
+
+            link = entry['link']
+            if not link:
+                continue
+            guid = entry.get('guid') or link
+            seen_guids.append(guid)
+
+            if published_ts is None:
+                # 날짜 정보가 없으면 GUID로만 판단 (처음 보는 피드는 기존 엔트리로 기록만)
+                if record is None or guid in seen:
+                    continue
+                dt = datetime.fromtimestamp(now, timezone.utc)
+            else:
+                # 미래 시각으로 표시된 엔트리가 기준점을 앞당기지 않도록 현재 시각으로 제한
+                latest_ts = max(latest_ts or 0, min(published_ts, now))
+                if published_ts <= boundary or guid in seen:
+                    continue
+                dt = datetime.fromtimestamp(published_ts, timezone.utc)
+
+            items.append({
+                'category': source['category'],
+                'source': source['name'],
+                'title': entry['title'],
+                'link': link,
+                'published_at': dt.isoformat(),
+                'summary': self.sanitizer.sanitize(entry['summary'])
+            })
+
+        if self.watermarks is not None:
+            self.watermark_updates[source['url']] = self.watermarks.updated_record(source['url'], latest_ts, seen_guids)
+        return items, scanned
 
     def close(self):
         pass
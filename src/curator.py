@@ -1,43 +1,229 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
-import google.generativeai as genai
 from config import settings
-from src.utils.json_parser import parse_json
+from src.pre_ranker import RelevancePreRanker
+from src.utils.model_backend import create_model_backend
+from src.utils.llm_client import LLMClient, default_llm_cache
+from src.utils.retry import default_retry_policy
+
+# 선정할 기사 수
+TOP_N = 5
 
 class NewsCurator:
     """
     분석된 뉴스 전체를 보고 Top N 기사를 선정하는 역할
     """
     def __init__(self):
-        api_key = settings.GEMINI_API_KEY
-        if api_key:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel(settings.GEMINI_MODEL_NAME)
+        # 모델 백엔드 (settings.LLM_BACKEND: gemini / record / replay)
+        self.model = create_model_backend(settings.GEMINI_MODEL_NAME)
+        # 응답 캐시 + 재시도(지수 백오프, 단계 마감 시간)를 거치는 공통 LLM 호출 계층
+        self.llm = LLMClient(self.model, settings.GEMINI_MODEL_NAME,
+                             cache=default_llm_cache(), retry_policy=default_retry_policy('curator'))
+        # 로컬 관련도 사전 순위 (후보 축소 + LLM 실패 시 대체 선정)
+        self.pre_ranker = None
+        if getattr(settings, 'CURATOR_PRERANK_ENABLED', False):
+            self.pre_ranker = RelevancePreRanker(settings.B2B_INTEREST_PROFILE)
+        # 토너먼트 선정 설정 (청크 크기, 청크당 승자 수, 동시 요청 수)
+        self.chunk_size = max(2, getattr(settings, 'CURATOR_CHUNK_SIZE', 30))
+        self.winners_per_chunk = max(1, min(getattr(settings, 'CURATOR_CHUNK_WINNERS', TOP_N), self.chunk_size - 1))
+        self.max_concurrency = max(1, getattr(settings, 'CURATOR_MAX_CONCURRENCY', 4))
     
     def select_top_articles(self, analyzed_news: List[Dict]) -> List[Dict]:
         """
         분석된 뉴스 리스트를 받아 Top 5 기사 선정
         삼성전자 MX 사업부 B2B 개발그룹 관점에서 주목할 만한 기사 선정
+        - 기사가 많으면 로컬 관련도 점수 상위 K개만 LLM에 전달
+        - 후보가 청크 크기보다 많으면 토너먼트(청크별 예선 병렬 -> 결선)로 선정
+        - LLM 선정이 실패하거나 부족하면 관련도 점수 순으로 채움 (결정적 대체 Top 5)
+        - 주제 클러스터링 결과(topic_id)가 있으면 같은 주제의 기사는 하나만 선정 (주제 수가 충분할 때)
         """
         if not analyzed_news:
             return []
-        
-        # 입력 데이터 최소화 (Index, Title, Core Summary만 사용)
+
+        scores = None
+        candidates = analyzed_news
+        if self.pre_ranker is not None:
+            scores = self.pre_ranker.score(analyzed_news)
+            top_k = getattr(settings, 'CURATOR_PRERANK_TOP_K', 120)
+            if len(analyzed_news) > top_k:
+                candidates = [analyzed_news[idx] for idx in self.pre_ranker.top_k(analyzed_news, top_k, scores)]
+                print(f"[INFO] Pre-ranker: sending top {len(candidates)}/{len(analyzed_news)} candidates to curator")
+
+        self.llm.start_stage()
+        tournament = getattr(settings, 'CURATOR_TOURNAMENT_ENABLED', False) and len(candidates) > self.chunk_size
+        if tournament:
+            # 토너먼트: 청크별 예선을 병렬로 진행해 후보를 chunk_size 이하로 줄인 뒤 결선
+            candidates = self._run_tournament(candidates)
+
+        final_top5 = self._select_with_llm(candidates)
+        print(f"[INFO] Curator LLM: {self.llm.stats()}")
+
+        if tournament and len(final_top5) < TOP_N:
+            # 결선이 실패하면 예선 승자(예선 선정 이유 유지)로 먼저 채움
+            selected_links = {article.get('link') for article in final_top5}
+            remaining = [winner for winner in candidates if winner.get('link') not in selected_links]
+            final_top5 += self._prefer_new_topics(remaining, final_top5)[:TOP_N - len(final_top5)]
+
+        if len(final_top5) < min(TOP_N, len(analyzed_news)) and self.pre_ranker is not None:
+            final_top5 = self._fill_by_relevance(final_top5, analyzed_news, scores)
+        return final_top5
+
+    def _run_tournament(self, candidates: List[Dict]) -> List[Dict]:
+        """
+        청크(chunk_size개)마다 Top winners_per_chunk를 병렬 선정 -> 승자끼리 다음 라운드
+        후보가 chunk_size 이하가 될 때까지 반복 (라운드 수 = log(n) 수준)
+        승자에는 예선 selection_reason이 붙어 다음 라운드/결선 프롬프트에 함께 전달됨
+        """
+        pool = candidates
+        round_num = 0
+        while len(pool) > self.chunk_size:
+            round_num += 1
+            chunks = [pool[i:i + self.chunk_size] for i in range(0, len(pool), self.chunk_size)]
+            print(f"[INFO] Curator tournament round {round_num}: {len(pool)} candidates in {len(chunks)} chunks "
+                  f"(top {self.winners_per_chunk} each, {self.max_concurrency} concurrent)")
+
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks)), thread_name_prefix="curator") as executor:
+                futures = [
+                    executor.submit(self._select_chunk, chunk, f"curator_r{round_num}_c{chunk_num}")
+                    for chunk_num, chunk in enumerate(chunks, 1)
+                ]
+                # 청크 순서대로 모아서 다음 라운드도 입력 순서 유지
+                pool = [winner for future in futures for winner in future.result()]
+        return pool
+
+    def _select_chunk(self, chunk: List[Dict], context: str) -> List[Dict]:
+        """청크 하나의 예선 (실패하면 관련도 순, 관련도 계산기가 없으면 앞에서부터)"""
+        count = min(self.winners_per_chunk, len(chunk))
+        winners = self._select_with_llm(chunk, count=count, context=context)
+        if len(winners) >= count:
+            return winners
+
+        selected_links = {article.get('link') for article in winners}
+        order = self.pre_ranker.rank(chunk) if self.pre_ranker is not None else range(len(chunk))
+        remaining = [chunk[idx] for idx in order if chunk[idx].get('link') not in selected_links]
+        return winners + self._prefer_new_topics(remaining, winners)[:count - len(winners)]
+
+    def _select_with_llm(self, analyzed_news: List[Dict], count: int = TOP_N, context: str = "curator") -> List[Dict]:
+        # 입력 데이터 최소화 (Index, Title, Core Summary만 사용, 예선을 거친 기사는 예선 선정 이유 포함)
+        # 같은 주제(topic_id) 기사에는 주제 표시를 붙이고, 서로 다른 주제가 count개 이상이면 주제당 하나만 선정
+        distinct_topics = len({self._topic_key(news) for news in analyzed_news})
+        diversify = distinct_topics >= count and distinct_topics < len(analyzed_news)
+
         input_text = ""
         for idx, news in enumerate(analyzed_news):
             title = news.get('title_korean', news['title'])
             summary = news.get('core_summary', '') # 핵심 요약만 사용
-            input_text += f"[{idx}] {title} : {summary}\n"
+            input_text += f"[{idx}] "
+            if diversify and self._topic_key(news)[0] == 'topic':
+                input_text += f"(토픽 T{news['topic_id']}) "
+            input_text += f"{title} : {summary}"
+            if news.get('selection_reason'):
+                input_text += f" (예선 선정 이유: {news['selection_reason']})"
+            input_text += "\n"
+
+        # 일시적 오류는 LLMClient 재시도 정책이 처리, 선정 수가 부족하면 부족한 만큼만 추가 요청
+        final_top5 = []
+        selected_indices = set()
+        selected_topics = set()
+        skipped_indices = set()  # 이미 선정된 주제와 겹쳐 제외한 기사 (추가 요청 시 제외 목록에 포함)
+        for attempt in range(2):
+            remaining = count - len(final_top5)
+            try:
+                selected_list = self._request_selection(input_text, remaining, sorted(selected_indices | skipped_indices),
+                                                        context, diversify=diversify)
+            except Exception as e:
+                print(f"Error in curator ({context}): {e}")
+                break
+
+            # 결과 매핑: 선정된 기사 정보를 찾아서 리스트로 반환 (중복/범위 밖 번호 제외)
+            for item in selected_list:
+                if not isinstance(item, dict):
+                    continue
+                idx = item.get('article_index')
+                if isinstance(idx, int) and 0 <= idx < len(analyzed_news) and idx not in selected_indices:
+                    topic = self._topic_key(analyzed_news[idx])
+                    if diversify and topic in selected_topics:
+                        skipped_indices.add(idx)
+                        continue
+                    article = analyzed_news[idx].copy()
+                    article['selection_reason'] = item.get('selection_reason')
+                    final_top5.append(article)
+                    selected_indices.add(idx)
+                    selected_topics.add(topic)
+                    if len(final_top5) >= count:
+                        break
+
+            if len(final_top5) >= min(count, len(analyzed_news)):
+                break
+            print(f"[WARNING] Curator ({context}) selected {len(final_top5)}/{count} articles."
+                  + (" Requesting the rest..." if attempt == 0 else ""))
+
+        return final_top5
+
+    def _fill_by_relevance(self, selected: List[Dict], analyzed_news: List[Dict], scores) -> List[Dict]:
+        """LLM 선정 결과가 부족하면 관련도 점수 순으로 나머지를 채움"""
+        selected_links = {article.get('link') for article in selected}
+        remaining = [analyzed_news[idx] for idx in self.pre_ranker.rank(analyzed_news, scores)
+                     if analyzed_news[idx].get('link') not in selected_links]
+        result = list(selected)
+        for news in self._prefer_new_topics(remaining, selected)[:TOP_N - len(selected)]:
+            article = news.copy()
+            terms = self.pre_ranker.matched_terms(news)
+            article['selection_reason'] = (
+                "[자동 선정] LLM 선정 결과가 부족하여 B2B 관심 키워드 관련도 점수로 선정했습니다."
+                + (f" (주요 키워드: {', '.join(terms)})" if terms else "")
+            )
+            result.append(article)
+        print(f"[WARNING] Curator: filled {len(result) - len(selected)} article(s) by local relevance ranking")
+        return result
+
+    def _topic_key(self, news: Dict) -> tuple:
+        """주제 구분 키 (2개 이상 묶인 주제는 topic_id, 나머지는 기사마다 별도 주제)"""
+        if news.get('topic_id') is not None and news.get('topic_size', 1) >= 2:
+            return ('topic', news['topic_id'])
+        return ('article', news.get('link') or id(news))
+
+    def _prefer_new_topics(self, candidates: List[Dict], selected: List[Dict]) -> List[Dict]:
+        """아직 선정되지 않은 주제의 기사를 앞으로 (각 그룹 안에서는 기존 순서 유지)"""
+        seen = {self._topic_key(article) for article in selected}
+        first, rest = [], []
+        for news in candidates:
+            topic = self._topic_key(news)
+            if topic in seen:
+                rest.append(news)
+            else:
+                first.append(news)
+                seen.add(topic)
+        return first + rest
+
+    def _request_selection(self, input_text: str, count: int, exclude: List[int], context: str = "curator",
+                           diversify: bool = False) -> List[Dict]:
+        """
+        선정 요청 한 번 (exclude: 이미 선정된 기사 번호 - 부족분 추가 요청 시 사용)
+        diversify: 목록에 주제 표시가 있으면 같은 주제에서 하나만 고르도록 지시
+        """
+        topic_text = ""
+        if diversify:
+            topic_text = """
+        같은 (토픽 Tn) 표시가 붙은 기사들은 같은 사건/주제를 다룹니다. 한 토픽에서는 가장 중요한 기사 하나만 선택하세요.
+        """
+
+        exclude_text = ""
+        if exclude:
+            exclude_text = f"""
+        이미 선정된 기사 번호 {exclude} 는 제외하고, 나머지 중에서 {count}개를 추가로 선정하세요.
+        """
 
         prompt = f"""
         당신은 삼성전자 MX 사업부 B2B 개발그룹의 전략 분석가입니다.
         아래는 오늘 수집된 AI 관련 뉴스들의 분석 결과입니다.
         
-        **삼성전자 MX 사업부 B2B 개발그룹 관점에서 주목해야 할 Top 5 기사**를 선정해주세요.
+        **삼성전자 MX 사업부 B2B 개발그룹 관점에서 주목해야 할 Top {count} 기사**를 선정해주세요.
         B2B 비즈니스, 엔터프라이즈 솔루션, 개발자 도구, 기업용 AI 서비스 등과 관련된 이슈를 우선적으로 고려하세요.
         단, 일반적인 AI 트렌드도 중요하다면 포함할 수 있습니다.
         
-        반드시 5개의 구체적인 기사를 선택하세요. 그룹화하지 마세요.
-        
+        반드시 {count}개의 구체적인 기사를 선택하세요. 그룹화하지 마세요.
+        {topic_text}{exclude_text}
         출력 형식은 반드시 유효한 JSON 리스트여야 합니다:
         [
             {{
@@ -51,27 +237,11 @@ class NewsCurator:
         {input_text}
         """
         
-        try:
-            # 선정 기준의 일관성을 위해 temperature=0.3 설정
-            generation_config = {"temperature": 0.3}
-            response = self.model.generate_content(prompt, generation_config=generation_config)
-            text = response.text
-            
-            # JSON 파싱 (공통 파서 사용)
-            selected_list = parse_json(text, context="curator")
-            
-            # 결과 매핑: 선정된 기사 정보를 찾아서 리스트로 반환
-            final_top5 = []
-            for item in selected_list:
-                idx = item.get('article_index')
-                if idx is not None and 0 <= idx < len(analyzed_news):
-                    article = analyzed_news[idx].copy()
-                    article['selection_reason'] = item.get('selection_reason')
-                    final_top5.append(article)
-                    
-            return final_top5
-            
-        except Exception as e:
-            print(f"Error in curator: {e}")
-            return []
-
+        # 선정 기준의 일관성을 위해 temperature=0.3 설정
+        generation_config = {"temperature": 0.3}
+        
+        # 캐시 조회 + 모델 호출 + JSON 파싱 (공통 LLM 계층 사용)
+        selected_list = self.llm.generate_json(prompt, generation_config, context=context)
+        if isinstance(selected_list, dict):
+            selected_list = [selected_list]
+        return selected_list
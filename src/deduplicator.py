@@ -0,0 +1,141 @@
+import random
+import zlib
+from typing import List, Dict, Optional, Iterable, Iterator
+from src.utils.text_utils import tokenize, shingles
+
+# MinHash 해시 함수용 메르센 소수 (2^61 - 1)
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class NewsDeduplicator:
+    """
+    여러 매체에 중복 보도된 같은 기사를 분석 전에 묶는 역할
+    - 제목 + 요약의 shingle 집합으로 MinHash 서명 생성
+    - LSH banding으로 후보 쌍만 비교 (전체 쌍 비교 O(n^2) 회피)
+    - 클러스터마다 먼저 수집된 기사 하나만 대표로 남기고 나머지는 'also_reported_by'로 첨부
+    """
+    def __init__(self, threshold=0.5, num_perm=64, bands=16, shingle_size=2, max_tokens=200, seed=42):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_tokens = max_tokens
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self.reset()
+
+    def reset(self):
+        """증분 처리 상태 초기화: 대표 기사 목록, 대표별 서명, band 버킷 -> 대표 인덱스"""
+        self._representatives = []
+        self._signatures = []
+        self._buckets = {}
+
+    def deduplicate(self, news_list: List[Dict]) -> List[Dict]:
+        """
+        뉴스 리스트에서 중복 기사를 묶어 대표 기사만 반환 (입력 순서 유지)
+        대표 기사에는 'also_reported_by' (source, title, link) 리스트가 추가됨
+        """
+        self.reset()
+        representatives = []
+        for news in news_list:
+            news = news.copy()
+            if self.add(news) is None:
+                representatives.append(news)
+
+        duplicate_count = len(news_list) - len(representatives)
+        cluster_count = sum(1 for news in representatives if news.get('also_reported_by'))
+        print(f"[INFO] Dedupe: {len(news_list)} -> {len(representatives)} articles "
+              f"({duplicate_count} duplicates in {cluster_count} clusters)")
+        return representatives
+
+    def filter_stream(self, news_iter: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        스트리밍 모드: 새 기사(대표)만 통과시키고 중복 기사는 대표 기사의 'also_reported_by'에 첨부
+        대표 기사는 먼저 도착한 기사이므로, 뒤늦게 도착한 중복은 이미 yield된 dict에 추가됨
+        """
+        self.reset()
+        total_count = 0
+        passed_count = 0
+        for news in news_iter:
+            total_count += 1
+            news = news.copy()
+            if self.add(news) is None:
+                passed_count += 1
+                yield news
+
+        print(f"[INFO] Dedupe: {total_count} -> {passed_count} articles ({total_count - passed_count} duplicates)")
+
+    def add(self, news: Dict) -> Optional[Dict]:
+        """
+        기사 하나를 추가 (수집과 동시에 처리하는 증분 모드)
+
+        Returns:
+            중복이면 이미 등록된 대표 기사(dict, 'also_reported_by'에 이 기사가 추가됨), 새 기사면 None
+        """
+        signature = self._signature(news)
+        if signature is None:
+            # 비교할 텍스트가 없으면 항상 새 기사로 취급
+            self._representatives.append(news)
+            self._signatures.append(None)
+            return None
+
+        band_keys = self._band_keys(signature)
+        best_idx, best_score = None, 0.0
+        candidates = set()
+        for key in band_keys:
+            candidates.update(self._buckets.get(key, ()))
+        for candidate_idx in sorted(candidates):
+            score = self._estimate_similarity(signature, self._signatures[candidate_idx])
+            if score >= self.threshold and score > best_score:
+                best_idx, best_score = candidate_idx, score
+
+        if best_idx is not None:
+            representative = self._representatives[best_idx]
+            representative.setdefault('also_reported_by', []).append({
+                'source': news.get('source', ''),
+                'title': news.get('title', ''),
+                'link': news.get('link', ''),
+            })
+            return representative
+
+        rep_idx = len(self._representatives)
+        self._representatives.append(news)
+        self._signatures.append(signature)
+        for key in band_keys:
+            self._buckets.setdefault(key, []).append(rep_idx)
+        return None
+
+    def _signature(self, news: Dict) -> Optional[List[int]]:
+        text = f"{news.get('title', '')} {news.get('summary', '')}"
+        tokens = tokenize(text)[:self.max_tokens]
+        shingle_set = shingles(tokens, self.shingle_size)
+        if not shingle_set:
+            return None
+
+        hashed = [zlib.crc32(s.encode('utf-8')) for s in shingle_set]
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashed)
+            for a, b in self._perms
+        ]
+
+    def _band_keys(self, signature: List[int]) -> List[tuple]:
+        return [
+            (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def _estimate_similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """같은 위치의 MinHash 값이 일치하는 비율 = Jaccard 유사도 추정치"""
+        matches = sum(1 for a, b in zip(sig_a, sig_b) if a == b)
+        return matches / len(sig_a)
@@ -1,18 +1,22 @@
 from typing import List, Dict
+from config import settings
+from src.utils.html_template import REQUIRED, HtmlBlocks, Template, escape, safe_url
+from src.utils.render_cache import default_render_cache
 
-class ReportBuilder:
-    """
-    최종 HTML 이메일 본문을 생성하는 역할
-    """
-    def build_html(self, top5_articles: List[Dict], all_news: List[Dict], b2b_insights: Dict = None) -> str:
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-        
-        # 한국 시간대 명시적 사용
-        kst = ZoneInfo("Asia/Seoul")
-        today_str = datetime.now(kst).strftime("%Y. %m. %d (%a)")
-        
-        html = f"""
+# Top 5 카드 HTML 형식 버전 (_render_top_card 출력이 바뀌면 올려서 렌더 캐시 무효화)
+TOP_CARD_TEMPLATE_VERSION = 2
+
+# 메일 크기 예산 초과 시 생략 우선순위 (숫자가 클수록 먼저 생략, REQUIRED는 항상 유지)
+PRIORITY_INSIGHTS = 1      # B2B 핵심 이슈 / 시사점, 주간 트렌드 / 시사점
+PRIORITY_EXTRA_CARD = 2    # Top 5 중 4~5위 카드
+PRIORITY_ACTIONS = 3       # 고려사항
+PRIORITY_OVERVIEW = 4      # 주제 요약, 날짜별 Top 5, 카테고리별 기사 수
+REQUIRED_TOP_CARDS = 3     # 항상 유지하는 Top 5 카드 수
+
+# 생략 안내 문구 자리 (예산을 넘을 때만 이만큼 더 비워둠)
+OMITTED_NOTE_RESERVE = 512
+
+_PAGE_HEADER = Template("""
         <!DOCTYPE html>
         <html>
         <head>
@@ -26,14 +30,16 @@ class ReportBuilder:
                 .date-badge {{ display: inline-block; background: rgba(255,255,255,0.2); padding: 4px 12px; border-radius: 20px; font-size: 13px; margin-bottom: 15px; }}
                 .content {{ padding: 30px; }}
                 .section-title {{ display: flex; align-items: center; margin: 40px 0 20px; font-size: 20px; font-weight: 700; color: #1a202c; border-bottom: 2px solid #1a202c; padding-bottom: 10px; }}
-                
+
                 .topic-card {{ background: #fff; border: 1px solid #e2e8f0; border-radius: 12px; padding: 25px; margin-bottom: 30px; box-shadow: 0 2px 8px rgba(0,0,0,0.04); }}
                 .topic-header {{ margin-bottom: 15px; border-bottom: 1px dashed #cbd5e0; padding-bottom: 15px; }}
                 .topic-tag {{ display: inline-block; background: #ebf8ff; color: #2b6cb0; font-size: 12px; font-weight: bold; padding: 4px 8px; border-radius: 4px; margin-bottom: 8px; }}
                 .topic-title {{ font-size: 20px; color: #2d3748; margin: 0 0 5px 0; font-weight: 700; line-height: 1.3; text-decoration: none; display: block; }}
                 .topic-meta {{ font-size: 12px; color: #718096; margin-bottom: 10px; }}
                 .topic-summary {{ font-size: 14px; color: #4a5568; line-height: 1.6; margin-bottom: 15px; background-color: #f7fafc; padding: 12px; border-radius: 8px; border-left: 4px solid #4299e1; }}
-                
+                .sub-title {{ color: #1a2980; font-size: 16px; margin: 0 0 15px 0; }}
+                .item-list {{ margin: 0; padding-left: 20px; color: #4a5568; font-size: 14px; line-height: 1.8; }}
+
                 .pdf-notice {{ margin-top: 40px; padding: 25px; background-color: #edf2f7; border-radius: 12px; text-align: center; border: 2px dashed #cbd5e0; }}
                 .footer {{ background: #2d3748; color: #a0aec0; text-align: center; padding: 30px; font-size: 13px; }}
             </style>
@@ -41,114 +47,294 @@ class ReportBuilder:
         <body>
             <div class="container">
                 <div class="header">
-                    <div class="date-badge">{today_str}</div>
-                    <h1>NewsAgent Daily Brief</h1>
-                    <p>오늘의 AI 트렌드 & 심층 분석 리포트</p>
+                    <div class="date-badge">{date_badge}</div>
+                    <h1>{title}</h1>
+                    <p>{subtitle}</p>
                 </div>
-                
+
                 <div class="content">
-        """
-        
-        # B2B Insights 섹션 추가 (Top5보다 먼저)
-        if b2b_insights and (b2b_insights.get('key_issues') or b2b_insights.get('implications')):
-            html += """
+""")
+
+_PAGE_FOOTER = Template("""
+                </div>
+                <div class="footer">
+                    Generated by <strong>NewsAgent</strong> with Gemini 2.5 Flash<br>
+                    &copy; 2025 NewsAgent
+                </div>
+            </div>
+        </body>
+        </html>
+""")
+
+_SECTION_TITLE = Template("""
                     <div class="section-title">
-                        <span>💼</span> 삼성전자 MX 사업부 B2B 개발그룹 관점
+                        <span>{icon}</span> {title}
                     </div>
-            """
-            
-            # Key Issues
-            if b2b_insights.get('key_issues'):
-                html += '<div style="margin-bottom: 30px;">'
-                html += '<h3 style="color: #1a2980; font-size: 16px; margin-bottom: 15px;">🔍 주목할 핵심 이슈</h3>'
-                for issue in b2b_insights['key_issues']:
-                    html += f"""
+""")
+
+# 제목 + 설명 카드 (B2B 핵심 이슈, 주간 트렌드)
+_ISSUE_CARD = Template("""
                     <div class="topic-card" style="background: #f0f9ff; border-left: 4px solid #1a2980;">
-                        <h4 style="margin: 0 0 10px 0; color: #1a2980; font-size: 15px;">{issue.get('title', '')}</h4>
-                        <p style="margin: 0; color: #4a5568; font-size: 14px; line-height: 1.6;">{issue.get('description', '')}</p>
+                        <h4 style="margin: 0 0 10px 0; color: #1a2980; font-size: 15px;">{title}</h4>
+                        <p style="margin: 0; color: #4a5568; font-size: 14px; line-height: 1.6;">{description}</p>
+                        {extra:raw}
                     </div>
-                    """
-                html += '</div>'
-            
-            # Implications
-            if b2b_insights.get('implications'):
-                html += f"""
-                <div class="topic-card" style="background: #fff7ed; border-left: 4px solid #f59e0b;">
-                    <h3 style="color: #f59e0b; font-size: 16px; margin-bottom: 15px;">💡 비즈니스/기술적 시사점</h3>
-                    <p style="margin: 0; color: #4a5568; font-size: 14px; line-height: 1.8;">{b2b_insights['implications']}</p>
-                </div>
-                """
-            
-            # Action Items
-            if b2b_insights.get('action_items'):
-                html += '<div style="margin-top: 30px; margin-bottom: 30px;">'
-                html += '<h3 style="color: #1a2980; font-size: 16px; margin-bottom: 15px;">📋 고려사항</h3>'
-                html += '<ul style="margin: 0; padding-left: 20px; color: #4a5568; font-size: 14px; line-height: 1.8;">'
-                for item in b2b_insights['action_items']:
-                    html += f'<li>{item}</li>'
-                html += '</ul></div>'
-            
-            html += '<hr style="margin: 40px 0; border: none; border-top: 2px solid #e2e8f0;">'
-        
-        # 기존 Top5 섹션
-        html += """
-                    <div class="section-title">
-                        <span>🔥</span> Today's Top 5 Deep Dive
+""")
+
+_ISSUE_DATES = Template('<div class="topic-meta" style="margin: 8px 0 0 0;">{dates}</div>')
+
+_KEY_ISSUES = Template("""
+                    <div style="margin-bottom: 30px;">
+                        <h3 class="sub-title">🔍 주목할 핵심 이슈</h3>
+                        {cards:raw}
                     </div>
-        """
-        
-        
-        for idx, article in enumerate(top5_articles):
-            title = article.get('title_korean', article['title'])
-            summary = article.get('core_summary', '')
-            selection_reason = article.get('selection_reason', '')
-            source = article.get('source', '')
-            link = article.get('link', '')
-            
-            reason_html = ""
-            if selection_reason:
-                reason_html = f'<div style="margin-bottom: 10px; color: #e53e3e; font-weight: bold; font-size: 13px;">💡 선정 이유: {selection_reason}</div>'
-
-            html += f"""
+""")
+
+_IMPLICATIONS = Template("""
+                    <div class="topic-card" style="background: #fff7ed; border-left: 4px solid #f59e0b;">
+                        <h3 class="sub-title" style="color: {color};">💡 {title}</h3>
+                        <p style="margin: 0; color: #4a5568; font-size: 14px; line-height: 1.8;">{text}</p>
+                    </div>
+""")
+
+_ITEM_CARD = Template("""
+                    <div class="topic-card">
+                        <h3 class="sub-title">📋 {title}</h3>
+                        <ul class="item-list">{items:raw}</ul>
+                    </div>
+""")
+
+_BULLET_LIST = Template('<ul class="item-list">{items:raw}</ul>')
+_LIST_ITEM = Template('<li>{text}</li>')
+_LINK_ITEM = Template('<li><a href="{link:raw}" style="color: #2d3748; text-decoration: none;">{text}</a></li>')
+_TOPIC_ITEM = Template('<li><strong>{label}</strong> ({count}건{sources})</li>')
+
+_TOP_CARD = Template("""
             <div class="topic-card">
                 <div class="topic-header">
-                    <span class="topic-tag">TOPIC {idx+1:02d}</span>
-                    {reason_html}
-                    <a href="{link}" class="topic-title" target="_blank">{title}</a>
-                    <div class="topic-meta">{source} | {article.get('published_at', '')[:10]}</div>
+                    <span class="topic-tag">TOPIC {rank:02d}</span>
+                    {reason:raw}
+                    <a href="{link:raw}" class="topic-title" target="_blank">{title}</a>
+                    <div class="topic-meta">{source} | {published}{also}</div>
                 </div>
-                
+
                 <div class="topic-summary">
                     <b>[핵심 요지]</b><br>{summary}
                 </div>
-                
+
                 <div style="text-align: right; margin-top: 15px;">
-                    <a href="{link}" style="color: #3182ce; text-decoration: none; font-size: 14px; font-weight: bold;">원문 전체 읽기 →</a>
+                    <a href="{link:raw}" style="color: #3182ce; text-decoration: none; font-size: 14px; font-weight: bold;">원문 전체 읽기 →</a>
                 </div>
             </div>
-            """
+""")
+
+_SELECTION_REASON = Template('<div style="margin-bottom: 10px; color: #e53e3e; font-weight: bold; font-size: 13px;">💡 선정 이유: {reason}</div>')
 
-        html += f"""
+_PDF_NOTICE = Template("""
             <div class="pdf-notice">
                 <h3>📥 전체 리포트 (PDF) 확인하기</h3>
                 <p style="margin: 0; color: #4a5568; font-size: 14px; line-height: 1.6;">
-                    총 {len(all_news)}개의 AI 뉴스에 대한<br>
+                    총 {count}개의 AI 뉴스에 대한<br>
                     <strong>심층 분석(Deep Dive)과 전체 목록</strong>은<br>
                     함께 첨부된 <strong>PDF 파일</strong>을 확인해주세요.
                 </p>
+                {omitted:raw}
             </div>
+""")
+
+_OMITTED_NOTE = Template("""
+                <p style="margin: 12px 0 0 0; color: #718096; font-size: 12px;">
+                    메일 크기 제한으로 생략된 항목: {labels}
+                </p>
+""")
+
+_DAY_HEADING = Template('<h3 style="color: #1a2980; font-size: 15px; margin: 20px 0 8px 0;">{run_date} <span class="topic-meta">(기사 {count}건)</span></h3>')
+
+_HR = '<hr style="margin: 40px 0; border: none; border-top: 2px solid #e2e8f0;">'
+
+
+class ReportBuilder:
+    """
+    최종 HTML 이메일 본문을 생성하는 역할
+    - 조각은 모두 모듈 상수 Template으로 렌더링 (기사/LLM 텍스트는 이스케이프)
+    - 섹션을 HtmlBlocks에 쌓아 마지막에 한 번 join, HTML_SIZE_BUDGET_KB를 넘으면 우선순위 낮은 섹션부터 생략
+    """
+    def __init__(self):
+        # 기사 카드 HTML 캐시 (실행 간 유지, PDF 빌더와 같은 저장소)
+        self.render_cache = default_render_cache()
+
+    def build_html(self, top5_articles: List[Dict], all_news: List[Dict], b2b_insights: Dict = None) -> str:
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
+
+        # 한국 시간대 명시적 사용
+        kst = ZoneInfo("Asia/Seoul")
+        today_str = datetime.now(kst).strftime("%Y. %m. %d (%a)")
+
+        blocks = HtmlBlocks()
+        blocks.add(self._page_header(today_str, "NewsAgent Daily Brief", "오늘의 AI 트렌드 & 심층 분석 리포트"))
+
+        # B2B Insights 섹션 추가 (Top5보다 먼저)
+        if b2b_insights and (b2b_insights.get('key_issues') or b2b_insights.get('implications')):
+            blocks.add(_SECTION_TITLE.render(icon="💼", title="삼성전자 MX 사업부 B2B 개발그룹 관점"),
+                       group='b2b', anchor=True)
+
+            # Key Issues
+            if b2b_insights.get('key_issues'):
+                cards = "".join(_ISSUE_CARD.render(title=issue.get('title', ''), description=issue.get('description', ''), extra='')
+                                for issue in b2b_insights['key_issues'] if isinstance(issue, dict))
+                blocks.add(_KEY_ISSUES.render(cards=cards), PRIORITY_INSIGHTS, "핵심 이슈", group='b2b')
+
+            # Implications
+            if b2b_insights.get('implications'):
+                blocks.add(_IMPLICATIONS.render(color="#f59e0b", title="비즈니스/기술적 시사점", text=b2b_insights['implications']),
+                           PRIORITY_INSIGHTS, "시사점", group='b2b')
+
+            # Action Items
+            if b2b_insights.get('action_items'):
+                blocks.add(self._item_card("고려사항", b2b_insights['action_items']), PRIORITY_ACTIONS, "고려사항", group='b2b')
+
+            blocks.add(_HR, group='b2b', anchor=True)
+
+        # 기존 Top5 섹션
+        blocks.add(_SECTION_TITLE.render(icon="🔥", title="Today's Top 5 Deep Dive"))
+        for idx, article in enumerate(top5_articles):
+            priority = REQUIRED if idx < REQUIRED_TOP_CARDS else PRIORITY_EXTRA_CARD
+            blocks.add(self._top_card(idx, article), priority, f"Top 5 중 {idx + 1}위 카드")
+
+        blocks.add(self._build_topic_overview(all_news), PRIORITY_OVERVIEW, "주제 요약")
+
+        notice = blocks.add(_PDF_NOTICE.render(count=len(all_news), omitted=''))
+        blocks.add(self._page_footer())
+        if self.render_cache is not None:
+            self.render_cache.flush()
+
+        dropped = self._fit_budget(blocks)
+        if dropped:
+            blocks.replace(notice, _PDF_NOTICE.render(count=len(all_news),
+                                                      omitted=_OMITTED_NOTE.render(labels=", ".join(dropped))))
+        return blocks.render()
+
+    def _fit_budget(self, blocks: HtmlBlocks) -> List[str]:
+        """HTML_SIZE_BUDGET_KB 안으로 줄이고 생략한 섹션 이름 반환"""
+        budget_kb = getattr(settings, 'HTML_SIZE_BUDGET_KB', 100)
+        size = blocks.size
+        dropped = blocks.fit(int(budget_kb * 1024), reserve=OMITTED_NOTE_RESERVE)
+        if dropped:
+            print(f"[WARNING] HTML body {size / 1024:.1f}KB exceeds {budget_kb}KB budget. "
+                  f"Omitted: {', '.join(dropped)} -> {blocks.size / 1024:.1f}KB")
+        if budget_kb and blocks.size > budget_kb * 1024:
+            print(f"[WARNING] HTML body still {blocks.size / 1024:.1f}KB after omitting optional sections (Gmail may clip it)")
+        return dropped
+
+    def _top_card(self, idx: int, article: Dict) -> str:
+        """Top 5 기사 카드 (렌더 캐시에 있으면 재사용)"""
+        if self.render_cache is None:
+            return self._render_top_card(idx, article)
+        fields = {key: article.get(key) for key in ('title_korean', 'title', 'core_summary', 'selection_reason',
+                                                    'source', 'link', 'published_at', 'also_reported_by')}
+        fields['rank'] = idx
+        return self.render_cache.get_or_render('html_top_card', TOP_CARD_TEMPLATE_VERSION, fields,
+                                               lambda: self._render_top_card(idx, article))
+
+    def _render_top_card(self, idx: int, article: Dict) -> str:
+        """Top 5 기사 카드 HTML"""
+        also_reported = article.get('also_reported_by') or []
+        also = ""
+        if also_reported:
+            also = " | 함께 보도: " + ", ".join(other.get('source', '') for other in also_reported)
+
+        selection_reason = article.get('selection_reason', '')
+        return _TOP_CARD.render(
+            rank=idx + 1,
+            reason=_SELECTION_REASON.render(reason=selection_reason) if selection_reason else '',
+            link=safe_url(article.get('link', '')),
+            title=article.get('title_korean', article['title']),
+            source=article.get('source', ''),
+            published=(article.get('published_at') or '')[:10],
+            also=also,
+            summary=article.get('core_summary', ''),
+        )
+
+    def build_weekly_html(self, digest: Dict, daily_reports: List[Dict], category_counts: Dict[str, int] = None) -> str:
         """
+        주간 다이제스트 HTML (주간 트렌드/시사점 + 날짜별 Top 5 제목 + 카테고리별 기사 수)
 
-        html += """
-                </div>
-                <div class="footer">
-                    Generated by <strong>NewsAgent</strong> with Gemini 2.5 Flash<br>
-                    &copy; 2025 NewsAgent
-                </div>
-            </div>
-        </body>
-        </html>
+        Args:
+            digest: WeeklyDigestAnalyzer.summarize() 결과
+            daily_reports: 날짜순 일일 리포트 요약
+            category_counts: 기간 내 분석 기사의 카테고리별 개수
         """
-        
-        return html
+        period = f"{daily_reports[0]['run_date']} ~ {daily_reports[-1]['run_date']}" if daily_reports else ""
+        total = sum(report.get('article_count', 0) for report in daily_reports)
+
+        blocks = HtmlBlocks()
+        blocks.add(self._page_header(period, "NewsAgent Weekly Digest", f"이번 주 AI 트렌드 요약 ({len(daily_reports)}일, 기사 {total}건)"))
+
+        blocks.add(_SECTION_TITLE.render(icon="📈", title="이번 주 핵심 트렌드"))
+        if digest.get('weekly_headline'):
+            blocks.add(f'<div class="topic-summary"><b>{escape(digest["weekly_headline"])}</b></div>')
+        for trend in digest.get('key_trends', []):
+            if not isinstance(trend, dict):
+                continue
+            dates = ", ".join(trend.get('dates') or [])
+            blocks.add(_ISSUE_CARD.render(title=trend.get('title', ''), description=trend.get('description', ''),
+                                          extra=_ISSUE_DATES.render(dates=dates) if dates else ''),
+                       PRIORITY_INSIGHTS, "핵심 트렌드")
+
+        if digest.get('implications'):
+            blocks.add(_IMPLICATIONS.render(color="#92400e", title="주간 시사점", text=digest['implications']),
+                       PRIORITY_INSIGHTS, "주간 시사점")
+
+        if digest.get('action_items'):
+            blocks.add(self._item_card("다음 주 고려사항", digest['action_items']), PRIORITY_ACTIONS, "다음 주 고려사항")
+
+        # 날짜별 Top 5 (일일 리포트에서 저장한 제목/링크)
+        if daily_reports:
+            blocks.add(_SECTION_TITLE.render(icon="🗓️", title="날짜별 Top 5"), group='daily', anchor=True)
+        for report in daily_reports:
+            items = []
+            for article in report.get('top_articles', []):
+                title = article.get('title_korean') or article.get('title', '')
+                link = article.get('link', '')
+                items.append(_LINK_ITEM.render(link=safe_url(link), text=title) if link else _LIST_ITEM.render(text=title))
+            blocks.add(_DAY_HEADING.render(run_date=report['run_date'], count=report.get('article_count', 0))
+                       + _BULLET_LIST.render(items="".join(items)),
+                       PRIORITY_OVERVIEW, "날짜별 Top 5", group='daily')
+
+        if category_counts:
+            items = "".join(_LIST_ITEM.render(text=f"{category}: {count}건") for category, count in category_counts.items())
+            blocks.add(_SECTION_TITLE.render(icon="📂", title="카테고리별 기사 수") + _BULLET_LIST.render(items=items),
+                       PRIORITY_OVERVIEW, "카테고리별 기사 수")
+
+        blocks.add(self._page_footer())
+        self._fit_budget(blocks)
+        return blocks.render()
+
+    def _page_header(self, date_badge: str, title: str, subtitle: str) -> str:
+        """공통 HTML 머리 (스타일 + 헤더 배너 + content 시작)"""
+        return _PAGE_HEADER.render(date_badge=date_badge, title=title, subtitle=subtitle)
+
+    def _page_footer(self) -> str:
+        return _PAGE_FOOTER.render()
+
+    def _item_card(self, title: str, items: List) -> str:
+        """제목 + 글머리표 목록 카드 (고려사항)"""
+        return _ITEM_CARD.render(title=title, items="".join(_LIST_ITEM.render(text=item) for item in items))
+
+    def _build_topic_overview(self, all_news: List[Dict], max_topics: int = 5) -> str:
+        """주제 클러스터링 결과(topic_id)가 있으면 기사가 많은 주제 순으로 요약 목록 생성"""
+        news_by_topic = {}
+        for news in all_news:
+            if news.get('topic_id') is not None:
+                news_by_topic.setdefault(news['topic_id'], []).append(news)
+        topics = [news_list for _, news_list in sorted(news_by_topic.items()) if len(news_list) >= 2]
+        if not topics:
+            return ""
 
+        items = []
+        for news_list in topics[:max_topics]:
+            sources = ", ".join(dict.fromkeys(news.get('source', '') for news in news_list if news.get('source')))
+            items.append(_TOPIC_ITEM.render(label=news_list[0].get('topic_label', ''), count=len(news_list),
+                                            sources=f" · {sources}" if sources else ''))
+        return _SECTION_TITLE.render(icon="🧩", title="Today's Topics") + _BULLET_LIST.render(items="".join(items))
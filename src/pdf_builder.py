@@ -1,33 +1,49 @@
 import os
 import re
 from datetime import datetime
+from itertools import chain, islice
 from zoneinfo import ZoneInfo
 from typing import List, Dict
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, ListFlowable, ListItem
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, ListFlowable, ListItem, Flowable
 from reportlab.platypus.tableofcontents import TableOfContents
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.units import cm
-from src.utils.font_manager import ensure_korean_font
+from config import settings
+from src.utils.font_manager import register_report_fonts
+from src.utils.render_cache import default_render_cache
+
+# 기사 본문 마크업 형식 버전 (_render_article 출력이 바뀌면 올려서 렌더 캐시 무효화)
+ARTICLE_TEMPLATE_VERSION = 1
 
 # 목차(TOC) 생성을 위한 커스텀 DocTemplate (필요시 확장 가능하지만 SimpleDocTemplate으로 시도)
 # ReportLab TOC는 MultiBuild가 필요함.
 
 class PDFBuilder:
     def __init__(self):
-        self.font_path = ensure_korean_font()
-        if self.font_path:
-            pdfmetrics.registerFont(TTFont('NanumGothic', self.font_path))
-            self.font_name = 'NanumGothic'
-        else:
-            self.font_name = 'Helvetica'
+        # 한국어 본문 폰트 + 이모지 대체 폰트 (로컬/시스템 폰트만 사용)
+        self.font_chain = register_report_fonts()
+        self.font_name = self.font_chain.primary_name
+        # 기사별 Paragraph 마크업 캐시 (실행 간 유지, HTML 빌더와 같은 저장소)
+        self.render_cache = default_render_cache()
 
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
 
+    def _paragraph(self, text, style_name, outline=None):
+        """
+        본문 폰트에 없는 글자(이모지 등)는 대체 폰트로 감싼 Paragraph
+        outline: (앵커 이름, 단계) - PDF 북마크(outline) 항목 + 목차 페이지 번호 대상 (text에 같은 이름의 <a name> 필요)
+        """
+        if outline is None:
+            return Paragraph(self.font_chain.markup(text), self.styles[style_name])
+        return OutlineParagraph(self.font_chain.markup(text), self.styles[style_name], outline=outline)
+
+    def _toc_line(self, link_text, key):
+        """목차 한 줄 (링크 + 오른쪽 끝에 key 앵커의 페이지 번호)"""
+        return TOCLine(self._paragraph(link_text, 'TOCEntry'), key)
+
     def _setup_custom_styles(self):
         self.styles.add(ParagraphStyle(
             name='TitleKorean', fontName=self.font_name, fontSize=26, leading=32, alignment=1, spaceAfter=20
@@ -65,8 +81,17 @@ class PDFBuilder:
             name='TOCEntry', fontName=self.font_name, fontSize=11, leading=14, spaceAfter=5
         ))
 
-    def build_pdf(self, top5_articles: List[Dict], all_news: List[Dict], output_filename="report.pdf", b2b_insights: Dict = None):
+    def build_pdf(self, top5_articles: List[Dict], all_news: List[Dict], output_filename="report.pdf", b2b_insights: Dict = None,
+                  news_sections: Dict = None):
+        """
+        news_sections: build_news_sections() 결과 (None이면 여기서 생성)
+                       Top 5가 정해지면 B2B 인사이트 생성과 동시에 미리 만들어 둘 수 있음
+        전체 뉴스 부분(목차 링크 + 본문)은 PDF_STREAM_CHUNK개씩 만들어 바로 그림 (기사 수와 무관하게 메모리 일정)
+        """
+        if news_sections is None:
+            news_sections = self.build_news_sections(top5_articles, all_news)
         doc = MyDocTemplate(output_filename, pagesize=A4)
+        doc.page_number_font = (self.font_name, self.styles['TOCEntry'].fontSize)
         story = []
         # 한국 시간대 명시적 사용
         kst = ZoneInfo("Asia/Seoul")
@@ -74,107 +99,72 @@ class PDFBuilder:
 
         # 1. Cover Page
         story.append(Spacer(1, 100))
-        story.append(Paragraph("NewsAgent Daily Brief", self.styles['TitleKorean']))
-        story.append(Paragraph(f"{today_str}", self.styles['TitleKorean']))
+        story.append(self._paragraph("NewsAgent Daily Brief", 'TitleKorean'))
+        story.append(self._paragraph(f"{today_str}", 'TitleKorean'))
         story.append(Spacer(1, 30))
-        story.append(Paragraph("Deep Dive into AI Trends", self.styles['SubtitleKorean']))
+        story.append(self._paragraph("Deep Dive into AI Trends", 'SubtitleKorean'))
         story.append(PageBreak())
 
-        # 2. Manual Table of Contents (with Links)
-        story.append(Paragraph("Table of Contents", self.styles['Heading1Korean']))
+        # 2. Manual Table of Contents (with Links + Page Numbers)
+        story.append(self._paragraph("Table of Contents", 'Heading1Korean'))
         story.append(Spacer(1, 20))
 
         # B2B Insights Link 추가
         if b2b_insights:
-            story.append(Paragraph("💼 B2B 개발그룹 관점", self.styles['Heading2Korean']))
+            story.append(self._paragraph("💼 B2B 개발그룹 관점", 'Heading2Korean'))
             link_text = f"<a href='#B2B_INSIGHTS' color='black'>주목할 이슈 및 시사점</a>"
-            story.append(Paragraph(link_text, self.styles['TOCEntry']))
+            story.append(self._toc_line(link_text, 'B2B_INSIGHTS'))
             story.append(Spacer(1, 10))
 
         # Top 5 Links
-        story.append(Paragraph("🔥 Top 5 Insights", self.styles['Heading2Korean']))
+        story.append(self._paragraph("🔥 Top 5 Insights", 'Heading2Korean'))
         for idx, article in enumerate(top5_articles):
             title = article.get('title_korean', article['title'])
             # Link to Anchor 'TOP5_{idx}'
             link_text = f"<a href='#TOP5_{idx}' color='black'>{idx+1}. {title}</a>"
-            story.append(Paragraph(link_text, self.styles['TOCEntry']))
+            story.append(self._toc_line(link_text, f"TOP5_{idx}"))
         
         story.append(Spacer(1, 10))
         
-        # Category Links
-        story.append(Paragraph("📂 News by Category", self.styles['Heading2Korean']))
-        
-        # Organize data for TOC
-        processed_indices = set()
-        for article in top5_articles:
-             if 'link' in article: processed_indices.add(article['link'])
-
-        news_by_category = {}
-        for news in all_news:
-            if news.get('link') in processed_indices: continue
-            cat = news.get('category', 'Others')
-            if cat not in news_by_category: news_by_category[cat] = []
-            news_by_category[cat].append(news)
-
-        # Create TOC for Categories
-        cat_idx = 0
-        for category, news_list in news_by_category.items():
-            if not news_list: continue
-            
-            # Category Title
-            clean_cat = category.replace('&', '&amp;')
-            story.append(Paragraph(f"📌 {clean_cat}", self.styles['Heading2Korean']))
-            
-            # Article Titles in TOC
-            for art_idx, news in enumerate(news_list):
-                title = news.get('title_korean', news['title'])
-                # Link to Anchor 'CAT_{cat_idx}_ART_{art_idx}'
-                # 제목이 길면 자르기
-                if len(title) > 60: title = title[:60] + "..."
-                clean_title = title.replace('&', '&amp;')
-                
-                link_text = f"<a href='#CAT_{cat_idx}_ART_{art_idx}' color='black'>• {clean_title}</a>"
-                story.append(Paragraph(link_text, self.styles['TOCEntry']))
-                
-            story.append(Spacer(1, 10))
-            cat_idx += 1
-
-        story.append(PageBreak())
+        # Category Links (아래 B2B/Top 5 부분과 함께 스트리밍)
+        head = story
+        story = [PageBreak()]
 
         # 3. B2B Insights Body (Top5보다 먼저)
         if b2b_insights:
             anchor_tag = '<a name="B2B_INSIGHTS"/>'
-            story.append(Paragraph(f"{anchor_tag}💼 삼성전자 MX 사업부 B2B 개발그룹 관점", self.styles['Heading1Korean']))
+            story.append(self._paragraph(f"{anchor_tag}💼 삼성전자 MX 사업부 B2B 개발그룹 관점", 'Heading1Korean',
+                                         outline=('B2B_INSIGHTS', 0)))
             
             # Key Issues
             if b2b_insights.get('key_issues'):
-                story.append(Paragraph("🔍 주목할 핵심 이슈", self.styles['Heading2Korean']))
+                story.append(self._paragraph("🔍 주목할 핵심 이슈", 'Heading2Korean'))
                 for issue in b2b_insights['key_issues']:
-                    story.append(Paragraph(issue.get('title', ''), self.styles['ArticleTitle']))
-                    story.append(Paragraph(issue.get('description', ''), self.styles['BodyText']))
+                    story.append(self._paragraph(issue.get('title', ''), 'ArticleTitle'))
+                    story.append(self._paragraph(issue.get('description', ''), 'BodyText'))
                     story.append(Spacer(1, 15))
             
             # Implications
             if b2b_insights.get('implications'):
-                story.append(Paragraph("💡 비즈니스/기술적 시사점", self.styles['Heading2Korean']))
-                story.append(Paragraph(b2b_insights['implications'], self.styles['BodyText']))
+                story.append(self._paragraph("💡 비즈니스/기술적 시사점", 'Heading2Korean'))
+                story.append(self._paragraph(b2b_insights['implications'], 'BodyText'))
                 story.append(Spacer(1, 15))
             
             # Action Items
             if b2b_insights.get('action_items'):
-                story.append(Paragraph("📋 고려사항", self.styles['Heading2Korean']))
+                story.append(self._paragraph("📋 고려사항", 'Heading2Korean'))
                 for item in b2b_insights['action_items']:
-                    story.append(Paragraph(f"• {item}", self.styles['BodyText']))
+                    story.append(self._paragraph(f"• {item}", 'BodyText'))
             
             story.append(PageBreak())
 
         # 4. Top 5 Deep Dive Body
-        story.append(Paragraph("🔥 Top 5 Insights", self.styles['Heading1Korean']))
+        story.append(self._paragraph('<a name="TOP5"/>🔥 Top 5 Insights', 'Heading1Korean', outline=('TOP5', 0)))
         
         for idx, article in enumerate(top5_articles):
             # Set Anchor 'TOP5_{idx}'
             anchor_tag = f'<a name="TOP5_{idx}"/>'
-            self._add_article_to_story(story, article, rank=idx+1, anchor=anchor_tag)
+            self._add_article_to_story(story, article, rank=idx+1, anchor=anchor_tag, outline=(f"TOP5_{idx}", 1))
             
             if (idx + 1) % 2 == 0:
                 story.append(PageBreak())
@@ -184,28 +174,101 @@ class PDFBuilder:
         story.append(PageBreak())
 
         # 5. Full News by Category Body
-        story.append(Paragraph("📂 Full News by Category", self.styles['Heading1Korean']))
-        
-        cat_idx = 0
-        for category, news_list in news_by_category.items():
-            if not news_list: continue
-            
+        flowables = chain(head, self._iter_news_toc(news_sections), story, self._iter_news_body(news_sections))
+
+        # Build
+        doc.build_stream(flowables, chunk_size=getattr(settings, 'PDF_STREAM_CHUNK', 200))
+        if self.render_cache is not None:
+            self.render_cache.flush()
+            print(f"[INFO] Render cache: {self.render_cache.stats()}")
+        print(f"PDF Generated: {output_filename}")
+        return output_filename
+
+    def build_news_sections(self, top5_articles: List[Dict], all_news: List[Dict]) -> Dict:
+        """
+        Top 5를 제외한 전체 뉴스 부분의 구성 (B2B 인사이트와 무관)
+        flowable은 만들지 않음 - build_pdf()에서 그리는 순서대로 조금씩 생성 (기사 수천 개에서도 메모리 일정)
+        Returns: {'title': 섹션 제목, 'sections': [(아이콘, 섹션 이름, 기사 리스트), ...]}
+        """
+        # Organize data for TOC
+        processed_indices = set()
+        for article in top5_articles:
+             if 'link' in article: processed_indices.add(article['link'])
+
+        # 주제 클러스터링 결과가 있으면 주제별, 나머지는 카테고리별
+        sections = [section for section in self._group_news(all_news, processed_indices) if section[2]]
+        has_topics = any(icon == "🧩" for icon, _, _ in sections)
+        section_title = "News by Topic & Category" if has_topics else "News by Category"
+        return {'title': section_title, 'sections': sections}
+
+    def _iter_news_toc(self, news_sections: Dict):
+        """목차의 주제/카테고리 링크 flowable"""
+        yield self._paragraph(f"📂 {news_sections['title']}", 'Heading2Korean')
+
+        # Create TOC for Categories
+        for cat_idx, (icon, category, news_list) in enumerate(news_sections['sections']):
+            # Category Title
             clean_cat = category.replace('&', '&amp;')
-            story.append(Paragraph(f"📌 {clean_cat}", self.styles['Heading1Korean']))
-            
+            yield self._paragraph(f"{icon} {clean_cat}", 'Heading2Korean')
+
+            for art_idx, news in enumerate(news_list):
+                # Article Titles in TOC
+                title = news.get('title_korean', news['title'])
+                # Link to Anchor 'CAT_{cat_idx}_ART_{art_idx}'
+                # 제목이 길면 자르기
+                if len(title) > 60: title = title[:60] + "..."
+                clean_title = title.replace('&', '&amp;')
+                
+                link_text = f"<a href='#CAT_{cat_idx}_ART_{art_idx}' color='black'>• {clean_title}</a>"
+                yield self._toc_line(link_text, f"CAT_{cat_idx}_ART_{art_idx}")
+
+            yield Spacer(1, 10)
+
+    def _iter_news_body(self, news_sections: Dict):
+        """'Full News by ...' 본문 flowable (기사 하나씩 생성)"""
+        yield self._paragraph(f"<a name=\"NEWS\"/>📂 Full {news_sections['title']}", 'Heading1Korean', outline=('NEWS', 0))
+
+        for cat_idx, (icon, category, news_list) in enumerate(news_sections['sections']):
+            clean_cat = category.replace('&', '&amp;')
+            yield self._paragraph(f"<a name=\"CAT_{cat_idx}\"/>{icon} {clean_cat}", 'Heading1Korean',
+                                  outline=(f"CAT_{cat_idx}", 1))
+
             for art_idx, news in enumerate(news_list):
                 # Set Anchor 'CAT_{cat_idx}_ART_{art_idx}'
                 anchor_tag = f'<a name="CAT_{cat_idx}_ART_{art_idx}"/>'
-                self._add_article_to_story(story, news, is_simple=False, anchor=anchor_tag)
-                story.append(Spacer(1, 20))
-            
-            story.append(PageBreak())
-            cat_idx += 1
+                article_story = []
+                self._add_article_to_story(article_story, news, is_simple=False, anchor=anchor_tag,
+                                           outline=(f"CAT_{cat_idx}_ART_{art_idx}", 2))
+                yield from article_story
+                yield Spacer(1, 20)
 
-        # Build
-        doc.build(story)
-        print(f"PDF Generated: {output_filename}")
-        return output_filename
+            yield PageBreak()
+
+    def _group_news(self, all_news, exclude_links):
+        """
+        본문 섹션 구성 [(아이콘, 섹션 이름, 기사 리스트), ...]
+        - 2개 이상 남은 주제(topic_id)는 주제별 섹션 (주제 크기 순)
+        - 나머지 기사는 피드 카테고리별 섹션
+        """
+        remaining = [news for news in all_news if news.get('link') not in exclude_links]
+
+        news_by_topic = {}
+        for news in remaining:
+            if news.get('topic_id') is not None:
+                news_by_topic.setdefault(news['topic_id'], []).append(news)
+        topics = {topic_id: news_list for topic_id, news_list in news_by_topic.items() if len(news_list) >= 2}
+
+        sections = [("🧩", news_list[0].get('topic_label', f"Topic {topic_id}"), news_list)
+                    for topic_id, news_list in sorted(topics.items())]
+
+        news_by_category = {}
+        for news in remaining:
+            if news.get('topic_id') in topics: continue
+            cat = news.get('category', 'Others')
+            if cat not in news_by_category: news_by_category[cat] = []
+            news_by_category[cat].append(news)
+        sections += [("📌", category, news_list) for category, news_list in news_by_category.items()]
+        return sections
 
     def _clean_markdown(self, text):
         """Markdown 문법을 ReportLab이 이해할 수 있는 HTML 태그로 변환"""
@@ -223,46 +286,174 @@ class PDFBuilder:
         
         return text
 
-    def _add_article_to_story(self, story, article, rank=None, is_simple=False, anchor=""):
+    def _add_article_to_story(self, story, article, rank=None, is_simple=False, anchor="", outline=None):
+        fragments = self._article_fragments(article)
+
+        # 앵커/순위는 기사 위치에 따라 달라지므로 캐시된 제목 앞에 붙임
+        prefix = f"{anchor}{rank}. " if rank else anchor
+        if outline is None:
+            story.append(Paragraph(prefix + fragments['title'], self.styles['ArticleTitle']))
+        else:
+            story.append(OutlineParagraph(prefix + fragments['title'], self.styles['ArticleTitle'], outline=outline))
+        story.append(Paragraph(fragments['meta'], self.styles['MetaInfo']))
+        
+        if fragments['summary']:
+            story.append(Paragraph(fragments['summary'], self.styles['CoreSummary']))
+
+        if fragments['detail']:
+            story.append(Paragraph(fragments['detail'], self.styles['BodyText']))
+
+    def _article_fragments(self, article):
+        """기사 하나의 Paragraph 마크업 (렌더 캐시에 있으면 재사용)"""
+        if self.render_cache is None:
+            return self._render_article(article)
+        fields = {key: article.get(key) for key in ('title_korean', 'title', 'core_summary', 'detailed_explanation',
+                                                    'source', 'link', 'also_reported_by')}
+        fields['fonts'] = self.font_chain.signature
+        return self.render_cache.get_or_render('pdf_article', ARTICLE_TEMPLATE_VERSION, fields,
+                                               lambda: self._render_article(article))
+
+    def _render_article(self, article):
+        """제목/메타/핵심 요지/상세 설명 마크업 (Markdown 변환 + 대체 폰트 적용, 위치와 무관한 부분만)"""
         title = article.get('title_korean', article['title'])
         summary = article.get('core_summary', '')
         detail = article.get('detailed_explanation', '')
         source = article.get('source', '')
         link = article.get('link', '')
-        
-        if rank:
-            header = f"{anchor}{rank}. {title}"
-        else:
-            header = f"{anchor}{title}"
-            
-        story.append(Paragraph(header, self.styles['ArticleTitle']))
-        story.append(Paragraph(f"{source} | <a href='{link}' color='blue'>Original Link</a>", self.styles['MetaInfo']))
-        
+
+        meta = f"{source} | <a href='{link}' color='blue'>Original Link</a>"
+        also_reported = article.get('also_reported_by') or []
+        if also_reported:
+            others = ", ".join(f"<a href='{other.get('link', '')}' color='blue'>{other.get('source', '')}</a>" for other in also_reported)
+            meta += f"<br/>함께 보도: {others}"
+
+        fragments = {'title': self.font_chain.markup(title), 'meta': self.font_chain.markup(meta),
+                     'summary': '', 'detail': ''}
         if summary:
             # Summary도 Markdown 처리
             clean_summary = self._clean_markdown(summary)
-            story.append(Paragraph(f"<b>[핵심 요지]</b><br/>{clean_summary}", self.styles['CoreSummary']))
+            fragments['summary'] = self.font_chain.markup(f"<b>[핵심 요지]</b><br/>{clean_summary}")
 
         if detail:
             # Markdown Cleaning
             clean_detail = self._clean_markdown(detail)
             formatted_detail = clean_detail.replace('\n', '<br/>')
-            story.append(Paragraph(formatted_detail, self.styles['BodyText']))
+            fragments['detail'] = self.font_chain.markup(formatted_detail)
+        return fragments
 
 
 # TOC 지원을 위한 커스텀 템플릿
 from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame
 
 class MyDocTemplate(SimpleDocTemplate):
+    _story = None
+    page_number_font = ('Helvetica', 11)  # 목차 페이지 번호 (폰트 이름, 크기)
+
+    def handle_documentBegin(self):
+        self._toc_keys = set()      # 그려진 목차 줄이 가리키는 앵커
+        self._defined_keys = set()  # 페이지 번호 form을 정의한 앵커
+        super().handle_documentBegin()
+
+    def build_stream(self, flowables, chunk_size=200):
+        """
+        flowable iterator로 PDF 생성 - 남은 flowable이 chunk_size/2 이하가 되면 다음 chunk_size개를 만들어 채움
+        (이미 그린 flowable은 바로 해제되므로 전체 story를 메모리에 두지 않음)
+        """
+        self._stream = iter(flowables)
+        self._chunk_size = max(chunk_size, 2)
+        self._story = list(islice(self._stream, self._chunk_size))
+        try:
+            self.build(self._story)
+        finally:
+            self._stream = self._story = None
+
+    def handle_flowable(self, flowables):
+        # 내부 대기 리스트(_hanging 등)가 아닌 story 리스트만 채움
+        if flowables is self._story and len(flowables) <= self._chunk_size // 2:
+            flowables.extend(islice(self._stream, self._chunk_size))
+        super().handle_flowable(flowables)
+
     def afterFlowable(self, flowable):
-        "Registers TOC entries."
-        if flowable.__class__.__name__ == 'Paragraph':
-            text = flowable.getPlainText()
-            style = flowable.style.name
-            if style == 'Heading1Korean':
-                self.notify('TOCEntry', (0, text, self.page))
-            elif style == 'ArticleTitle':
-                # 제목이 너무 길면 자르기
-                if len(text) > 50: text = text[:50] + "..."
-                self.notify('TOCEntry', (1, text, self.page))
+        """outline 항목이 그려지면 북마크 추가 + 그 앵커를 가리키는 목차 줄의 페이지 번호 확정"""
+        outline = getattr(flowable, 'outline', None)
+        if outline is None:
+            return
+        key, level = outline
+        self.canv.addOutlineEntry(flowable.getPlainText(), key, level)
+        self._define_page_number(key, self.page)
+
+    def _define_page_number(self, key, page):
+        # 목차 줄은 페이지 번호 자리에 form을 먼저 참조해 두고, 대상이 그려지는 시점에 form 내용을 정의
+        # (문서를 두 번 그리는 multiBuild 없이 한 번에 페이지 번호 채우기)
+        if key not in self._toc_keys or key in self._defined_keys:
+            return
+        font_name, font_size = self.page_number_font
+        self.canv.beginForm(TOCLine.form_name(key), 0, -font_size, TOCLine.NUMBER_WIDTH, font_size * 2)
+        self.canv.setFont(font_name, font_size)
+        self.canv.setFillColor(colors.gray)
+        self.canv.drawRightString(TOCLine.NUMBER_WIDTH, 0, str(page))
+        self.canv.endForm()
+        self._defined_keys.add(key)
+
+    def _endBuild(self):
+        # 대상이 그려지지 않은 목차 줄이 있으면 빈 form으로 채움 (정의되지 않은 form은 저장 시 오류)
+        for key in self._toc_keys - self._defined_keys:
+            self.canv.beginForm(TOCLine.form_name(key))
+            self.canv.endForm()
+            self._defined_keys.add(key)
+        super()._endBuild()
+
+
+class OutlineParagraph(Paragraph):
+    """PDF 북마크/목차 페이지 번호 대상 Paragraph (나뉘어 그려지면 첫 부분만 대상)"""
+    def __init__(self, text, style, outline=None, **kwargs):
+        super().__init__(text, style, **kwargs)
+        self.outline = outline
+
+    def split(self, availWidth, availHeight):
+        parts = super().split(availWidth, availHeight)
+        for index, part in enumerate(parts):
+            part.outline = self.outline if index == 0 else None
+        return parts
+
+
+class TOCLine(Flowable):
+    """
+    목차 한 줄 - 링크 Paragraph + 오른쪽 끝 페이지 번호
+    페이지 번호는 이름 붙은 form(XObject) 참조로 그리고, 내용은 대상이 그려질 때 MyDocTemplate이 정의
+    """
+    NUMBER_WIDTH = 30
+
+    def __init__(self, paragraph, key):
+        super().__init__()
+        self.paragraph = paragraph
+        self.key = key
+
+    @staticmethod
+    def form_name(key):
+        return f"TOCPAGE_{key}"
+
+    def wrap(self, availWidth, availHeight):
+        _, self.height = self.paragraph.wrap(availWidth - self.NUMBER_WIDTH, availHeight)
+        self.width = availWidth
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        return []  # 한 줄짜리 항목 - 다음 페이지로 넘김
+
+    def getSpaceBefore(self):
+        return self.paragraph.getSpaceBefore()
+
+    def getSpaceAfter(self):
+        return self.paragraph.getSpaceAfter()
 
+    def draw(self):
+        self.paragraph.drawOn(self.canv, 0, 0)
+        doc = getattr(self.canv, '_doctemplate', None)
+        if doc is not None:
+            doc._toc_keys.add(self.key)
+        # 첫 줄 기준선에 맞춤
+        self.canv.saveState()
+        self.canv.translate(self.width - self.NUMBER_WIDTH, self.height - self.paragraph.style.fontSize)
+        self.canv.doForm(self.form_name(self.key))
+        self.canv.restoreState()
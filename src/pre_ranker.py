@@ -0,0 +1,61 @@
+from typing import List, Dict, Optional
+import numpy as np
+from src.utils.text_utils import tokenize
+from src.utils.vectorizer import bm25_idf, bm25_term_weights, build_term_matrix
+
+
+class RelevancePreRanker:
+    """
+    LLM 선정 전에 로컬에서 기사 관련도를 계산하는 역할 (API 호출 없음)
+    - 기사: title_korean + core_summary (분석 전 기사는 title + summary)
+    - 관심 프로필: {키워드/구절: 가중치} - 구절은 같은 토큰화 규칙으로 분해
+    - 점수: BM25 (scipy 희소 행렬 x 프로필 가중치 벡터, 한 번의 행렬-벡터 곱)
+    """
+    def __init__(self, profile: Dict[str, float], k1: float = 1.5, b: float = 0.75):
+        self.profile = profile
+        self.k1 = k1
+        self.b = b
+        # 프로필 구절별 토큰 (매칭된 키워드 표시용)
+        self._phrase_tokens = {phrase: set(tokenize(phrase)) for phrase in profile}
+
+    def score(self, articles: List[Dict]) -> np.ndarray:
+        """기사별 관련도 점수 (입력 순서)"""
+        if not articles:
+            return np.zeros(0)
+
+        counts, vocabulary = build_term_matrix([tokenize(self._text(article)) for article in articles])
+        query = np.zeros(len(vocabulary))
+        for phrase, weight in self.profile.items():
+            phrase_tokens = self._phrase_tokens[phrase]
+            for token in phrase_tokens:
+                col = vocabulary.get(token)
+                if col is not None:
+                    # 한글 구절은 음절 bigram 여러 개로 나뉘므로 구절 가중치를 토큰 수로 나눔
+                    query[col] += weight / len(phrase_tokens)
+
+        weights = bm25_term_weights(counts, k1=self.k1, b=self.b)
+        return weights.dot(query * bm25_idf(counts))
+
+    def rank(self, articles: List[Dict], scores: Optional[np.ndarray] = None) -> List[int]:
+        """점수 내림차순 기사 번호 (동점이면 입력 순서 - 실행마다 같은 결과)"""
+        if scores is None:
+            scores = self.score(articles)
+        # lexsort: 마지막 키가 1순위
+        return np.lexsort((np.arange(len(articles)), -scores)).tolist()
+
+    def top_k(self, articles: List[Dict], k: int, scores: Optional[np.ndarray] = None) -> List[int]:
+        """상위 k개 기사 번호 (입력 순서로 정렬 - 프롬프트 순서에 따른 편향 방지)"""
+        return sorted(self.rank(articles, scores)[:k])
+
+    def matched_terms(self, article: Dict, limit: int = 3) -> List[str]:
+        """기사에 등장하는 프로필 키워드 (가중치 높은 순)"""
+        tokens = set(tokenize(self._text(article)))
+        matched = [phrase for phrase, phrase_tokens in self._phrase_tokens.items()
+                   if phrase_tokens and phrase_tokens <= tokens]
+        matched.sort(key=lambda phrase: -self.profile[phrase])
+        return matched[:limit]
+
+    def _text(self, article: Dict) -> str:
+        if article.get('core_summary'):
+            return f"{article.get('title_korean', '')} {article['core_summary']}"
+        return f"{article.get('title', '')} {article.get('summary', '')}"
@@ -0,0 +1,118 @@
+from typing import List, Dict
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from src.utils.text_utils import tokenize
+from src.utils.vectorizer import build_term_matrix, document_frequency, tfidf_matrix
+
+
+class TopicClusterer:
+    """
+    분석된 기사들을 주제(topic) 단위로 묶는 역할 (API 호출 없음)
+    - 벡터: title_korean + core_summary의 TF-IDF (scipy 희소 행렬, 행별 L2 정규화)
+    - 후보 쌍(blocking): 기사마다 가중치 상위 key_terms개 단어를 키로 사용, 키를 공유하는 기사끼리만 비교
+      (등장 기사 수가 max_key_bucket을 넘는 단어만 키에서 제외 -> 큰 주제의 핵심 단어는 유지하면서
+       기사 수가 아주 많을 때도 전체 쌍 비교 O(n^2) 없이 후보 쌍만 계산, 기사가 그보다 적으면 사실상 전체 비교)
+    - 유사도: 후보 쌍의 코사인 유사도를 한 번의 희소 행렬 연산으로 계산
+    - 묶기: 유사도 >= threshold 인 쌍으로 그래프를 만들어 연결 요소(connected components) 단위로 묶음
+
+    각 기사에 topic_id / topic_label / topic_size 필드를 추가 (2개 이상 묶인 주제만 topic_id 부여)
+    """
+    def __init__(self, threshold: float = 0.35, key_terms: int = 8, max_key_bucket: int = 200, min_key_df: int = 2):
+        self.threshold = threshold
+        self.key_terms = key_terms
+        self.max_key_bucket = max_key_bucket
+        self.min_key_df = min_key_df
+
+    def cluster(self, analyzed_news: List[Dict]) -> List[Dict]:
+        """
+        주제 클러스터링
+
+        Returns:
+            2개 이상 기사로 이루어진 주제 리스트 (크기 내림차순)
+            [{'topic_id': 0, 'label': '대표 기사 제목', 'articles': [...]}, ...]
+        """
+        for news in analyzed_news:
+            news.pop('topic_id', None)
+            news.pop('topic_label', None)
+            news.pop('topic_size', None)
+        if len(analyzed_news) < 2:
+            return []
+
+        counts, _ = build_term_matrix([tokenize(self._text(news)) for news in analyzed_news])
+        vectors = tfidf_matrix(counts)
+
+        rows, cols = self._candidate_pairs(vectors, counts)
+        if rows.size == 0:
+            print(f"[INFO] Topic clustering: {len(analyzed_news)} articles, no candidate pairs")
+            return []
+
+        # 후보 쌍 코사인 유사도 (정규화된 행끼리의 내적)
+        similarities = np.asarray(vectors[rows].multiply(vectors[cols]).sum(axis=1)).ravel()
+        keep = similarities >= self.threshold
+        graph = sparse.coo_matrix(
+            (np.ones(int(keep.sum())), (rows[keep], cols[keep])),
+            shape=(len(analyzed_news), len(analyzed_news)),
+        )
+        _, labels = connected_components(graph, directed=False)
+
+        members = {}
+        for idx, label in enumerate(labels):
+            members.setdefault(label, []).append(idx)
+        groups = sorted((group for group in members.values() if len(group) >= 2), key=lambda group: (-len(group), group[0]))
+
+        topics = []
+        for topic_id, group in enumerate(groups):
+            label = self._label(vectors, group, analyzed_news)
+            for idx in group:
+                analyzed_news[idx]['topic_id'] = topic_id
+                analyzed_news[idx]['topic_label'] = label
+                analyzed_news[idx]['topic_size'] = len(group)
+            topics.append({'topic_id': topic_id, 'label': label, 'articles': [analyzed_news[idx] for idx in group]})
+
+        grouped = sum(len(group) for group in groups)
+        print(f"[INFO] Topic clustering: {len(analyzed_news)} articles -> {len(topics)} topics "
+              f"({grouped} grouped, {rows.size} candidate pairs of {len(analyzed_news) * (len(analyzed_news) - 1) // 2})")
+        return topics
+
+    def _candidate_pairs(self, vectors: sparse.csr_matrix, counts: sparse.csr_matrix):
+        """상위 가중치 단어를 공유하는 기사 쌍 (i < j)"""
+        n_docs = vectors.shape[0]
+        df = document_frequency(counts)
+        # 키로 쓸 단어: 2개 이상 기사에 등장하고 버킷(등장 기사 수)이 max_key_bucket 이하인 단어
+        # (비율로 자르면 그날 가장 큰 주제의 핵심 단어가 빠져 큰 주제가 후보 쌍을 만들지 못함)
+        usable = (df >= self.min_key_df) & (df <= max(self.min_key_df, self.max_key_bucket))
+
+        key_rows = []
+        key_cols = []
+        for row in range(n_docs):
+            start, end = vectors.indptr[row], vectors.indptr[row + 1]
+            terms = vectors.indices[start:end]
+            weights = vectors.data[start:end]
+            mask = usable[terms]
+            terms, weights = terms[mask], weights[mask]
+            if terms.size > self.key_terms:
+                terms = terms[np.argpartition(-weights, self.key_terms)[:self.key_terms]]
+            key_rows.extend([row] * terms.size)
+            key_cols.extend(terms.tolist())
+
+        keys = sparse.csr_matrix(
+            (np.ones(len(key_rows)), (key_rows, key_cols)), shape=(n_docs, vectors.shape[1])
+        )
+        # 키를 하나 이상 공유하는 쌍 (상삼각만)
+        shared = sparse.triu(keys.dot(keys.T), k=1).tocoo()
+        return shared.row.astype(np.int64), shared.col.astype(np.int64)
+
+    def _label(self, vectors: sparse.csr_matrix, group: List[int], analyzed_news: List[Dict]) -> str:
+        """주제 중심(centroid)에 가장 가까운 기사 제목을 주제 이름으로 사용"""
+        block = vectors[group]
+        centroid = np.asarray(block.mean(axis=0)).ravel()
+        center = group[int(np.argmax(block.dot(centroid)))]
+        news = analyzed_news[center]
+        label = news.get('title_korean') or news.get('title', '')
+        return label if len(label) <= 50 else label[:50] + "..."
+
+    def _text(self, news: Dict) -> str:
+        if news.get('core_summary'):
+            return f"{news.get('title_korean', '')} {news['core_summary']}"
+        return f"{news.get('title', '')} {news.get('summary', '')}"
@@ -0,0 +1,242 @@
+"""
+기사 분석 결과 저장소 - SQLite (WAL) 기반, 이미 분석한 기사는 다시 LLM에 보내지 않도록 재사용
+일일 리포트 요약(Top 5, B2B 인사이트, 주요 토픽)도 함께 저장해 주간 다이제스트에서 재사용
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 분석 결과로 저장/복원하는 필드
+ANALYSIS_FIELDS = ('title_korean', 'core_summary', 'detailed_explanation')
+
+# 링크 정규화 시 제거할 트래킹 파라미터
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'cmpid', 'ncid', 'sr_share'}
+
+# SQLite IN 절 변수 개수 제한을 넘지 않도록 나눠서 조회
+LOOKUP_CHUNK_SIZE = 500
+
+# 일일 리포트에 저장하는 Top 5 기사 필드 (상세 설명은 제외 - 주간 요약 입력을 작게 유지)
+DAILY_TOP_FIELDS = ('title', 'title_korean', 'core_summary', 'selection_reason', 'source', 'link', 'topic_label')
+
+
+def normalize_link(link: str) -> str:
+    """
+    같은 기사를 가리키는 링크가 같은 키가 되도록 정규화
+    - scheme/host 소문자, 기본 포트/fragment 제거
+    - utm_* 등 트래킹 파라미터 제거 후 나머지 파라미터 정렬
+    - 경로 끝의 '/' 제거
+    """
+    if not link:
+        return ""
+    parts = urlsplit(link.strip())
+    scheme = (parts.scheme or 'https').lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and not ((scheme == 'http' and parts.port == 80) or (scheme == 'https' and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ''))
+
+
+def content_hash(news: Dict) -> str:
+    """프롬프트에 들어가는 입력(제목/출처/요약)의 해시 - 내용이 바뀌면 다시 분석"""
+    payload = "\n".join([news.get('title', ''), news.get('source', ''), news.get('summary', '')])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ArticleStore:
+    """
+    정규화된 링크 + 내용 해시를 키로 분석 결과(title_korean, core_summary, detailed_explanation) 저장
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self):
+        with self._lock:
+            # WAL: 읽기와 쓰기가 서로 막지 않고, 커밋 비용이 작음
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    link_key TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    link TEXT,
+                    title TEXT,
+                    source TEXT,
+                    category TEXT,
+                    published_at TEXT,
+                    title_korean TEXT,
+                    core_summary TEXT,
+                    detailed_explanation TEXT,
+                    analyzed_at TEXT NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_published_at ON articles(published_at)")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS daily_reports (
+                    run_date TEXT PRIMARY KEY,
+                    article_count INTEGER NOT NULL,
+                    top_articles TEXT NOT NULL,
+                    insights TEXT NOT NULL,
+                    topics TEXT NOT NULL,
+                    saved_at TEXT NOT NULL
+                )
+            """)
+            self.conn.commit()
+
+    def lookup(self, news_list: List[Dict]) -> Dict[int, Dict]:
+        """
+        이미 분석된 기사 조회
+
+        Returns:
+            {news_list 인덱스: 분석 결과 필드 dict} - 링크와 내용 해시가 모두 일치하는 기사만 포함
+        """
+        keys = {}
+        for idx, news in enumerate(news_list):
+            link_key = normalize_link(news.get('link', ''))
+            if link_key:
+                keys.setdefault(link_key, []).append(idx)
+        if not keys:
+            return {}
+
+        rows = {}
+        key_list = list(keys)
+        with self._lock:
+            for start in range(0, len(key_list), LOOKUP_CHUNK_SIZE):
+                chunk = key_list[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self.conn.execute(
+                    f"SELECT link_key, content_hash, {', '.join(ANALYSIS_FIELDS)} FROM articles WHERE link_key IN ({placeholders})",
+                    chunk,
+                )
+                for row in cursor:
+                    rows[row['link_key']] = row
+
+        found = {}
+        for link_key, indices in keys.items():
+            row = rows.get(link_key)
+            if row is None:
+                continue
+            for idx in indices:
+                if row['content_hash'] == content_hash(news_list[idx]):
+                    found[idx] = {field: row[field] for field in ANALYSIS_FIELDS}
+        return found
+
+    def save_many(self, analyzed_list: List[Dict]) -> int:
+        """분석에 성공한 기사만 한 트랜잭션으로 일괄 저장, 저장한 개수 반환"""
+        analyzed_at = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for news in analyzed_list:
+            if not all(news.get(field) for field in ANALYSIS_FIELDS):
+                continue  # 분석 실패(원본 그대로 반환된) 기사는 저장하지 않음
+            link_key = normalize_link(news.get('link', ''))
+            if not link_key:
+                continue
+            rows.append((
+                link_key, content_hash(news), news.get('link'), news.get('title'), news.get('source'),
+                news.get('category'), news.get('published_at'),
+                news['title_korean'], news['core_summary'], news['detailed_explanation'], analyzed_at,
+            ))
+        if not rows:
+            return 0
+
+        with self._lock:
+            with self.conn:
+                self.conn.executemany("""
+                    INSERT INTO articles (
+                        link_key, content_hash, link, title, source, category, published_at,
+                        title_korean, core_summary, detailed_explanation, analyzed_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(link_key) DO UPDATE SET
+                        content_hash = excluded.content_hash,
+                        link = excluded.link,
+                        title = excluded.title,
+                        source = excluded.source,
+                        category = excluded.category,
+                        published_at = excluded.published_at,
+                        title_korean = excluded.title_korean,
+                        core_summary = excluded.core_summary,
+                        detailed_explanation = excluded.detailed_explanation,
+                        analyzed_at = excluded.analyzed_at
+                """, rows)
+        return len(rows)
+
+    def prune(self, retention_days: int) -> int:
+        """published_at 기준으로 retention_days보다 오래된 기사 삭제 (published_at 인덱스 사용), 일일 리포트도 같은 기간 보관"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        with self._lock:
+            with self.conn:
+                cursor = self.conn.execute("DELETE FROM articles WHERE published_at < ?", (cutoff.isoformat(),))
+                self.conn.execute("DELETE FROM daily_reports WHERE run_date < ?", (cutoff.strftime("%Y-%m-%d"),))
+        return cursor.rowcount
+
+    def save_daily_report(self, run_date: str, article_count: int, top_articles: List[Dict],
+                          insights: Dict, topics: List[Dict]):
+        """
+        일일 리포트 요약 저장 (같은 날짜는 덮어씀)
+
+        Args:
+            run_date: 실행 날짜 (KST, YYYY-MM-DD)
+            article_count: 분석된 기사 수
+            top_articles: 선정된 Top 5 (DAILY_TOP_FIELDS만 저장)
+            insights: B2B 인사이트 (key_issues / implications / action_items)
+            topics: 주요 토픽 [{'label': ..., 'count': ...}, ...]
+        """
+        top = [{field: article.get(field) for field in DAILY_TOP_FIELDS if article.get(field)} for article in top_articles]
+        with self._lock:
+            with self.conn:
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO daily_reports (run_date, article_count, top_articles, insights, topics, saved_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (
+                    run_date, article_count,
+                    json.dumps(top, ensure_ascii=False), json.dumps(insights or {}, ensure_ascii=False),
+                    json.dumps(topics, ensure_ascii=False), datetime.now(timezone.utc).isoformat(),
+                ))
+
+    def load_daily_reports(self, start_date: str, end_date: str) -> List[Dict]:
+        """start_date ~ end_date (포함, YYYY-MM-DD) 일일 리포트 요약 (날짜순)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM daily_reports WHERE run_date BETWEEN ? AND ? ORDER BY run_date",
+                (start_date, end_date),
+            ).fetchall()
+        return [{
+            'run_date': row['run_date'],
+            'article_count': row['article_count'],
+            'top_articles': json.loads(row['top_articles']),
+            'insights': json.loads(row['insights']),
+            'topics': json.loads(row['topics']),
+        } for row in rows]
+
+    def category_counts(self, since: str, until: str) -> Dict[str, int]:
+        """published_at이 since ~ until (ISO 문자열) 사이인 분석 기사의 카테고리별 개수 (많은 순)"""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT COALESCE(category, 'Others') AS category, COUNT(*) AS count FROM articles
+                WHERE published_at >= ? AND published_at < ?
+                GROUP BY COALESCE(category, 'Others') ORDER BY count DESC, category
+            """, (since, until)).fetchall()
+        return {row['category']: row['count'] for row in rows}
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,71 @@
+"""
+파이프라인 단계 체크포인트 - 실행 날짜별 디렉토리에 단계 출력을 JSON으로 저장 (--resume 시 완료된 단계 건너뛰기)
+"""
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointStore:
+    """
+    {root}/{run_date}/{stage}.json 에 단계 출력 저장
+    - 파일마다 형식 버전 기록 (버전이 다르면 없는 것으로 취급 -> 해당 단계부터 다시 실행)
+    - 임시 파일에 쓴 뒤 교체 (저장 중 중단되어도 깨진 체크포인트가 남지 않도록)
+    """
+    def __init__(self, root: str, run_date: str):
+        self.root = root
+        self.run_date = run_date
+        self.directory = os.path.join(root, run_date)
+
+    def _path(self, stage_name: str) -> str:
+        return os.path.join(self.directory, f"{stage_name}.json")
+
+    def load(self, stage_name: str) -> Optional[Dict]:
+        """저장된 단계 출력 (없거나 버전이 다르거나 깨졌으면 None)"""
+        path = self._path(stage_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CHECKPOINT_VERSION:
+                print(f"[INFO] Checkpoint version mismatch. Ignoring {path}")
+                return None
+            return data.get('outputs', {})
+        except Exception as e:
+            print(f"[WARNING] Failed to load checkpoint ({path}): {e}")
+            return None
+
+    def save(self, stage_name: str, outputs: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(stage_name)
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'stage': stage_name,
+            'run_date': self.run_date,
+            'saved_at': time.time(),
+            'outputs': outputs,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        """이 실행 날짜의 체크포인트 전체 삭제 (새로 실행할 때)"""
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+
+    def prune(self, retention_days: int):
+        """보관 기간이 지난 실행 날짜 디렉토리 삭제"""
+        if not os.path.isdir(self.root):
+            return
+        cutoff = (datetime.strptime(self.run_date, "%Y-%m-%d") - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+        for name in os.listdir(self.root):
+            if name < cutoff and os.path.isdir(os.path.join(self.root, name)):
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
@@ -0,0 +1,94 @@
+"""
+피드 조건부 요청(Conditional GET) 캐시 - ETag / Last-Modified + 마지막 파싱 결과를 디스크에 저장
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+CACHE_VERSION = 1
+
+
+class FeedCache:
+    """
+    피드 URL별로 ETag, Last-Modified, 마지막으로 파싱한 엔트리 목록을 JSON 파일에 보관
+    - 다음 실행에서 If-None-Match / If-Modified-Since 헤더를 보내고
+    - 304 Not Modified 응답이면 다운로드/파싱 없이 저장된 엔트리를 재사용
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._feeds = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION:
+                print(f"[INFO] Feed cache version mismatch. Ignoring {self.path}")
+                return {}
+            return data.get('feeds', {})
+        except Exception as e:
+            # 캐시가 깨져도 수집은 계속 진행 (전체 다운로드)
+            print(f"[WARNING] Failed to load feed cache ({self.path}): {e}")
+            return {}
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """저장된 검증자로 조건부 요청 헤더 구성 (엔트리가 없으면 빈 dict)"""
+        with self._lock:
+            cached = self._feeds.get(url)
+        if not cached or cached.get('entries') is None:
+            return {}
+
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def get_entries(self, url: str) -> Optional[List[Dict]]:
+        with self._lock:
+            cached = self._feeds.get(url)
+        return cached.get('entries') if cached else None
+
+    def update(self, url: str, etag: Optional[str], last_modified: Optional[str], entries: List[Dict]):
+        """200 응답 후 검증자와 파싱 결과 갱신"""
+        with self._lock:
+            cached = self._feeds.setdefault(url, {})
+            cached['etag'] = etag
+            cached['last_modified'] = last_modified
+            cached['entries'] = entries
+            cached['checked_at'] = time.time()
+
+    def mark_not_modified(self, url: str):
+        """304 응답 시 마지막 확인 시각만 갱신"""
+        with self._lock:
+            if url in self._feeds:
+                self._feeds[url]['checked_at'] = time.time()
+
+    def prune(self, active_urls: List[str]):
+        """feeds.json에서 빠진 피드의 캐시 제거"""
+        active = set(active_urls)
+        with self._lock:
+            for url in list(self._feeds):
+                if url not in active:
+                    del self._feeds[url]
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체 (중간에 중단되어도 기존 캐시가 깨지지 않도록)"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            data = {'version': CACHE_VERSION, 'feeds': self._feeds}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
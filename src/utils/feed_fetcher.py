@@ -0,0 +1,143 @@
+"""
+피드 다운로드 유틸리티 - 스레드 풀 기반 동시 다운로드 (전체/호스트별 동시성 제한 + 타임아웃)
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Iterator, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+DEFAULT_USER_AGENT = "NewsAgent/1.0 (+https://github.com/gutiroben/NewsAgent)"
+
+
+@dataclass
+class FetchResult:
+    """단일 피드 다운로드 결과"""
+    url: str
+    status: Optional[int] = None
+    content: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+class FeedFetcher:
+    """
+    여러 피드 URL을 동시에 다운로드
+    - 전체 동시 다운로드 수(max_workers)와 호스트별 동시 다운로드 수(per_host_limit)를 모두 제한
+    - 연결/읽기 타임아웃 + 피드 하나당 전체 다운로드 시간 제한(total_timeout)
+    - 결과는 입력 URL 순서 그대로 반환 (완료 순서와 무관하게 결정적)
+    """
+    def __init__(self, max_workers=16, per_host_limit=2, connect_timeout=5.0, read_timeout=20.0,
+                 total_timeout=30.0, user_agent=DEFAULT_USER_AGENT):
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.user_agent = user_agent
+
+        self._host_semaphores = {}
+        self._host_lock = threading.Lock()
+        self._local = threading.local()
+
+    def fetch_all(self, urls: List[str], request_headers: Optional[List[Dict[str, str]]] = None) -> List[FetchResult]:
+        """
+        모든 URL을 동시에 다운로드하고 입력 순서대로 결과 반환
+
+        Args:
+            urls: 다운로드할 URL 리스트
+            request_headers: URL별 추가 요청 헤더 (조건부 요청용, urls와 같은 길이)
+        """
+        if not urls:
+            return []
+        if request_headers is None:
+            request_headers = [None] * len(urls)
+
+        workers = min(self.max_workers, len(urls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-fetch") as executor:
+            # executor.map은 제출 순서대로 결과를 돌려주므로 출력 순서가 항상 동일함
+            return list(executor.map(self.fetch, urls, request_headers))
+
+    def iter_fetch(self, urls: List[str], request_headers: Optional[List[Dict[str, str]]] = None) -> Iterator[Tuple[int, FetchResult]]:
+        """완료되는 순서대로 (입력 인덱스, 결과)를 yield (스트리밍 수집용)"""
+        if not urls:
+            return
+        if request_headers is None:
+            request_headers = [None] * len(urls)
+
+        workers = min(self.max_workers, len(urls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-fetch") as executor:
+            futures = {
+                executor.submit(self.fetch, url, headers): index
+                for index, (url, headers) in enumerate(zip(urls, request_headers))
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        """단일 URL 다운로드 (호스트별 세마포어 획득 후 요청)"""
+        semaphore = self._get_host_semaphore(url)
+        with semaphore:
+            return self._download(url, headers)
+
+    def _get_host_semaphore(self, url: str) -> threading.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _get_session(self) -> requests.Session:
+        # requests.Session은 스레드 간 공유가 안전하지 않으므로 스레드별로 생성 (Keep-Alive 재사용)
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": self.user_agent})
+            self._local.session = session
+        return session
+
+    def _download(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        start = time.monotonic()
+        result = FetchResult(url=url)
+
+        try:
+            response = self._get_session().get(
+                url,
+                headers=headers,
+                timeout=(self.connect_timeout, self.read_timeout),
+                stream=True,
+            )
+            with response:
+                result.status = response.status_code
+                result.headers = {k.lower(): v for k, v in response.headers.items()}
+                response.raise_for_status()
+
+                # 304 Not Modified는 본문이 없으므로 읽지 않음
+                if not result.not_modified:
+                    # 읽기 타임아웃은 소켓 read 단위이므로, 조금씩 흘려보내는 서버를 막기 위해 전체 시간도 확인
+                    chunks = []
+                    for chunk in response.iter_content(chunk_size=65536):
+                        chunks.append(chunk)
+                        if time.monotonic() - start > self.total_timeout:
+                            raise TimeoutError(f"Download exceeded {self.total_timeout}s")
+                    result.content = b"".join(chunks)
+
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+
+        result.elapsed = time.monotonic() - start
+        return result
@@ -0,0 +1,98 @@
+"""
+피드별 수집 기준점(high-watermark) - 마지막으로 수집한 발행 시각 + 이미 본 GUID를 실행 간 유지
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+WATERMARK_VERSION = 1
+
+
+class FeedWatermarks:
+    """
+    피드 URL별로 {'latest_ts': 마지막으로 본 발행 시각, 'guids': {guid: 마지막으로 피드에서 본 시각}} 보관
+    - 발행 시각이 latest_ts - grace 이전인 엔트리는 이미 처리한 구간 (정렬된 피드는 여기서 순회 중단)
+    - 그 이후 구간은 GUID로 새 엔트리만 골라냄 (늦게 올라온 기사 포함, 같은 기사 중복 수집 방지)
+    - 날짜가 없는 엔트리는 GUID만으로 새 엔트리 여부 판단
+    - 피드에 계속 남아 있는 GUID는 볼 때마다 시각이 갱신되어 보관 기간이 지나도 지워지지 않음
+    """
+    def __init__(self, path: str, guid_retention_days: int = 14, max_guids: int = 1000):
+        self.path = path
+        self.guid_retention_days = guid_retention_days
+        self.max_guids = max_guids
+        self._lock = threading.Lock()
+        self._feeds = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != WATERMARK_VERSION:
+                print(f"[INFO] Feed watermark version mismatch. Ignoring {self.path}")
+                return {}
+            return data.get('feeds', {})
+        except Exception as e:
+            # 기준점이 깨지면 lookback 시간 기준으로 수집 (첫 실행과 동일)
+            print(f"[WARNING] Failed to load feed watermarks ({self.path}): {e}")
+            return {}
+
+    def get(self, url: str) -> Optional[Dict]:
+        """피드의 기준점 (처음 보는 피드면 None)"""
+        with self._lock:
+            return self._feeds.get(url)
+
+    def updated_record(self, url: str, latest_ts: Optional[float], seen_guids: List[str]) -> Dict:
+        """
+        이번 수집 결과를 반영한 새 기준점 (저장은 하지 않음 - 리포트 발송 후 apply()로 반영)
+
+        Args:
+            latest_ts: 이번에 본 엔트리 중 가장 최근 발행 시각 (없으면 기존 값 유지)
+            seen_guids: 이번에 순회한 엔트리의 GUID
+        """
+        now = time.time()
+        previous = self.get(url) or {}
+        guids = dict(previous.get('guids', {}))
+        for guid in seen_guids:
+            guids[guid] = now
+
+        # 오래전에 피드에서 사라진 GUID 정리 + 피드당 최대 개수 유지 (최근에 본 순)
+        cutoff = now - self.guid_retention_days * 86400
+        kept = sorted((item for item in guids.items() if item[1] >= cutoff), key=lambda item: -item[1])
+        candidates = [ts for ts in (previous.get('latest_ts'), latest_ts) if ts is not None]
+        return {
+            'latest_ts': max(candidates) if candidates else None,
+            'guids': dict(kept[:self.max_guids]),
+            'updated_at': now,
+        }
+
+    def apply(self, updates: Dict[str, Dict]):
+        """updated_record() 결과들을 반영 (피드 URL -> 새 기준점)"""
+        with self._lock:
+            self._feeds.update(updates)
+
+    def prune(self, active_urls: List[str]):
+        """feeds.json에서 빠진 피드의 기준점 제거"""
+        active = set(active_urls)
+        with self._lock:
+            for url in list(self._feeds):
+                if url not in active:
+                    del self._feeds[url]
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체 (중간에 중단되어도 기존 기준점이 깨지지 않도록)"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            data = {'version': WATERMARK_VERSION, 'feeds': self._feeds}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
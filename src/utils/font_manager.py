@@ -1,33 +1,175 @@
+"""
+PDF 폰트 준비 - 저장소/시스템 폰트 디렉토리에서만 찾음 (실행 중 네트워크 다운로드 없음)
+- 본문 폰트에 없는 글자(이모지 등)는 대체 폰트 체인에서 찾아 <font> 태그로 감쌈
+- PDF에는 실제로 쓴 글리프만 서브셋으로 포함 (ReportLab TTFont 기본 동작)
+"""
 import os
-import requests
+import re
+from typing import Dict, List, Optional, Tuple
 
-def ensure_korean_font():
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from config import settings
+
+# 본문(한국어) 폰트 후보 - 앞에서부터 먼저 찾은 파일 사용 (CFF 기반 OTF/TTC는 ReportLab에서 사용 불가)
+KOREAN_FONT_FILES = (
+    'NanumGothic.ttf',            # fonts-nanum (Ubuntu: /usr/share/fonts/truetype/nanum)
+    'NanumGothic-Regular.ttf',
+    'NanumBarunGothic.ttf',
+    'UnDotum.ttf',                # fonts-unfonts-core
+    'malgun.ttf',                 # Windows
+    'AppleGothic.ttf',            # macOS
+)
+
+# 이모지/기호 대체 폰트 후보 - 찾은 폰트를 모두 순서대로 체인에 추가 (컬러 비트맵 이모지 폰트는 사용 불가)
+FALLBACK_FONT_FILES = (
+    'Symbola.ttf',                # fonts-symbola
+    'Symbola_hint.ttf',
+    'NotoEmoji-Regular.ttf',      # 흑백 Noto Emoji
+    'seguisym.ttf',               # Windows Segoe UI Symbol
+    'DejaVuSans.ttf',             # fonts-dejavu-core (기호 일부)
+)
+
+# 대체 폰트에도 없으면 지우는 글자 (이모지 영역 + 변형 선택자/ZWJ) - 그 외 글자는 그대로 둠
+_EMOJI_RE = re.compile('[\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF\uFE0F\u200D]')
+_TAG_RE = re.compile(r'(<[^>]*>)')
+
+
+class FontNotFoundError(RuntimeError):
+    """한국어 본문 폰트를 찾지 못함 (Helvetica로 그리면 한국어가 모두 깨진 PDF가 발송됨)"""
+
+
+def font_search_dirs() -> List[str]:
+    """폰트를 찾을 디렉토리 (settings.FONT_SEARCH_DIRS -> 시스템 폰트 디렉토리)"""
+    dirs = list(getattr(settings, 'FONT_SEARCH_DIRS', ['assets/fonts']))
+    dirs += [
+        '/usr/share/fonts',
+        '/usr/local/share/fonts',
+        os.path.expanduser('~/.local/share/fonts'),
+        os.path.expanduser('~/.fonts'),
+        '/Library/Fonts',
+        '/System/Library/Fonts',
+        os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts'),
+    ]
+    return dirs
+
+
+def _index_font_files(search_dirs: List[str]) -> Dict[str, str]:
+    """소문자 파일 이름 -> 경로 (먼저 나온 디렉토리 우선)"""
+    index = {}
+    for directory in search_dirs:
+        if not os.path.isdir(directory):
+            continue
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                index.setdefault(filename.lower(), os.path.join(root, filename))
+    return index
+
+
+def find_fonts(filenames, search_dirs: Optional[List[str]] = None, index: Optional[Dict[str, str]] = None) -> List[str]:
+    """후보 파일 이름 순서대로 찾은 폰트 경로 리스트"""
+    if index is None:
+        index = _index_font_files(search_dirs or font_search_dirs())
+    return [index[name.lower()] for name in filenames if name.lower() in index]
+
+
+class FontChain:
+    """
+    본문 폰트 + 대체 폰트 체인
+    markup()은 본문 폰트에 없는 글자를 체인에서 처음으로 가진 폰트의 <font name=...>으로 감쌈
+    """
+    def __init__(self, primary_name: str, primary: Optional[TTFont] = None,
+                 fallbacks: Optional[List[Tuple[str, TTFont]]] = None):
+        self.primary_name = primary_name
+        self._primary_chars = primary.face.charToGlyph if primary is not None else None
+        self._fallbacks = [(name, font.face.charToGlyph) for name, font in (fallbacks or [])]
+        self._resolved: Dict[str, Optional[str]] = {}
+        # 폰트 구성 식별자 (렌더 캐시 키 - 폰트가 바뀌면 대체 폰트로 감싸는 결과도 달라짐)
+        fonts = ([(primary_name, primary)] if primary is not None else []) + list(fallbacks or [])
+        self.signature = "|".join([primary_name] + [f"{name}={os.path.basename(str(font.face.filename))}" for name, font in fonts])
+
+    @property
+    def fallback_names(self) -> List[str]:
+        return [name for name, _ in self._fallbacks]
+
+    def _font_for(self, char: str) -> Optional[str]:
+        """글자를 그릴 폰트 이름 (본문 폰트면 primary_name, 아무 폰트에도 없으면 None)"""
+        if char not in self._resolved:
+            font_name = None
+            if ord(char) in self._primary_chars:
+                font_name = self.primary_name
+            else:
+                for name, chars in self._fallbacks:
+                    if ord(char) in chars:
+                        font_name = name
+                        break
+            self._resolved[char] = font_name
+        return self._resolved[char]
+
+    def markup(self, text: str) -> str:
+        """Paragraph 마크업 텍스트 변환 (태그 안은 건드리지 않음, 본문 폰트가 TTF가 아니면 그대로 반환)"""
+        if self._primary_chars is None or not text or text.isascii():
+            return text
+
+        parts = []
+        for segment in _TAG_RE.split(text):
+            if not segment or segment.startswith('<') or segment.isascii():
+                parts.append(segment)
+                continue
+            current, run = self.primary_name, []
+            for char in segment:
+                font_name = self.primary_name if char.isascii() else self._font_for(char)
+                if font_name is None:
+                    if _EMOJI_RE.match(char):
+                        continue  # 그릴 폰트가 없는 이모지는 빈 네모 대신 생략
+                    font_name = self.primary_name
+                if font_name != current:
+                    parts.append(self._wrap(current, ''.join(run)))
+                    current, run = font_name, []
+                run.append(char)
+            parts.append(self._wrap(current, ''.join(run)))
+        return ''.join(parts)
+
+    def _wrap(self, font_name: str, text: str) -> str:
+        if not text or font_name == self.primary_name:
+            return text
+        return f'<font name="{font_name}">{text}</font>'
+
+
+def register_report_fonts() -> FontChain:
     """
-    나눔고딕 폰트가 있는지 확인하고 없으면 다운로드
+    본문 폰트 + 대체 폰트를 ReportLab에 등록하고 FontChain 반환
+    한국어 폰트가 없으면 FontNotFoundError (PDF_ALLOW_FONT_FALLBACK=true일 때만 경고 후 Helvetica 사용)
     """
-    font_dir = "assets/fonts"
-    font_path = os.path.join(font_dir, "NanumGothic.ttf")
-    
-    if os.path.exists(font_path):
-        return font_path
-        
-    print("Downloading NanumGothic font...")
-    os.makedirs(font_dir, exist_ok=True)
-    
-    # Google Fonts CDN (또는 안정적인 소스)
-    url = "https://github.com/google/fonts/raw/main/ofl/nanumgothic/NanumGothic-Regular.ttf"
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        with open(font_path, "wb") as f:
-            f.write(response.content)
-            
-        print("Font downloaded successfully.")
-        return font_path
-    except Exception as e:
-        print(f"Failed to download font: {e}")
-        # 폰트 다운로드 실패 시 None 반환 -> PDF 생성 시 기본 폰트(영어만 나옴) 사용 혹은 에러 처리
-        return None
+    index = _index_font_files(font_search_dirs())
+
+    primary = None
+    for path in find_fonts(KOREAN_FONT_FILES, index=index):
+        try:
+            primary = TTFont('NanumGothic', path)
+            break
+        except Exception as e:
+            print(f"[WARNING] Failed to load font {path}: {e}")
+    if primary is None:
+        message = ("Korean font not found. Install fonts-nanum (sudo apt-get install fonts-nanum) "
+                   "or put NanumGothic.ttf in assets/fonts.")
+        if not getattr(settings, 'PDF_ALLOW_FONT_FALLBACK', False):
+            raise FontNotFoundError(message)
+        print(f"[WARNING] {message} Using Helvetica (Korean text will not render).")
+        return FontChain('Helvetica')
+    pdfmetrics.registerFont(primary)
 
+    fallbacks = []
+    for path in find_fonts(FALLBACK_FONT_FILES, index=index):
+        if os.path.samefile(path, primary.face.filename):
+            continue
+        name = f"Fallback{len(fallbacks)}"
+        try:
+            font = TTFont(name, path)
+        except Exception as e:
+            print(f"[WARNING] Failed to load fallback font {path}: {e}")
+            continue
+        pdfmetrics.registerFont(font)
+        fallbacks.append((name, font))
+    return FontChain(primary.fontName, primary, fallbacks)
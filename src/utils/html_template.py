@@ -0,0 +1,159 @@
+"""
+HTML 템플릿 - 이메일 본문용 최소 템플릿 엔진 (외부 의존성 없음)
+- Template: 모듈 로드 시 한 번 파싱 (리터럴/필드 분리 + 줄 앞 들여쓰기 제거), render()는 조각 리스트를 한 번에 join
+- 필드 값은 기본으로 HTML 이스케이프, {name:raw}만 그대로 삽입 (이미 렌더링한 HTML 조각용)
+- HtmlBlocks: 우선순위가 있는 블록 목록, 크기 예산을 넘으면 우선순위가 낮은 블록부터 생략 (Gmail은 약 102KB 넘는 본문을 잘라 표시)
+"""
+import html
+import re
+from string import Formatter
+from typing import Dict, List, Optional
+
+# 예산을 넘어도 생략하지 않는 블록 우선순위 (숫자가 클수록 먼저 생략)
+REQUIRED = 0
+
+_INDENT_RE = re.compile(r'\n[ \t]+')
+
+
+def escape(value) -> str:
+    """텍스트/속성 값 이스케이프 (None은 빈 문자열)"""
+    if value is None:
+        return ''
+    return html.escape(str(value), quote=True)
+
+
+def safe_url(url) -> str:
+    """http(s) 링크만 허용 (javascript: 등 그 외 스킴은 '#'), 속성 값으로 이스케이프"""
+    url = str(url or '').strip()
+    if not url.lower().startswith(('http://', 'https://')):
+        return '#'
+    return escape(url)
+
+
+class Template:
+    """
+    str.format 문법 템플릿 ({name}, {name:02d}, {name:raw}, 중괄호 자체는 {{ }})
+    생성 시 파싱해두므로 모듈 상수로 만들어 재사용
+    """
+    def __init__(self, source: str):
+        self._parts = []  # (리터럴, 필드 이름 또는 None, format spec)
+        for literal, field, spec, conversion in Formatter().parse(source.strip()):
+            if conversion:
+                raise ValueError(f"Template conversion is not supported: {{{field}!{conversion}}}")
+            self._parts.append((_INDENT_RE.sub('\n', literal), field, spec or ''))
+        self.fields = frozenset(field for _, field, _ in self._parts if field is not None)
+
+    def render(self, **values) -> str:
+        out = []
+        for literal, field, spec in self._parts:
+            out.append(literal)
+            if field is None:
+                continue
+            value = values[field]
+            if spec == 'raw':
+                out.append('' if value is None else str(value))
+            else:
+                out.append(escape(format(value, spec) if spec else value))
+        return ''.join(out)
+
+
+class HtmlBlocks:
+    """
+    문서 순서대로 쌓는 HTML 블록 목록
+    - priority: REQUIRED(0)는 항상 유지, 예산 초과 시 숫자가 큰 블록부터 (같으면 뒤쪽 블록부터) 생략
+    - group/anchor: 섹션 제목처럼 anchor=True인 블록은 같은 group의 내용 블록이 모두 생략되면 함께 생략
+    """
+    def __init__(self):
+        self._blocks: List[Dict] = []
+
+    def add(self, html_text: str, priority: int = REQUIRED, label: str = '',
+            group: Optional[str] = None, anchor: bool = False) -> int:
+        """블록 추가 (빈 문자열은 무시), 블록 번호 반환 (replace()용)"""
+        if not html_text:
+            return -1
+        self._blocks.append({'html': html_text, 'priority': priority, 'label': label, 'group': group,
+                             'anchor': anchor, 'size': len(html_text.encode('utf-8')), 'kept': True})
+        return len(self._blocks) - 1
+
+    def replace(self, index: int, html_text: str):
+        block = self._blocks[index]
+        block['html'] = html_text
+        block['size'] = len(html_text.encode('utf-8'))
+
+    @property
+    def size(self) -> int:
+        """유지 중인 블록의 UTF-8 바이트 수 합계"""
+        return sum(block['size'] for block in self._blocks if block['kept'])
+
+    def fit(self, budget_bytes: Optional[int], reserve: int = 0) -> List[str]:
+        """
+        예산 안으로 줄이고 생략한 블록 label 목록 반환 (예산 이내면 아무것도 생략하지 않음)
+        Args:
+            budget_bytes: 본문 최대 크기 (None/0이면 제한 없음)
+            reserve: 생략이 필요할 때 추가로 비워둘 크기 (생략 안내 문구 등)
+        """
+        total = self.size
+        if not budget_bytes or total <= budget_bytes:
+            return []
+        limit = budget_bytes - reserve
+
+        contents: Dict[str, int] = {}
+        for block in self._blocks:
+            if block['kept'] and block['group'] and not block['anchor']:
+                contents[block['group']] = contents.get(block['group'], 0) + 1
+
+        candidates = [index for index, block in enumerate(self._blocks)
+                      if block['kept'] and block['priority'] != REQUIRED and not block['anchor']]
+        candidates.sort(key=lambda index: (self._blocks[index]['priority'], index), reverse=True)
+
+        dropped = []
+        for index in candidates:
+            if total <= limit:
+                break
+            block = self._blocks[index]
+            block['kept'] = False
+            total -= block['size']
+            dropped.append(index)
+            group = block['group']
+            if group:
+                contents[group] -= 1
+                if contents[group] == 0:
+                    total -= self._set_anchors(group, False)
+
+        # 큰 블록 하나를 생략해 여유가 생겼으면 그 전에 생략한 작은 블록 중 다시 들어가는 것은 되돌림 (나중에 생략한 것부터)
+        for index in reversed(dropped):
+            block = self._blocks[index]
+            group = block['group']
+            needed = block['size']
+            if group and contents[group] == 0:
+                needed += self._anchor_size(group)
+            if total + needed > limit:
+                continue
+            block['kept'] = True
+            total += needed
+            if group:
+                if contents[group] == 0:
+                    self._set_anchors(group, True)
+                contents[group] += 1
+
+        labels = []
+        for index in dropped:
+            block = self._blocks[index]
+            if not block['kept'] and block['label'] and block['label'] not in labels:
+                labels.append(block['label'])
+        return labels
+
+    def _anchor_size(self, group: str) -> int:
+        return sum(block['size'] for block in self._blocks if block['group'] == group and block['anchor'])
+
+    def _set_anchors(self, group: str, kept: bool) -> int:
+        """group의 anchor 블록 유지 여부 변경, 바뀐 블록 크기 합계 반환"""
+        changed = 0
+        for block in self._blocks:
+            if block['group'] == group and block['anchor'] and block['kept'] != kept:
+                block['kept'] = kept
+                changed += block['size']
+        return changed
+
+    def render(self) -> str:
+        return ''.join(block['html'] for block in self._blocks if block['kept'])
@@ -1,18 +1,33 @@
 """
-JSON 파싱 유틸리티 - JSON5 파서 사용 및 오류 로깅
+JSON 파싱 유틸리티 - 단계별(tiered) 파서 및 오류 로깅
+strict JSON(orjson -> json) -> 흔한 LLM 출력 결함 복구(repair) -> JSON5 순서로 시도
 """
 import json
 import json5
 import re
 import os
+from collections import Counter
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from typing import Any
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson  # 선택 의존성 (설치되어 있으면 가장 먼저 사용)
+except ImportError:
+    orjson = None
+
+_JSON_BLOCK_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+_CODE_BLOCK_RE = re.compile(r'```[^\n]*\s*(.*?)\s*```', re.DOTALL)
+# 허용되는 제어 문자: \t (0x09), \n (0x0A), \r (0x0D) / 나머지 제어 문자와 BOM은 제거
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\uFEFF]')
+
+# 성공한 파싱 단계별 횟수 (벤치마크/디버깅용)
+tier_counts = Counter()
 
 
 def parse_json(text: str, context: str = "unknown") -> Any:
     """
-    JSON 파싱 (마크다운 제거 + 제어 문자 제거 + JSON5 파싱 + 검증)
+    JSON 파싱 (마크다운 제거 + 제어 문자 제거 + 단계별 파싱)
     
     Args:
         text: 파싱할 JSON 문자열 (마크다운 코드 블록 포함 가능)
@@ -22,7 +37,7 @@ def parse_json(text: str, context: str = "unknown") -> Any:
         파싱된 객체 (dict 또는 list)
     
     Raises:
-        json.JSONDecodeError: 파싱 실패 시
+        ValueError: 모든 단계에서 파싱 실패 시 (JSON5 파서의 오류)
     """
     clean_text = text.strip()
     
@@ -33,36 +48,149 @@ def parse_json(text: str, context: str = "unknown") -> Any:
     clean_text = _remove_control_characters(clean_text)
     
     try:
-        parsed = json5.loads(clean_text)
-        # Strict JSON으로 재직렬화하여 검증
-        json.dumps(parsed, ensure_ascii=False)
+        parsed, _ = loads_tiered(clean_text)
         return parsed
-    except (json.JSONDecodeError, ValueError) as e:
+    except ValueError as e:
         _save_parse_error_log(text, clean_text, e, context)
         raise
 
 
+def loads_tiered(text: str) -> Tuple[Any, str]:
+    """
+    단계별 파싱
+
+    Returns:
+        (파싱된 객체, 성공한 단계 이름: 'orjson' | 'json' | 'repair' | 'json5')
+
+    Raises:
+        ValueError: 모든 단계 실패 시 JSON5 파서의 오류
+    """
+    # 1. strict JSON (대부분의 정상 응답은 여기서 끝남)
+    if orjson is not None:
+        try:
+            return _counted(orjson.loads(text), 'orjson')
+        except ValueError:
+            pass
+    try:
+        # strict=False: 문자열 안의 줄바꿈/탭 허용
+        return _counted(json.loads(text, strict=False), 'json')
+    except ValueError:
+        pass
+
+    # 2. 복구 후 strict JSON: trailing comma 제거, 문자열 안 줄바꿈 이스케이프, 잘린 배열은 마지막 완성 원소까지 닫기
+    #    (느린 JSON5 파서보다 먼저 시도)
+    repaired = repair_json(text)
+    if repaired is not None and repaired != text:
+        try:
+            return _counted(json.loads(repaired, strict=False), 'repair')
+        except ValueError:
+            pass
+
+    # 3. JSON5 (주석, 작은따옴표, 따옴표 없는 키 등) - 원문, 복구본 순서
+    try:
+        return _counted(json5.loads(text), 'json5')
+    except ValueError as e:
+        json5_error = e
+    if repaired is not None and repaired != text:
+        try:
+            return _counted(json5.loads(repaired), 'repair')
+        except ValueError:
+            pass
+    raise json5_error
+
+
+def _counted(parsed: Any, tier: str) -> Tuple[Any, str]:
+    tier_counts[tier] += 1
+    return parsed, tier
+
+
+def repair_json(text: str) -> Optional[str]:
+    """
+    흔한 LLM 출력 결함 복구 (문자열 안/밖을 구분하는 한 번의 순회)
+    - 닫는 괄호 앞의 trailing comma 제거
+    - 문자열 안의 이스케이프되지 않은 줄바꿈을 \\n으로 변경
+    - 최상위 배열이 중간에 잘린 경우 마지막으로 완성된 원소까지만 남기고 배열을 닫음
+
+    Returns:
+        복구된 문자열 (복구할 수 없으면 None)
+    """
+    out = []
+    stack = []
+    in_string = False
+    escape = False
+    pending_comma = None   # 출력에 아직 쓰지 않은 쉼표 (다음 토큰이 닫는 괄호면 버림)
+    last_safe = None       # 최상위 배열에서 마지막으로 완성된 원소 직후의 출력 길이
+
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            elif ch == '\n':
+                out.append('\\n')
+                continue
+            elif ch == '\r':
+                continue
+            out.append(ch)
+            continue
+
+        if ch.isspace():
+            if pending_comma is None:
+                out.append(ch)
+            continue
+        if ch == ',':
+            if pending_comma is not None:
+                continue  # 연속된 쉼표
+            pending_comma = ','
+            continue
+        if ch in '}]':
+            pending_comma = None  # trailing comma 제거
+            if not stack:
+                return None
+            stack.pop()
+            out.append(ch)
+            if len(stack) == 1 and stack[0] == '[':
+                last_safe = len(out)
+            continue
+
+        if pending_comma is not None:
+            out.append(pending_comma)
+            pending_comma = None
+        if ch in '{[':
+            stack.append(ch)
+        elif ch == '"':
+            in_string = True
+        out.append(ch)
+
+    if not stack and not in_string:
+        return "".join(out)
+    # 잘린 응답: 최상위 배열의 완성된 원소까지만 유지
+    if stack and stack[0] == '[' and last_safe is not None:
+        return "".join(out[:last_safe]) + "]"
+    return None
+
+
 def _extract_json_from_markdown(text: str) -> str:
     """마크다운 코드 블록에서 JSON 추출"""
     text = text.strip()
+    if "```" not in text:
+        return text
     
     # 여러 JSON 블록이 있는 경우 첫 번째만 사용
-    json_blocks = []
     if "```json" in text:
         # ```json ... ``` 블록 찾기
-        pattern = r'```json\s*(.*?)\s*```'
-        matches = re.findall(pattern, text, re.DOTALL)
-        json_blocks = matches
-    elif "```" in text:
+        json_blocks = _JSON_BLOCK_RE.findall(text)
+    else:
         # 일반 ``` ... ``` 블록 찾기
-        pattern = r'```[^\n]*\s*(.*?)\s*```'
-        matches = re.findall(pattern, text, re.DOTALL)
-        json_blocks = matches
+        json_blocks = _CODE_BLOCK_RE.findall(text)
     
     if json_blocks:
         return json_blocks[0].strip()
     
-    # 마크다운 블록이 없는 경우 (순수 JSON)
+    # 닫는 ``` 가 없는 경우 (응답이 잘렸거나 블록 표시만 있는 경우)
     if text.startswith("```json"):
         text = text[7:]
     elif text.startswith("```"):
@@ -75,9 +203,7 @@ def _extract_json_from_markdown(text: str) -> str:
 
 def _remove_control_characters(text: str) -> str:
     """제어 문자 제거 (블랙리스트 방식)"""
-    # 허용되는 제어 문자: \t (0x09), \n (0x0A), \r (0x0D)
-    # 나머지 제어 문자(0x00-0x08, 0x0B, 0x0C, 0x0E-0x1F, BOM) 제거
-    return re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\uFEFF]', '', text)
+    return _CONTROL_CHARS_RE.sub('', text)
 
 
 def _save_parse_error_log(original_text: str, cleaned_text: str, error: Exception, context: str):
@@ -0,0 +1,101 @@
+"""
+스트리밍 JSON 파서 - 모델 출력이 조각(chunk)으로 도착하는 동안 최상위 배열의 각 객체를 닫는 중괄호가 오는 즉시 반환
+응답이 중간에 잘려도 이미 완성된 객체는 유지
+"""
+from typing import Any, List
+
+from src.utils.json_parser import loads_tiered
+
+
+class JSONArrayStreamParser:
+    """
+    최상위 JSON 배열([ {...}, {...} ])을 조각 단위로 입력받아 완성된 원소부터 반환
+    - 배열 시작('[') 이전의 텍스트(예: ```json 코드 블록 표시)는 무시
+    - 배열 없이 객체 하나만 오는 응답({...})은 원소 하나짜리 배열처럼 처리
+    - 문자열 안의 괄호/따옴표는 이스케이프를 고려해 구분
+    - 원소 파싱은 단계별 파서(loads_tiered) 사용
+    사용 후 finished(배열이 정상적으로 닫혔는지)와 errors(파싱 실패 원소 수)로 잘림 여부 확인
+    """
+    def __init__(self):
+        self.finished = False
+        self.errors = 0
+        self.items_parsed = 0
+
+        self._text = ""        # 아직 처리가 끝나지 않은 텍스트 (완성된 원소 앞부분은 버림)
+        self._pos = 0          # _text 안에서 다음에 검사할 위치
+        self._started = False
+        self._container_depth = 1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """조각 추가 후 이번에 완성된 원소 리스트 반환"""
+        if self.finished or not chunk:
+            return []
+
+        self._text += chunk
+        text = self._text
+        items = []
+        i = self._pos
+        length = len(text)
+
+        while i < length and not self.finished:
+            ch = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif not self._started:
+                if ch == '[':
+                    self._started = True
+                    self._depth = 1
+                elif ch == '{':
+                    # 배열 없이 객체 하나만 오는 응답
+                    self._started = True
+                    self._container_depth = 0
+                    self._depth = 1
+                    self._item_start = i
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                if self._depth == self._container_depth and self._item_start is None:
+                    self._item_start = i
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == self._container_depth and self._item_start is not None:
+                    item = self._parse_item(text[self._item_start:i + 1])
+                    if item is not None:
+                        items.append(item)
+                    self._item_start = None
+                    # 완성된 원소까지는 더 이상 필요 없으므로 버림 (긴 응답에서 버퍼가 계속 커지지 않도록)
+                    text = text[i + 1:]
+                    length = len(text)
+                    i = -1
+                if self._depth <= 0:
+                    self.finished = True
+            i += 1
+
+        self._text = text
+        self._pos = i
+        return items
+
+    def _parse_item(self, item_text: str) -> Any:
+        try:
+            item, _ = loads_tiered(item_text)
+        except ValueError:
+            self.errors += 1
+            return None
+        self.items_parsed += 1
+        return item
+
+    @property
+    def complete(self) -> bool:
+        """배열이 정상적으로 닫혔고 모든 원소를 파싱했는지"""
+        return self.finished and self.errors == 0
@@ -0,0 +1,132 @@
+"""
+LLM 응답 캐시 - (모델 이름 + generation config + 프롬프트) 해시를 키로 SQLite에 저장
+크기 제한(LRU 방식 삭제) + TTL 지원, 재실행/디버깅 시 같은 요청은 API를 다시 호출하지 않음
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+def make_cache_key(model_name: str, generation_config: dict, prompt: str) -> str:
+    """내용 기반 캐시 키 (config는 키 순서와 무관하게 같은 값이면 같은 키)"""
+    payload = json.dumps({
+        'model': model_name,
+        'config': generation_config or {},
+        'prompt': hashlib.sha256(prompt.encode('utf-8')).hexdigest(),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """
+    응답 텍스트 캐시
+    - get(): TTL이 지난 항목은 삭제 후 None, 조회 시 last_access 갱신
+    - put(): 저장 후 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    """
+    def __init__(self, db_path: str, max_bytes: int = 200 * 1024 * 1024, ttl_seconds: float = 72 * 3600):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    cache_key TEXT PRIMARY KEY,
+                    model_name TEXT,
+                    context TEXT,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+            self.conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT response, created_at FROM responses WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if now - row[1] > self.ttl_seconds:
+                with self.conn:
+                    self.conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+                self.misses += 1
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE responses SET last_access = ? WHERE cache_key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str, model_name: str = "", context: str = ""):
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            with self.conn:
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO responses (cache_key, model_name, context, response, size, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (key, model_name, context, response, size, now, now))
+            self._evict(now)
+
+    def delete(self, key: str):
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+
+    def _evict(self, now: float):
+        """만료 항목 삭제 후, 크기 제한을 넘으면 last_access가 오래된 순서로 삭제 (락 보유 상태에서 호출)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            to_delete = []
+            for key, size in self.conn.execute("SELECT cache_key, size FROM responses ORDER BY last_access ASC"):
+                if total <= self.max_bytes:
+                    break
+                to_delete.append((key,))
+                total -= size
+            self.conn.executemany("DELETE FROM responses WHERE cache_key = ?", to_delete)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache(db_path: str, max_bytes: int, ttl_seconds: float) -> Optional[LLMCache]:
+    """같은 경로의 캐시는 프로세스 안에서 하나의 연결을 공유 (열기 실패 시 None -> 캐시 없이 진행)"""
+    with _shared_lock:
+        cache = _shared_caches.get(db_path)
+        if cache is None:
+            try:
+                cache = LLMCache(db_path, max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+            except Exception as e:
+                print(f"[WARNING] LLM cache unavailable ({db_path}): {e}")
+                return None
+            _shared_caches[db_path] = cache
+        return cache
@@ -0,0 +1,204 @@
+"""
+LLM 호출 공통 계층 - NewsAnalyst / NewsCurator / B2BInsightsAnalyzer가 함께 사용
+응답 캐시 조회 -> (속도 제한) -> 모델 호출 -> JSON 파싱 -> 파싱 성공 시에만 캐시 저장
+일시적 오류(429, 5xx, 타임아웃)와 파싱 실패는 재시도 정책에 따라 지수 백오프 후 재시도
+"""
+import time
+from typing import Any, Iterator, Optional
+from config import settings
+from src.utils.json_parser import parse_json
+from src.utils.json_stream import JSONArrayStreamParser
+from src.utils.llm_cache import LLMCache, get_shared_cache, make_cache_key
+from src.utils.rate_limiter import retry_after_seconds
+from src.utils.retry import RetryPolicy, classify_error
+from src.utils.summary_sanitizer import estimate_tokens
+
+
+class LLMResponseParseError(ValueError):
+    """모델 응답을 JSON으로 파싱하지 못한 경우"""
+
+
+def default_llm_cache() -> Optional[LLMCache]:
+    """settings 기준 공유 응답 캐시 (비활성화 시 None)"""
+    if not getattr(settings, 'LLM_CACHE_ENABLED', False):
+        return None
+    # 녹화/재생 중에는 모든 호출이 백엔드를 거쳐야 하므로 캐시 사용 안 함
+    if getattr(settings, 'LLM_BACKEND', 'gemini') != 'gemini':
+        return None
+    return get_shared_cache(
+        settings.LLM_CACHE_PATH,
+        max_bytes=settings.LLM_CACHE_MAX_MB * 1024 * 1024,
+        ttl_seconds=settings.LLM_CACHE_TTL_HOURS * 3600,
+    )
+
+
+class LLMClient:
+    def __init__(self, model, model_name: str, cache: Optional[LLMCache] = None, rate_limiter=None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        self.model = model
+        self.model_name = model_name
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        # None이면 재시도 없이 한 번만 호출
+        self.retry_policy = retry_policy
+        self.cache_hits = 0
+        self.model_calls = 0
+
+    def generate_json(self, prompt: str, generation_config: dict, context: str = "unknown",
+                      estimated_tokens: Optional[int] = None, retry_parse_errors: bool = True) -> Any:
+        """
+        프롬프트에 대한 JSON 응답을 파싱해서 반환 (일시적 오류는 재시도 정책에 따라 재시도)
+
+        Args:
+            prompt: 프롬프트
+            generation_config: 모델 generation config (캐시 키에 포함)
+            context: 로그/오류 파일용 컨텍스트 (예: "analyst_batch_1", "curator")
+            estimated_tokens: 속도 제한기에서 차감할 입력 + 출력 추정 토큰 수
+            retry_parse_errors: 파싱 실패 시 같은 프롬프트로 재요청할지 여부
+                (호출 측에서 더 작은 단위로 나눠 재요청하는 경우 False)
+
+        Raises:
+            LLMResponseParseError: 응답 JSON 파싱 실패 (이 경우 캐시에 저장하지 않음)
+            그 외 재시도 후에도 실패한 모델 호출 예외는 그대로 전달
+        """
+        attempt = 0
+        while True:
+            try:
+                result = self._generate_once(prompt, generation_config, context, estimated_tokens)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_success()
+                return result
+            except LLMResponseParseError as e:
+                if not retry_parse_errors:
+                    raise
+                self._wait_before_retry(e, attempt, context, kind='parse')
+            except Exception as e:
+                self._wait_before_retry(e, attempt, context)
+            attempt += 1
+
+    def stream_json_items(self, prompt: str, generation_config: dict, context: str = "unknown",
+                          estimated_tokens: Optional[int] = None) -> Iterator[Any]:
+        """
+        스트리밍 생성 - 응답 JSON 배열의 각 원소(객체)를 완성되는 즉시 반환
+        - 첫 원소가 나오기 전의 일시적 오류는 재시도 정책에 따라 재시도
+        - 원소가 나온 뒤 스트림이 끊기거나 응답이 잘리면 이미 완성된 원소만 유지 (캐시에 저장하지 않음)
+        - 모델이 스트리밍을 지원하지 않으면 전체 응답을 한 조각으로 처리
+
+        Raises:
+            LLMResponseParseError: 완성된 원소가 하나도 없고 응답도 올바른 JSON 배열이 아닌 경우
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key(self.model_name, generation_config, prompt)
+            cached_text = self.cache.get(cache_key)
+            if cached_text is not None:
+                parser = JSONArrayStreamParser()
+                items = parser.feed(cached_text)
+                if parser.complete:
+                    self.cache_hits += 1
+                    yield from items
+                    return
+                self.cache.delete(cache_key)
+
+        attempt = 0
+        while True:
+            parser = JSONArrayStreamParser()
+            chunks = []
+            emitted = 0
+            try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(estimated_tokens or estimate_tokens(prompt))
+                self.model_calls += 1
+                if hasattr(self.model, 'generate_content_stream'):
+                    stream = self.model.generate_content_stream(prompt, generation_config=generation_config)
+                else:
+                    stream = [self.model.generate_content(prompt, generation_config=generation_config).text]
+
+                for chunk in stream:
+                    chunks.append(chunk)
+                    for item in parser.feed(chunk):
+                        emitted += 1
+                        yield item
+                break
+            except Exception as e:
+                if emitted:
+                    # 이미 반환한 원소는 유지하고 나머지는 호출 측에서 다시 요청
+                    print(f"[WARNING] LLM stream interrupted ({context}) after {emitted} item(s): {e}")
+                    return
+                self._wait_before_retry(e, attempt, context)
+            attempt += 1
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_success()
+
+        if not parser.complete:
+            if emitted == 0:
+                raise LLMResponseParseError(f"No complete JSON item in streamed response ({context})")
+            print(f"[WARNING] Incomplete streamed JSON ({context}): kept {emitted} complete item(s)")
+            return
+
+        if self.cache is not None:
+            try:
+                self.cache.put(cache_key, "".join(chunks), model_name=self.model_name, context=context)
+            except Exception as e:
+                print(f"[WARNING] Failed to store LLM response in cache: {e}")
+
+    def _wait_before_retry(self, error: Exception, attempt: int, context: str, kind: Optional[str] = None):
+        """재시도 가능하면 백오프만큼 대기, 아니면 error를 다시 발생"""
+        retry_after = None
+        if kind is None:
+            kind, retry_after = classify_error(error), retry_after_seconds(error)
+            if kind == 'rate_limit' and self.rate_limiter is not None:
+                # 429는 속도 제한기가 전체 요청을 일시정지 + 감속 (대기는 acquire에서)
+                self.rate_limiter.on_rate_limited(retry_after)
+
+        delay = self.retry_policy.next_delay(attempt, kind, retry_after) if self.retry_policy else None
+        if delay is None:
+            raise error
+        print(f"[WARNING] LLM call failed ({context}, {kind}: {error}). Retry {attempt + 1} in {delay:.1f}s...")
+        if kind != 'rate_limit' or self.rate_limiter is None:
+            time.sleep(delay)
+
+    def start_stage(self):
+        """단계 시작 - 재시도 마감 시간을 지금부터 다시 계산"""
+        if self.retry_policy is not None:
+            self.retry_policy.start()
+
+    def _generate_once(self, prompt: str, generation_config: dict, context: str,
+                       estimated_tokens: Optional[int]) -> Any:
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key(self.model_name, generation_config, prompt)
+            cached_text = self.cache.get(cache_key)
+            if cached_text is not None:
+                try:
+                    parsed = parse_json(cached_text, context=f"{context}_cached")
+                    self.cache_hits += 1
+                    return parsed
+                except Exception:
+                    self.cache.delete(cache_key)
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(estimated_tokens or estimate_tokens(prompt))
+
+        self.model_calls += 1
+        response = self.model.generate_content(prompt, generation_config=generation_config)
+        text = response.text
+
+        try:
+            parsed = parse_json(text, context=context)
+        except Exception as e:
+            raise LLMResponseParseError(str(e)) from e
+
+        if self.cache is not None:
+            try:
+                self.cache.put(cache_key, text, model_name=self.model_name, context=context)
+            except Exception as e:
+                print(f"[WARNING] Failed to store LLM response in cache: {e}")
+        return parsed
+
+    def stats(self) -> str:
+        text = f"{self.model_calls} model calls, {self.cache_hits} cache hits"
+        if self.retry_policy is not None:
+            text += f", {self.retry_policy.stats()}"
+        return text
@@ -0,0 +1,280 @@
+"""
+LLM 모델 백엔드 - NewsAnalyst / NewsCurator / B2BInsightsAnalyzer가 공통으로 사용하는 모델 생성 계층
+
+- gemini: google.generativeai 모델 (기본)
+- record: gemini 호출을 그대로 하면서 프롬프트/응답/지연 시간을 녹화 파일(JSONL)에 기록
+- replay: 녹화 파일의 응답을 녹화된 지연 시간 분포대로 재생 (API 키/네트워크 불필요, 오프라인 성능 측정용)
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import Iterator, Optional
+
+from config import settings
+from src.utils.llm_cache import make_cache_key
+
+BACKENDS = ('gemini', 'record', 'replay')
+LLM_CALLS_FILE = "llm_calls.jsonl"
+NEWS_FILE = "news.json"
+REPLAY_STREAM_CHUNKS = 20  # 스트리밍 재생 시 응답을 나누는 조각 수
+
+
+class ModelResponse:
+    """generate_content() 반환값 (google.generativeai 응답처럼 .text 제공)"""
+    def __init__(self, text: str):
+        self.text = text
+
+
+class ReplayMissError(LookupError):
+    """녹화 파일에 없는 프롬프트를 재생하려는 경우 (재시도해도 결과가 같으므로 영구 오류)"""
+
+
+class ModelBackend(ABC):
+    """모델 백엔드 인터페이스 (generate_content를 구현하지 않은 백엔드는 생성 시점에 TypeError)"""
+    name = "base"
+
+    @abstractmethod
+    def generate_content(self, prompt: str, generation_config: Optional[dict] = None) -> ModelResponse:
+        """프롬프트 하나에 대한 전체 응답"""
+
+    def generate_content_stream(self, prompt: str, generation_config: Optional[dict] = None) -> Iterator[str]:
+        """응답 텍스트를 조각 단위로 반환 (기본 구현: 전체 응답을 한 조각으로)"""
+        yield self.generate_content(prompt, generation_config=generation_config).text
+
+    def stats(self) -> str:
+        return self.name
+
+
+class GeminiBackend(ModelBackend):
+    name = "gemini"
+
+    def __init__(self, model_name: str, api_key: Optional[str] = None):
+        import google.generativeai as genai
+        self.model_name = model_name
+        if api_key:
+            genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model_name)
+
+    def generate_content(self, prompt, generation_config=None):
+        response = self._model.generate_content(prompt, generation_config=generation_config)
+        return ModelResponse(response.text)
+
+    def generate_content_stream(self, prompt, generation_config=None):
+        response = self._model.generate_content(prompt, generation_config=generation_config, stream=True)
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue  # 텍스트가 없는 조각 (종료 사유만 있는 마지막 조각 등)
+            if text:
+                yield text
+
+
+class RecordingBackend(ModelBackend):
+    """내부 백엔드 호출 결과를 녹화 (성공한 호출만, 한 줄에 JSON 하나씩 추가)"""
+    name = "record"
+    _write_lock = threading.Lock()  # 세 단계의 백엔드가 같은 파일에 기록
+
+    def __init__(self, inner: ModelBackend, model_name: str, path: str):
+        self.inner = inner
+        self.model_name = model_name
+        self.path = path
+        self.recorded = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def generate_content(self, prompt, generation_config=None):
+        start = time.perf_counter()
+        response = self.inner.generate_content(prompt, generation_config=generation_config)
+        self._record(prompt, generation_config, response.text, time.perf_counter() - start)
+        return ModelResponse(response.text)
+
+    def generate_content_stream(self, prompt, generation_config=None):
+        # 끝까지 받은 응답만 녹화 (중간에 끊긴 스트림은 재생해도 같은 결과가 나오지 않음)
+        start = time.perf_counter()
+        chunks = []
+        for chunk in self.inner.generate_content_stream(prompt, generation_config=generation_config):
+            chunks.append(chunk)
+            yield chunk
+        self._record(prompt, generation_config, "".join(chunks), time.perf_counter() - start, chunks=len(chunks))
+
+    def _record(self, prompt, generation_config, text, latency, chunks=1):
+        record = {
+            'key': make_cache_key(self.model_name, generation_config, prompt),
+            'model': self.model_name,
+            'prompt_sha256': hashlib.sha256(prompt.encode('utf-8')).hexdigest(),
+            'prompt_chars': len(prompt),
+            'response': text,
+            'latency': round(latency, 4),
+            'chunks': chunks,
+            'recorded_at': time.time(),
+        }
+        line = json.dumps(record, ensure_ascii=False)
+        with self._write_lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+            self.recorded += 1
+
+    def stats(self):
+        return f"record: {self.recorded} calls recorded to {self.path}"
+
+
+class ReplayBackend(ModelBackend):
+    """
+    녹화된 응답 재생
+    - 같은 프롬프트가 여러 번 녹화되어 있으면 녹화 순서대로 돌려가며 재생
+    - latency_mode:
+        'recorded': 해당 응답이 녹화될 때의 지연 시간
+        'sampled': 전체 녹화 지연 시간 분포에서 무작위 추출 (seed 고정 시 재현 가능)
+        'none': 지연 없이 즉시 반환
+      speed로 나눈 시간만큼 대기 (speed=2.0 이면 2배 빠르게)
+    """
+    name = "replay"
+
+    def __init__(self, path: str, model_name: str, latency_mode: str = 'recorded',
+                 speed: float = 1.0, seed: Optional[int] = 42):
+        if latency_mode not in ('recorded', 'sampled', 'none'):
+            raise ValueError(f"Unknown replay latency mode: {latency_mode}")
+        self.path = path
+        self.model_name = model_name
+        self.latency_mode = latency_mode
+        self.speed = speed if speed > 0 else 1.0
+        self.hits = 0
+        self.misses = 0
+        self.total_latency = 0.0
+
+        self._records = defaultdict(deque)
+        self._latencies = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                self._records[record['key']].append((record['response'], record.get('latency', 0.0)))
+                self._latencies.append(record.get('latency', 0.0))
+
+    def generate_content(self, prompt, generation_config=None):
+        text, latency = self._next_response(prompt, generation_config)
+        if latency > 0:
+            time.sleep(latency)
+        return ModelResponse(text)
+
+    def generate_content_stream(self, prompt, generation_config=None):
+        # 지연 시간을 조각 수만큼 나눠 조각마다 대기 (응답이 조금씩 도착하는 것처럼 재생)
+        text, latency = self._next_response(prompt, generation_config)
+        size = max(1, -(-len(text) // REPLAY_STREAM_CHUNKS))
+        pieces = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        for piece in pieces:
+            if latency > 0:
+                time.sleep(latency / len(pieces))
+            yield piece
+
+    def _next_response(self, prompt, generation_config):
+        key = make_cache_key(self.model_name, generation_config, prompt)
+        with self._lock:
+            candidates = self._records.get(key)
+            if not candidates:
+                self.misses += 1
+                raise ReplayMissError(f"No recorded response for prompt {key[:12]} ({len(prompt)} chars)")
+            text, latency = candidates[0]
+            candidates.rotate(-1)
+            if self.latency_mode == 'sampled':
+                latency = self._rng.choice(self._latencies)
+            elif self.latency_mode == 'none':
+                latency = 0.0
+            latency /= self.speed
+            self.hits += 1
+            self.total_latency += latency
+        return text, latency
+
+    def stats(self):
+        return (f"replay: {self.hits} hits, {self.misses} misses, "
+                f"{self.total_latency:.1f}s simulated latency ({self.latency_mode}, x{self.speed:g})")
+
+
+def current_backend() -> str:
+    backend = getattr(settings, 'LLM_BACKEND', 'gemini')
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM_BACKEND: {backend} (expected one of {', '.join(BACKENDS)})")
+    return backend
+
+
+def recording_path(filename: str) -> str:
+    return os.path.join(settings.LLM_RECORDING_DIR, filename)
+
+
+_shared_backends = {}
+_shared_lock = threading.Lock()
+
+
+def create_model_backend(model_name: str) -> Optional[ModelBackend]:
+    """
+    settings.LLM_BACKEND 기준 모델 백엔드 생성
+    record/replay는 세 단계가 같은 녹화 파일을 공유하도록 프로세스 안에서 하나만 생성
+    (gemini/record 모드에서 API 키가 없으면 None - 호출 측에서 기존과 같이 처리)
+    """
+    backend = current_backend()
+    if backend == 'gemini':
+        if not settings.GEMINI_API_KEY:
+            return None
+        return GeminiBackend(model_name, api_key=settings.GEMINI_API_KEY)
+
+    path = recording_path(LLM_CALLS_FILE)
+    with _shared_lock:
+        shared = _shared_backends.get((backend, path))
+        if shared is not None:
+            return shared
+
+        if backend == 'replay':
+            shared = ReplayBackend(
+                path, model_name,
+                latency_mode=getattr(settings, 'LLM_REPLAY_LATENCY', 'recorded'),
+                speed=getattr(settings, 'LLM_REPLAY_SPEED', 1.0),
+            )
+        else:
+            if not settings.GEMINI_API_KEY:
+                return None
+            shared = RecordingBackend(GeminiBackend(model_name, api_key=settings.GEMINI_API_KEY), model_name, path)
+        _shared_backends[(backend, path)] = shared
+        return shared
+
+
+def backend_stats() -> str:
+    """record/replay 백엔드 통계 (gemini 모드면 빈 문자열)"""
+    with _shared_lock:
+        return "; ".join(backend.stats() for backend in _shared_backends.values())
+
+
+def start_recording(news_list) -> str:
+    """
+    녹화 시작 - 이전 녹화를 지우고 수집된 뉴스 목록을 저장 (재생 시 수집 단계 대신 사용)
+
+    Returns:
+        녹화 디렉토리 경로
+    """
+    os.makedirs(settings.LLM_RECORDING_DIR, exist_ok=True)
+    calls_path = recording_path(LLM_CALLS_FILE)
+    if os.path.exists(calls_path):
+        os.remove(calls_path)
+    with open(recording_path(NEWS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(news_list, f, ensure_ascii=False)
+    return settings.LLM_RECORDING_DIR
+
+
+def load_recorded_news() -> list:
+    """녹화된 수집 결과 로드 (replay 모드에서 네트워크 수집 대신 사용)"""
+    with open(recording_path(NEWS_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
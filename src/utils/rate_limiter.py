@@ -0,0 +1,128 @@
+"""
+LLM 요청 속도 제한 유틸리티 - 분당 요청 수(RPM) + 분당 토큰 수(TPM) 토큰 버킷, 429 응답 시 자동 감속
+"""
+import re
+import threading
+import time
+from typing import Optional
+
+# 메시지로 판별할 때는 요청 한도 초과를 뜻하는 표현만 인정 (키/글자 수에 섞인 '429', 'quota project' 등 오탐 방지)
+_RATE_LIMIT_MESSAGE_RE = re.compile(r'\b429\b|RESOURCE_EXHAUSTED|quota exceeded', re.IGNORECASE)
+# 서버가 알려준 재시도 대기 시간 - gRPC 'retry_delay { seconds: N }' (여러 줄 포함) / 헤더 'Retry-After: N' / 문장 'retry in Ns'
+_RETRY_AFTER_RE = re.compile(
+    r'retry[ _-]?delay\s*\{[^}]*?seconds:\s*(\d+(?:\.\d+)?)'
+    r'|retry-after:\s*(\d+(?:\.\d+)?)'
+    r'|retry(?:[ _-]?after|[ _-]?delay)?\D{0,20}?(\d+(?:\.\d+)?)\s*s',
+    re.IGNORECASE,
+)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """429 / ResourceExhausted 계열 오류인지 확인 (google.api_core 예외를 직접 import하지 않고 판별)"""
+    name = type(error).__name__
+    if name in ('ResourceExhausted', 'TooManyRequests'):
+        return True
+    if getattr(error, 'code', None) == 429:
+        return True
+    return bool(_RATE_LIMIT_MESSAGE_RE.search(str(error)))
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """오류 메시지에 포함된 재시도 대기 시간(예: 'retry in 12s', 'retry_delay { seconds: 12 }', 'Retry-After: 12') 추출"""
+    match = _RETRY_AFTER_RE.search(str(error))
+    if match is None:
+        return None
+    return float(next(value for value in match.groups() if value is not None))
+
+
+class TokenBucket:
+    """분당 rate_per_minute개씩 채워지는 버킷 (최대 capacity개까지 저장)"""
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_minute / 60.0)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount개를 꺼낼 수 있을 때까지 남은 시간 (초), refill 이후 호출"""
+        amount = min(amount, self.capacity)  # 버킷보다 큰 요청은 가득 찼을 때 허용 (교착 방지)
+        if self.tokens >= amount:
+            return 0.0
+        if self.rate_per_minute <= 0:
+            return float('inf')
+        return (amount - self.tokens) * 60.0 / self.rate_per_minute
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    RPM / TPM 두 버킷을 함께 관리하는 스레드 안전 속도 제한기
+    - acquire(tokens): 요청 1개 + 추정 토큰 수만큼 여유가 생길 때까지 대기
+    - on_rate_limited(): 429 발생 시 일정 시간 전체 일시정지 + 속도를 절반으로 감소
+    - on_success(): 성공이 이어지면 원래 속도로 조금씩 회복
+    """
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float,
+                 min_scale: float = 0.1, recovery_step: float = 0.05, default_pause: float = 10.0):
+        self.base_rpm = requests_per_minute
+        self.base_tpm = tokens_per_minute
+        self.min_scale = min_scale
+        self.recovery_step = recovery_step
+        self.default_pause = default_pause
+
+        self.scale = 1.0
+        self.paused_until = 0.0
+        self.rate_limited_count = 0
+        self.total_wait = 0.0
+
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._requests.refill(now)
+                self._tokens.refill(now)
+                wait = max(
+                    self.paused_until - now,
+                    self._requests.wait_time(1),
+                    self._tokens.wait_time(tokens),
+                )
+                if wait <= 0:
+                    self._requests.consume(1)
+                    self._tokens.consume(tokens)
+                    return
+            # 락 밖에서 대기 (짧게 끊어서 다른 스레드의 감속/회복을 반영)
+            sleep_for = min(wait, 1.0)
+            self.total_wait += sleep_for
+            time.sleep(sleep_for)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self.rate_limited_count += 1
+            self._set_scale(max(self.min_scale, self.scale * 0.5))
+            pause = retry_after if retry_after is not None else self.default_pause
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+        print(f"[WARNING] Rate limited (429). Pausing {pause:.0f}s, rate scaled to {self.scale:.0%}")
+
+    def on_success(self):
+        if self.scale >= 1.0:
+            return
+        with self._lock:
+            self._set_scale(min(1.0, self.scale + self.recovery_step))
+
+    def _set_scale(self, scale: float):
+        now = time.monotonic()
+        self._requests.refill(now)
+        self._tokens.refill(now)
+        self.scale = scale
+        self._requests.rate_per_minute = self.base_rpm * scale
+        self._tokens.rate_per_minute = self.base_tpm * scale
@@ -0,0 +1,133 @@
+"""
+기사 렌더링 결과 캐시 - (템플릿 이름 + 템플릿 버전 + 기사 내용) 해시를 키로 변환된 마크업 저장
+같은 기사를 다시 그릴 때 (--resume, 여러 번 발송, 다음 날 리포트에 다시 나온 기사) Markdown 변환/포맷을 반복하지 않음
+프로세스 안 메모리 + SQLite (실행 간 유지) 2단계, 새 항목/조회 시각은 flush()에서 한 번에 기록
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from config import settings
+
+
+def make_render_key(template: str, version: int, fields: Dict) -> str:
+    """템플릿 이름/버전 + 렌더링에 쓰는 기사 필드 기준 키 (필드 값이 하나라도 바뀌면 다른 키)"""
+    payload = json.dumps({'template': template, 'version': version, 'fields': fields},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    렌더링 결과 (JSON으로 저장 가능한 값) 캐시
+    - get_or_render(): 캐시에 없으면 render()를 호출해 저장
+    - retention_days 동안 사용되지 않은 항목은 열 때 삭제
+    """
+    def __init__(self, db_path: str, retention_days: float = 7):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.hits = 0
+        self.misses = 0
+        self._memory: Dict[str, object] = {}
+        self._pending: Dict[str, tuple] = {}  # 아직 DB에 쓰지 않은 새 항목 (키 -> (템플릿, JSON))
+        self._touched = set()                  # 조회 시각을 갱신할 기존 항목
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS fragments (
+                    render_key TEXT PRIMARY KEY,
+                    template TEXT,
+                    value TEXT NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_fragments_last_access ON fragments(last_access)")
+            with self.conn:
+                self.conn.execute("DELETE FROM fragments WHERE last_access < ?",
+                                  (time.time() - retention_days * 86400,))
+
+    def get_or_render(self, template: str, version: int, fields: Dict, render: Callable[[], object]):
+        """
+        Args:
+            template: 템플릿 이름 (예: 'pdf_article')
+            version: 템플릿 버전 (출력 형식을 바꾸면 올려서 이전 결과 무효화)
+            fields: 렌더링 결과를 결정하는 입력 값 전체
+            render: 캐시에 없을 때 호출 (JSON으로 저장 가능한 값 반환)
+        """
+        key = make_render_key(template, version, fields)
+        with self._lock:
+            if key in self._memory:
+                self.hits += 1
+                return self._memory[key]
+            row = self.conn.execute("SELECT value FROM fragments WHERE render_key = ?", (key,)).fetchone()
+            if row is not None:
+                value = json.loads(row[0])
+                self._memory[key] = value
+                self._touched.add(key)
+                self.hits += 1
+                return value
+
+        value = render()
+        with self._lock:
+            self.misses += 1
+            self._memory[key] = value
+            self._pending[key] = (template, json.dumps(value, ensure_ascii=False))
+        return value
+
+    def flush(self):
+        """새 항목 저장 + 사용한 항목의 조회 시각 갱신 (한 트랜잭션)"""
+        now = time.time()
+        with self._lock:
+            if not self._pending and not self._touched:
+                return
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO fragments (render_key, template, value, last_access) VALUES (?, ?, ?, ?)",
+                    [(key, template, value, now) for key, (template, value) in self._pending.items()])
+                self.conn.executemany("UPDATE fragments SET last_access = ? WHERE render_key = ?",
+                                      [(now, key) for key in self._touched])
+            self._pending.clear()
+            self._touched.clear()
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        return f"{self.hits}/{total} hits" if total else "no lookups"
+
+    def close(self):
+        if self.conn is not None:
+            self.flush()
+            self.conn.close()
+            self.conn = None
+
+
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def default_render_cache() -> Optional[RenderCache]:
+    """settings 기준 공유 렌더 캐시 (PDF/HTML 빌더가 같은 연결 사용, 비활성화 또는 열기 실패 시 None)"""
+    if not getattr(settings, 'RENDER_CACHE_ENABLED', False):
+        return None
+    db_path = settings.RENDER_CACHE_PATH
+    with _shared_lock:
+        cache = _shared_caches.get(db_path)
+        if cache is None:
+            try:
+                cache = RenderCache(db_path, retention_days=getattr(settings, 'RENDER_CACHE_RETENTION_DAYS', 7))
+            except Exception as e:
+                print(f"[WARNING] Render cache unavailable ({db_path}): {e}")
+                return None
+            _shared_caches[db_path] = cache
+        return cache
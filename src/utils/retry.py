@@ -0,0 +1,133 @@
+"""
+LLM 호출 재시도 정책 - 일시적/영구적 오류 분류 + 지수 백오프(jitter) + 단계별 마감 시간 + 재시도 통계
+"""
+import random
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from config import settings
+from src.utils.rate_limiter import is_rate_limit_error
+
+# 재시도해도 결과가 바뀌지 않는 오류 (잘못된 요청, 인증/권한, 모델 없음, 안전 필터 차단 등)
+PERMANENT_ERROR_NAMES = {
+    'InvalidArgument', 'BadRequest', 'PermissionDenied', 'Unauthenticated', 'Unauthorized',
+    'NotFound', 'FailedPrecondition', 'BlockedPromptException', 'StopCandidateException',
+    'ReplayMissError',  # 녹화 재생에 없는 프롬프트 (model_backend)
+}
+PERMANENT_STATUS_CODES = {400, 401, 403, 404}
+
+# 네트워크/서버 측 일시적 오류 (잠시 후 같은 요청이 성공할 수 있음)
+TRANSIENT_ERROR_NAMES = {
+    'ServiceUnavailable', 'InternalServerError', 'DeadlineExceeded', 'GatewayTimeout', 'BadGateway',
+    'Aborted', 'Unknown', 'RetryError', 'Timeout', 'ReadTimeout', 'ConnectTimeout', 'ConnectionError',
+    'ChunkedEncodingError', 'RemoteDisconnected', 'TimeoutError', 'ConnectionResetError',
+}
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def classify_error(error: Exception) -> str:
+    """
+    오류 분류 (google.api_core / requests 예외를 직접 import하지 않고 이름과 상태 코드로 판별)
+
+    Returns:
+        'rate_limit' | 'transient' | 'permanent'
+    """
+    # 영구 오류를 먼저 판별 (메시지에 '429' 등이 섞여 있어도 재시도/감속하지 않음)
+    name = type(error).__name__
+    code = getattr(error, 'code', None)
+    if name in PERMANENT_ERROR_NAMES or code in PERMANENT_STATUS_CODES:
+        return 'permanent'
+    if is_rate_limit_error(error):
+        return 'rate_limit'
+    if name in TRANSIENT_ERROR_NAMES or code in TRANSIENT_STATUS_CODES:
+        return 'transient'
+    message = str(error)
+    if any(f" {status}" in f" {message}" for status in ('500', '502', '503', '504')):
+        return 'transient'
+    return 'permanent'
+
+
+class RetryPolicy:
+    """
+    재시도 정책 (스레드 안전)
+    - 대기 시간: full jitter 지수 백오프 = uniform(0, min(max_delay, base_delay * 2^attempt))
+      서버가 알려준 대기 시간(retry_after)이 있으면 그보다 짧게 기다리지 않음
+    - 마감 시간: 단계 시작(start()) 또는 첫 호출부터 stage_timeout초가 지나면 더 이상 재시도하지 않음
+    - 통계: 오류 종류별 재시도 횟수, 포기 횟수
+    """
+    def __init__(self, max_retries: int = 3, base_delay: float = 2.0, max_delay: float = 60.0,
+                 stage_timeout: Optional[float] = None, seed: Optional[int] = None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stage_timeout = stage_timeout
+
+        self.retries = Counter()
+        self.gave_up = 0
+        self.total_backoff = 0.0
+
+        self._started_at = None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def start(self):
+        """단계 시작 시각을 지금으로 설정 (마감 시간 기준)"""
+        with self._lock:
+            self._started_at = time.monotonic()
+
+    def remaining(self) -> float:
+        """마감까지 남은 시간 (초), 마감이 없으면 inf"""
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+            if self.stage_timeout is None:
+                return float('inf')
+            return self.stage_timeout - (time.monotonic() - self._started_at)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        with self._lock:
+            delay = self._rng.uniform(0, cap)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def next_delay(self, attempt: int, kind: str, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        attempt번째 실패(0부터) 후 재시도 전 대기 시간, 재시도하지 않아야 하면 None
+        """
+        if kind == 'permanent' or attempt >= self.max_retries:
+            return self._give_up()
+        delay = self.backoff(attempt, retry_after)
+        if delay >= self.remaining():
+            return self._give_up()
+        with self._lock:
+            self.retries[kind] += 1
+            self.total_backoff += delay
+        return delay
+
+    def _give_up(self) -> None:
+        with self._lock:
+            self.gave_up += 1
+        return None
+
+    @property
+    def retry_count(self) -> int:
+        return sum(self.retries.values())
+
+    def stats(self) -> str:
+        detail = ", ".join(f"{kind} {count}" for kind, count in sorted(self.retries.items())) or "none"
+        return f"{self.retry_count} retries ({detail}), {self.gave_up} gave up, backoff {self.total_backoff:.1f}s"
+
+
+def default_retry_policy(stage: str) -> RetryPolicy:
+    """settings 기준 단계별 재시도 정책 (stage: 'analyst' | 'curator' | 'b2b_insights' | 'weekly_digest')"""
+    deadlines = getattr(settings, 'LLM_STAGE_DEADLINES', {})
+    return RetryPolicy(
+        max_retries=getattr(settings, 'LLM_MAX_RETRIES', 3),
+        base_delay=getattr(settings, 'LLM_RETRY_BASE_DELAY', 2.0),
+        max_delay=getattr(settings, 'LLM_RETRY_MAX_DELAY', 60.0),
+        stage_timeout=deadlines.get(stage),
+    )
@@ -0,0 +1,272 @@
+"""
+파이프라인 단계 DAG 스케줄러 - 단계별 입력/출력을 선언하고, 입력이 준비된 단계부터 병렬 실행 + 임계 경로(critical path) 보고
+체크포인트 저장소가 있으면 단계 출력을 저장하고, resume 시 저장된 단계는 건너뜀
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class PipelineStop(Exception):
+    """단계에서 파이프라인을 정상 종료할 때 사용 (예: 수집된 뉴스 없음) - 실행 중인 단계만 마치고 새 단계는 시작하지 않음"""
+
+
+class Stage:
+    """
+    파이프라인 단계 하나
+
+    Args:
+        name: 단계 이름 (로그/임계 경로 표시용)
+        func: 입력 이름을 키워드 인자로 받아 출력 값을 반환하는 함수
+              (출력이 하나면 값 그대로, 여러 개면 outputs 순서의 tuple, 출력이 없으면 반환값 무시)
+        inputs: 필요한 값 이름 (다른 단계의 출력 또는 초기 값)
+        outputs: 이 단계가 만드는 값 이름
+        checkpoint: 출력을 체크포인트로 저장할지 (JSON으로 저장 가능한 출력만)
+                    함수를 주면 resume 시 저장된 출력이 아직 유효한지 확인하는 데 사용 (예: 파일 존재)
+    """
+    def __init__(self, name: str, func: Callable, inputs: Iterable[str] = (), outputs: Iterable[str] = (),
+                 checkpoint=False):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.checkpoint = checkpoint
+
+
+class StageGraph:
+    """
+    단계 DAG 실행기
+    - 등록 시점에 출력 이름 중복 검사, 실행 전에 누락된 입력/순환 의존 검사
+    - 의존 단계가 모두 끝난 단계를 스레드 풀에 제출 (LLM 호출/네트워크 대기 중에 다른 단계 진행)
+    - 단계에서 예외가 나면 새 단계 제출을 멈추고 실행 중인 단계를 기다린 뒤 같은 예외를 다시 발생
+    - checkpoints (CheckpointStore)가 있으면 checkpoint 단계가 끝날 때마다 출력 저장
+    """
+    def __init__(self, max_workers: int = 4, checkpoints=None):
+        self.max_workers = max_workers
+        self.checkpoints = checkpoints
+        self.stages: Dict[str, Stage] = {}
+        self._producers: Dict[str, str] = {}  # 출력 이름 -> 만드는 단계
+        self.timings: Dict[str, tuple] = {}    # 단계 이름 -> (시작, 종료) (실행 시작 기준 초)
+        self.restored: List[str] = []          # resume 시 체크포인트에서 복원한 단계
+        self.stopped = False
+        self._lock = threading.Lock()
+
+    def add(self, name: str, func: Callable, inputs: Iterable[str] = (), outputs: Iterable[str] = (),
+            checkpoint=False) -> Stage:
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage name: {name}")
+        stage = Stage(name, func, inputs, outputs, checkpoint)
+        for output in stage.outputs:
+            if output in self._producers:
+                raise ValueError(f"Output '{output}' is produced by both '{self._producers[output]}' and '{name}'")
+            self._producers[output] = name
+        self.stages[name] = stage
+        return stage
+
+    def dependencies(self, stage: Stage) -> List[str]:
+        """입력을 만드는 선행 단계 이름 (초기 값으로 주어지는 입력은 제외)"""
+        return sorted({self._producers[name] for name in stage.inputs if name in self._producers})
+
+    def run(self, initial: Optional[Dict] = None, resume: bool = False) -> Dict:
+        """
+        DAG 실행
+
+        Args:
+            initial: 단계 출력이 아닌 초기 입력 값 (예: lookback_hours)
+            resume: True면 유효한 체크포인트가 있는 단계는 출력을 복원하고 건너뜀
+                    (False면 이전 체크포인트를 지우고 처음부터 실행)
+
+        Returns:
+            모든 값 (초기 값 + 실행/복원된 단계들의 출력)
+        """
+        values = dict(initial or {})
+        self._validate(values)
+        deps = {name: set(self.dependencies(stage)) for name, stage in self.stages.items()}
+        self.timings = {}
+        self.stopped = False
+
+        restored = {}
+        if self.checkpoints is not None:
+            if resume:
+                restored = self._load_checkpoints(deps)
+            else:
+                self.checkpoints.clear()
+        self.restored = [name for name in self._topological_order() if name in restored]
+        for outputs in restored.values():
+            values.update(outputs)
+        required = self._required_stages(deps, restored)
+        if self.restored:
+            skipped = [name for name in self.stages if name not in restored and name not in required]
+            print(f"[INFO] Resuming from checkpoints: restored {self.restored}"
+                  + (f", not needed {skipped}" if skipped else "")
+                  + f", running {[name for name in self.stages if name in required]}")
+
+        pending = {name: stage for name, stage in self.stages.items() if name in required}
+        done = set(restored)
+        running = {}
+        error = None
+        origin = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as executor:
+            while pending or running:
+                if error is None and not self.stopped:
+                    # 등록 순서대로, 의존 단계가 모두 끝난 단계 제출
+                    for name in [name for name in pending if deps[name] <= done]:
+                        stage = pending.pop(name)
+                        kwargs = {key: values[key] for key in stage.inputs}
+                        running[executor.submit(self._run_stage, stage, kwargs, origin)] = stage
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    try:
+                        outputs = future.result()
+                        values.update(outputs)
+                        done.add(stage.name)
+                        self._save_checkpoint(stage, outputs)
+                    except PipelineStop as e:
+                        print(f"[INFO] Pipeline stopped at '{stage.name}'" + (f": {e}" if str(e) else ""))
+                        self.stopped = True
+                    except BaseException as e:  # sys.exit()의 SystemExit도 실행 중인 단계를 기다린 뒤 전달
+                        if error is None:
+                            error = e
+
+        if error is not None:
+            raise error
+        return values
+
+    def _run_stage(self, stage: Stage, kwargs: Dict, origin: float) -> Dict:
+        start = time.perf_counter() - origin
+        try:
+            result = stage.func(**kwargs)
+        finally:
+            with self._lock:
+                self.timings[stage.name] = (start, time.perf_counter() - origin)
+
+        if len(stage.outputs) == 0:
+            return {}
+        if len(stage.outputs) == 1:
+            return {stage.outputs[0]: result}
+        if not isinstance(result, tuple) or len(result) != len(stage.outputs):
+            raise ValueError(f"Stage '{stage.name}' must return {len(stage.outputs)} values {stage.outputs}")
+        return dict(zip(stage.outputs, result))
+
+    def _load_checkpoints(self, deps: Dict[str, set]) -> Dict[str, Dict]:
+        """
+        복원할 수 있는 단계의 저장된 출력
+        - 체크포인트 단계: 저장된 출력이 있고, 선행 체크포인트 단계도 모두 복원된 경우만 복원
+          (앞 단계를 다시 실행하면 뒤 단계도 다시 실행 - 재실행 결과와 저장된 결과가 섞이지 않도록)
+        - 체크포인트가 없는 단계(폰트 준비 등)는 선행 단계가 모두 복원되었으면 결과에 영향 없음으로 취급
+        - 출력이 없는 단계(발송 등 외부 효과)는 완료 기록이 있으면 선행 단계와 무관하게 완료로 취급 (중복 발송 방지)
+        """
+        restored = {}
+        clean = {}  # 단계 -> 이 단계까지의 체크포인트 단계가 모두 복원되었는지
+        for name in self._topological_order():
+            stage = self.stages[name]
+            upstream_clean = all(clean[dep] for dep in deps[name])
+            if not stage.checkpoint:
+                clean[name] = upstream_clean
+                continue
+
+            clean[name] = False
+            if not upstream_clean and stage.outputs:
+                continue
+            outputs = self.checkpoints.load(name)
+            if outputs is None or any(output not in outputs for output in stage.outputs):
+                continue
+            if callable(stage.checkpoint) and not stage.checkpoint(outputs):
+                print(f"[INFO] Checkpoint of '{name}' is no longer valid. Re-running from '{name}'")
+                continue
+            restored[name] = outputs
+            clean[name] = True
+        return restored
+
+    def _required_stages(self, deps: Dict[str, set], restored: Dict) -> set:
+        """실행해야 하는 단계: 복원되지 않은 단계 중, 마지막 단계이거나 실행할 단계가 출력을 쓰는 단계"""
+        required = set()
+        for name in reversed(self._topological_order()):
+            if name in restored:
+                continue
+            consumers = [other for other in self.stages if name in deps[other]]
+            if not consumers or any(consumer in required for consumer in consumers):
+                required.add(name)
+        return required
+
+    def _save_checkpoint(self, stage: Stage, outputs: Dict):
+        if self.checkpoints is None or not stage.checkpoint:
+            return
+        try:
+            self.checkpoints.save(stage.name, outputs)
+        except Exception as e:
+            # 체크포인트 저장 실패는 실행 결과에 영향 없음 (resume 시 이 단계부터 다시 실행)
+            print(f"[WARNING] Failed to save checkpoint for '{stage.name}': {e}")
+
+    def _validate(self, initial: Dict):
+        for stage in self.stages.values():
+            missing = [name for name in stage.inputs if name not in self._producers and name not in initial]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' has no producer for inputs {missing}")
+
+        # 순환 의존 검사 (위상 정렬)
+        deps = {name: set(self.dependencies(stage)) for name, stage in self.stages.items()}
+        resolved = set()
+        while len(resolved) < len(deps):
+            ready = [name for name in deps if name not in resolved and deps[name] <= resolved]
+            if not ready:
+                raise ValueError(f"Cycle between stages {sorted(set(deps) - resolved)}")
+            resolved.update(ready)
+
+    def critical_path(self) -> List[str]:
+        """
+        실행된 단계 중 소요 시간 합이 가장 긴 의존 경로 (이 경로의 단계가 빨라져야 전체 시간이 줄어듦)
+        """
+        finish = {}
+        previous = {}
+        for name in self._topological_order():
+            if name not in self.timings:
+                continue
+            start, end = self.timings[name]
+            best = None
+            for dep in self.dependencies(self.stages[name]):
+                if dep in finish and (best is None or finish[dep] > finish[best]):
+                    best = dep
+            previous[name] = best
+            finish[name] = (finish[best] if best else 0.0) + (end - start)
+
+        if not finish:
+            return []
+        path = [max(finish, key=finish.get)]
+        while previous[path[-1]]:
+            path.append(previous[path[-1]])
+        return path[::-1]
+
+    def report(self) -> str:
+        """단계별 소요 시간 + 임계 경로 요약"""
+        lines = ["[INFO] Stage timings (start -> end, seconds):"]
+        if self.restored:
+            lines.append(f"  (restored from checkpoints: {', '.join(self.restored)})")
+        for name, (start, end) in sorted(self.timings.items(), key=lambda item: item[1][0]):
+            lines.append(f"  {name:<16} {start:7.2f} -> {end:7.2f}  ({end - start:6.2f}s)")
+
+        path = self.critical_path()
+        if path:
+            total = sum(self.timings[name][1] - self.timings[name][0] for name in path)
+            wall = max(end for _, end in self.timings.values())
+            serial = sum(end - start for start, end in self.timings.values())
+            chain = " -> ".join(f"{name} ({self.timings[name][1] - self.timings[name][0]:.1f}s)" for name in path)
+            lines.append(f"[INFO] Critical path: {chain} = {total:.1f}s "
+                         f"(wall {wall:.1f}s, sequential {serial:.1f}s)")
+        return "\n".join(lines)
+
+    def _topological_order(self) -> List[str]:
+        order = []
+        resolved = set()
+        while len(order) < len(self.stages):
+            for name, stage in self.stages.items():
+                if name not in resolved and set(self.dependencies(stage)) <= resolved:
+                    order.append(name)
+                    resolved.add(name)
+        return order
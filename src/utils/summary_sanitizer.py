@@ -0,0 +1,96 @@
+"""
+피드 요약 정리 유틸리티 - HTML/스크립트/트래킹 마크업 제거 + 토큰 예산 내로 자르기
+"""
+import re
+from bs4 import BeautifulSoup
+
+# 본문 텍스트가 아닌 태그 (내용째 제거)
+REMOVE_TAGS = ['script', 'style', 'noscript', 'img', 'picture', 'figure', 'iframe', 'svg', 'video', 'audio', 'form', 'button']
+
+# 피드 요약 끝에 붙는 상투 문구
+BOILERPLATE_PATTERNS = [
+    re.compile(r'The post .{1,300}? appeared first on .{1,200}?\.?\s*$', re.IGNORECASE | re.DOTALL),
+    # 끝에 붙은 짧은 '더 읽기' 안내만 제거 (문장 중간의 'read more'는 본문이므로 유지)
+    re.compile(r'(?:Continue reading|Read more|Read the full story|Read full article)\s*(?:»|→|\.{3}|…)?\s*(?:\[[^\]]*\])?\s*$',
+               re.IGNORECASE),
+    re.compile(r'\[(…|\.\.\.|&#8230;)\]'),
+]
+_WHITESPACE_RE = re.compile(r'\s+')
+_SENTENCE_END_RE = re.compile(r'[.!?。](?=\s|$)')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    빠른 토큰 수 추정 (토크나이저 호출 없이)
+    - 영문/ASCII: 약 4글자당 1토큰
+    - 한글 등 비ASCII: 약 1.5글자당 1토큰
+    """
+    if not text:
+        return 0
+    ascii_count = len(text.encode('ascii', 'ignore'))
+    non_ascii_count = len(text) - ascii_count
+    return int(ascii_count / 4 + non_ascii_count / 1.5) + 1
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되도록 자르기 (가능하면 문장/단어 경계에서)"""
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text
+
+    # 글자당 평균 토큰 비율로 자를 위치를 한 번에 계산
+    ratio = max_tokens / estimate_tokens(text)
+    cut = text[:max(1, int(len(text) * ratio))]
+
+    sentence_ends = list(_SENTENCE_END_RE.finditer(cut))
+    if sentence_ends and sentence_ends[-1].end() > len(cut) * 0.6:
+        return cut[:sentence_ends[-1].end()]
+    space = cut.rfind(' ')
+    if space > len(cut) * 0.6:
+        cut = cut[:space]
+    return cut.rstrip() + " …"
+
+
+class SummarySanitizer:
+    """
+    피드 요약(HTML 포함 가능)을 프롬프트용 평문으로 정리하고 실행 단위 통계를 집계
+    """
+    def __init__(self, max_tokens=400):
+        self.max_tokens = max_tokens
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.count = 0
+        self.truncated_count = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def sanitize(self, summary: str) -> str:
+        if not summary:
+            return ""
+
+        text = summary
+        # 태그가 없으면 HTML 파서를 거치지 않음
+        if '<' in text or '&' in text:
+            soup = BeautifulSoup(text, 'html.parser')
+            for tag in soup(REMOVE_TAGS):
+                tag.decompose()
+            text = soup.get_text(' ')
+
+        text = _WHITESPACE_RE.sub(' ', text).strip()
+        for pattern in BOILERPLATE_PATTERNS:
+            text = pattern.sub('', text).strip()
+
+        truncated = truncate_to_tokens(text, self.max_tokens)
+
+        self.count += 1
+        self.tokens_before += estimate_tokens(summary)
+        self.tokens_after += estimate_tokens(truncated)
+        if truncated is not text:
+            self.truncated_count += 1
+        return truncated
+
+    def report(self) -> str:
+        saved = self.tokens_before - self.tokens_after
+        ratio = (saved / self.tokens_before * 100) if self.tokens_before else 0
+        return (f"{self.count} summaries, ~{self.tokens_before} -> ~{self.tokens_after} tokens "
+                f"(saved ~{saved}, {ratio:.0f}%), {self.truncated_count} truncated to {self.max_tokens} tokens")
@@ -0,0 +1,51 @@
+"""
+텍스트 유틸리티 - 정규화 / 토큰화 (중복 탐지, 관련도 계산 등에서 공통 사용)
+"""
+import re
+from typing import List
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_ENTITY_RE = re.compile(r'&[a-zA-Z]+;|&#\d+;')
+# 영문/숫자 단어 또는 한글 연속 구간
+_TOKEN_RE = re.compile(r'[a-z0-9]+(?:[\'\-][a-z0-9]+)*|[가-힣]+')
+_HANGUL_RE = re.compile(r'[가-힣]')
+
+STOPWORDS = frozenset("""
+a an the and or but if then than of to in on at by for with from into over under about as is are was were be been
+being it its this that these those he she they we you i his her their our your not no so do does did has have had
+will would can could should may might must just also more most very new says said via after before up out
+""".split())
+
+
+def normalize_text(text: str) -> str:
+    """HTML 태그/엔티티 제거 + 소문자 + 공백 정리"""
+    if not text:
+        return ""
+    text = _TAG_RE.sub(' ', text)
+    text = _ENTITY_RE.sub(' ', text)
+    return ' '.join(text.lower().split())
+
+
+def tokenize(text: str, remove_stopwords: bool = True) -> List[str]:
+    """
+    정규화된 텍스트를 토큰 리스트로 변환
+    - 영문: 단어 단위 (불용어 제거)
+    - 한글: 교착어 특성상 어절 대신 음절 bigram 사용 (예: '엔터프라이즈' -> '엔터', '터프', ...)
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall(normalize_text(text)):
+        if _HANGUL_RE.match(token):
+            if len(token) == 1:
+                tokens.append(token)
+            else:
+                tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        elif not remove_stopwords or token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def shingles(tokens: List[str], size: int = 2) -> set:
+    """연속된 size개 토큰 묶음(shingle) 집합, 토큰이 부족하면 단일 토큰 집합"""
+    if len(tokens) < size:
+        return set(tokens)
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
@@ -0,0 +1,90 @@
+"""
+희소 행렬 기반 텍스트 벡터화 - 단어 빈도 행렬 / BM25 가중치 / TF-IDF (scipy.sparse CSR)
+관련도 사전 순위(pre-ranker), 주제 클러스터링 등에서 공통 사용
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+def build_term_matrix(token_lists: List[List[str]],
+                      vocabulary: Optional[Dict[str, int]] = None) -> Tuple[sparse.csr_matrix, Dict[str, int]]:
+    """
+    문서별 토큰 리스트 -> (문서 x 단어) 빈도 행렬
+
+    Args:
+        token_lists: 문서별 토큰 리스트
+        vocabulary: 단어 -> 열 번호 (None이면 새로 만들고, 주어지면 없는 단어는 무시)
+
+    Returns:
+        (CSR 빈도 행렬, vocabulary)
+    """
+    grow = vocabulary is None
+    if grow:
+        vocabulary = {}
+
+    indptr = [0]
+    indices = []
+    for tokens in token_lists:
+        for token in tokens:
+            col = vocabulary.get(token)
+            if col is None:
+                if not grow:
+                    continue
+                col = vocabulary[token] = len(vocabulary)
+            indices.append(col)
+        indptr.append(len(indices))
+
+    data = np.ones(len(indices), dtype=np.float64)
+    matrix = sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(token_lists), len(vocabulary)),
+    )
+    matrix.sum_duplicates()  # 같은 단어의 중복 항목을 합쳐 빈도로 변환
+    return matrix, vocabulary
+
+
+def document_frequency(counts: sparse.csr_matrix) -> np.ndarray:
+    """단어별 문서 빈도"""
+    return np.bincount(counts.indices, minlength=counts.shape[1]).astype(np.float64)
+
+
+def bm25_idf(counts: sparse.csr_matrix) -> np.ndarray:
+    """BM25 idf = log(1 + (N - df + 0.5) / (df + 0.5))"""
+    n_docs = counts.shape[0]
+    df = document_frequency(counts)
+    return np.log1p((n_docs - df + 0.5) / (df + 0.5))
+
+
+def bm25_term_weights(counts: sparse.csr_matrix, k1: float = 1.5, b: float = 0.75) -> sparse.csr_matrix:
+    """
+    BM25 단어 빈도 포화 + 문서 길이 정규화를 적용한 행렬 (idf 제외)
+    weight = tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len / avg_len))
+    """
+    doc_len = np.asarray(counts.sum(axis=1)).ravel()
+    avg_len = doc_len.mean() if doc_len.size and doc_len.mean() > 0 else 1.0
+    norm = k1 * (1 - b + b * doc_len / avg_len)
+
+    weights = counts.copy().astype(np.float64)
+    row_norm = np.repeat(norm, np.diff(weights.indptr))
+    weights.data = weights.data * (k1 + 1) / (weights.data + row_norm)
+    return weights
+
+
+def tfidf_matrix(counts: sparse.csr_matrix, sublinear_tf: bool = True) -> sparse.csr_matrix:
+    """
+    행별 L2 정규화된 TF-IDF 행렬 (행끼리 내적 = 코사인 유사도)
+    idf = log((1 + N) / (1 + df)) + 1
+    """
+    n_docs = counts.shape[0]
+    idf = np.log((1 + n_docs) / (1 + document_frequency(counts))) + 1
+
+    weights = counts.copy().astype(np.float64)
+    if sublinear_tf:
+        weights.data = 1 + np.log(weights.data)
+    weights = weights.multiply(idf).tocsr()
+
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(weights).tocsr()
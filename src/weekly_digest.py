@@ -0,0 +1,140 @@
+from typing import List, Dict
+from config import settings
+from src.utils.model_backend import create_model_backend
+from src.utils.llm_client import LLMClient, default_llm_cache
+from src.utils.retry import default_retry_policy
+
+# 응답에 반드시 있어야 하는 항목
+REQUIRED_KEYS = ('weekly_headline', 'key_trends', 'implications', 'action_items')
+
+# 프롬프트에 넣는 일일 항목 길이 제한 (기사 수와 무관하게 입력 크기를 일정하게 유지)
+MAX_REASON_CHARS = 150
+MAX_IMPLICATIONS_CHARS = 400
+MAX_DAILY_TOPICS = 3
+
+
+class WeeklyDigestAnalyzer:
+    """
+    저장된 일일 리포트 요약(Top 5, B2B 인사이트, 주요 토픽)으로 주간 다이제스트 생성
+    - 기사를 다시 분석하지 않고, 이미 요약된 일일 결과만 입력으로 LLM 1회 호출
+    - 입력 크기 = 일수 x (Top 5 + 인사이트) -> 한 주의 기사 수와 무관
+    """
+    def __init__(self):
+        # 모델 백엔드 (settings.LLM_BACKEND: gemini / record / replay)
+        self.model = create_model_backend(settings.GEMINI_MODEL_NAME)
+        # 응답 캐시 + 재시도(지수 백오프, 단계 마감 시간)를 거치는 공통 LLM 호출 계층
+        self.llm = LLMClient(self.model, settings.GEMINI_MODEL_NAME,
+                             cache=default_llm_cache(), retry_policy=default_retry_policy('weekly_digest'))
+
+    def summarize(self, daily_reports: List[Dict]) -> Dict:
+        """
+        일일 리포트 요약 리스트 (날짜순)를 받아 주간 트렌드/시사점 생성
+        LLM 호출이 실패하면 일일 인사이트를 모아 만든 대체 다이제스트 반환
+        """
+        if not daily_reports:
+            return {'weekly_headline': '', 'key_trends': [], 'implications': '', 'action_items': []}
+
+        prompt = f"""
+        당신은 삼성전자 MX 사업부 B2B 개발그룹의 전략 분석가입니다.
+        아래는 지난 {len(daily_reports)}일 동안 매일 작성된 AI 뉴스 리포트의 요약입니다.
+        (각 날짜별 Top 5 기사와 선정 이유, 그날의 B2B 시사점)
+
+        이 일일 요약들을 종합하여 한 주의 흐름을 정리해주세요:
+        1. 이번 주를 요약하는 한 문장 헤드라인
+        2. 여러 날에 걸쳐 이어지거나 이번 주에 가장 중요했던 핵심 트렌드 (3-5개)
+        3. 삼성전자 MX 사업부 B2B 개발그룹에 대한 주간 시사점
+        4. 다음 주에 고려해야 할 액션 아이템
+
+        출력 형식은 반드시 유효한 JSON이어야 합니다:
+        {{
+            "weekly_headline": "이번 주 한 줄 요약 (한국어)",
+            "key_trends": [
+                {{
+                    "title": "트렌드 제목 (한국어)",
+                    "description": "트렌드 설명 및 왜 중요한지 (한국어, 2-3문장)",
+                    "dates": ["YYYY-MM-DD"]  // 관련 날짜
+                }}
+            ],
+            "implications": "주간 시사점 (한국어, 5-7문장)",
+            "action_items": [
+                "액션 아이템 1 (한국어)",
+                ...
+            ]
+        }}
+
+        일일 리포트 요약:
+        {self._format_daily_reports(daily_reports)}
+        """
+
+        try:
+            # 전략적 인사이트를 위해 temperature=0.4 설정 (B2B 인사이트와 동일)
+            generation_config = {"temperature": 0.4}
+            self.llm.start_stage()
+            digest = self.llm.generate_json(prompt, generation_config, context="weekly_digest")
+            if not isinstance(digest, dict):
+                raise ValueError(f"Unexpected digest type: {type(digest).__name__}")
+
+            missing = [key for key in REQUIRED_KEYS if not digest.get(key)]
+            if missing:
+                print(f"[WARNING] Weekly digest missing {missing}. Filling from daily insights.")
+                fallback = self._fallback_digest(daily_reports)
+                digest.update({key: fallback[key] for key in missing})
+            return digest
+
+        except Exception as e:
+            print(f"Error in weekly digest analysis: {e}")
+            return self._fallback_digest(daily_reports)
+        finally:
+            print(f"[INFO] Weekly digest LLM: {self.llm.stats()}")
+
+    def _format_daily_reports(self, daily_reports: List[Dict]) -> str:
+        text = ""
+        for report in daily_reports:
+            topics = ", ".join(f"{topic['label']}({topic['count']})" for topic in report.get('topics', [])[:MAX_DAILY_TOPICS])
+            text += f"[{report['run_date']}] 분석 기사 {report['article_count']}건"
+            text += f" | 주요 토픽: {topics}\n" if topics else "\n"
+
+            for idx, article in enumerate(report.get('top_articles', [])):
+                title = article.get('title_korean') or article.get('title', '')
+                reason = self._truncate(article.get('selection_reason', ''), MAX_REASON_CHARS)
+                text += f"    Top {idx+1}. {title}" + (f" - {reason}" if reason else "") + "\n"
+
+            insights = report.get('insights') or {}
+            issues = [issue.get('title', '') for issue in insights.get('key_issues', []) if isinstance(issue, dict)]
+            if issues:
+                text += f"    핵심 이슈: {'; '.join(issues)}\n"
+            if insights.get('implications'):
+                text += f"    시사점: {self._truncate(insights['implications'], MAX_IMPLICATIONS_CHARS)}\n"
+            text += "\n"
+        return text
+
+    def _fallback_digest(self, daily_reports: List[Dict]) -> Dict:
+        """LLM 없이 일일 인사이트를 모아 만든 다이제스트 (핵심 이슈/액션 아이템은 중복 제거 후 최근 순)"""
+        key_trends = []
+        action_items = []
+        seen_issues = set()
+        for report in reversed(daily_reports):
+            insights = report.get('insights') or {}
+            for issue in insights.get('key_issues', []):
+                if not isinstance(issue, dict) or not issue.get('title') or issue['title'] in seen_issues:
+                    continue
+                seen_issues.add(issue['title'])
+                key_trends.append({
+                    'title': issue['title'],
+                    'description': issue.get('description', ''),
+                    'dates': [report['run_date']],
+                })
+            for item in insights.get('action_items', []):
+                if item and item not in action_items:
+                    action_items.append(item)
+
+        return {
+            'weekly_headline': f"{daily_reports[0]['run_date']} ~ {daily_reports[-1]['run_date']} 일일 리포트 모음",
+            'key_trends': key_trends[:5],
+            'implications': '',
+            'action_items': action_items[:5],
+        }
+
+    def _truncate(self, text: str, limit: int) -> str:
+        text = (text or '').strip()
+        return text if len(text) <= limit else text[:limit] + "..."